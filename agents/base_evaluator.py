@@ -1,8 +1,28 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Callable
+from collections.abc import Mapping
 from langchain_openai import ChatOpenAI
 from tools.search_tool import search_tool
+from tools.evidence_packer import pack_evidence, tokenize_terms, split_snippets, normalize_snippet
+from tools.passage_index import PassageIndex
+from tools.tokenizer import count_tokens
+from tools.model_pricing import estimate_cost
+from tools.hedging import llm_hedger
+from tools.circuit_breaker import llm_breakers, search_breaker, CircuitOpenError
+from tools.metrics import metrics
+from tools.deadline import Deadline, DeadlineExceeded
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+import hashlib
+import json
 import logging
 import re
+import time
+
+# Appended after the whole evaluation prompt (Additional Instructions
+# included) when it is sent to the cascade's cheap model
+CASCADE_CONFIDENCE_INSTRUCTION = """
+            Confidence:
+            End your response with a final line "Confidence: high", "Confidence: medium" or "Confidence: low" stating how clear-cut this evaluation is given the available evidence.
+            """
 
 # Define calibration examples for each dimension
 CALIBRATION_EXAMPLES = {
@@ -198,12 +218,66 @@ CALIBRATION_EXAMPLES = {
 }
 
 class BaseEvaluator:
+    # Company fields this dimension reads (trim_company_data, search queries,
+    # has_sufficient_structured_data). The ingest layer keeps only the union of
+    # these across all evaluators, so override it alongside trim_company_data.
+    company_fields = (
+        "name",
+        "summary",
+        "website",
+        "linkedin_url"
+    )
+    # Maximum number of tokens of web evidence included in the prompt.
+    # Override in subclasses to give a dimension more or less room.
+    evidence_token_budget = 1500
+    # Number of passages pulled from the company's passage index
+    passage_top_k = 12
+    # Dimensions that mostly read structured fields can opt in to scoring
+    # several companies in one LLM request (see evaluate_batch)
+    supports_batching = False
+    # Adaptive search policy: always run min_search_queries, then stop once
+    # evidence_target_snippets new snippets are gathered or a query adds fewer
+    # than min_new_snippets_per_query new ones
+    min_search_queries = 1
+    evidence_target_snippets = 15
+    min_new_snippets_per_query = 2
+    # Queries issued concurrently per wave, and the per-query timeout in seconds.
+    # The first wave is the min_search_queries that always run, so the adaptive
+    # policy above can stop before the rest are sent; later waves run
+    # search_concurrency queries at once.
+    search_concurrency = 4
+    search_timeout = 20.0
+    # Seconds a single LLM request may take before it fails (applied when the
+    # LLM client is built, see build_llm)
+    llm_timeout = 60.0
+    # Wall-clock limit in seconds for one evaluation of this dimension, search
+    # and scoring included; None for no limit. The runners stop waiting at the
+    # deadline and record the dimension as timed out (see run_evaluation)
+    evaluation_timeout: Optional[float] = None
+    # Self-consistency: sample up to ensemble_size scores, in concurrent waves
+    # of ensemble_quorum (default: a majority), and stop as soon as a quorum
+    # agrees; more samples are only drawn while they disagree. Cannot be
+    # combined with cascade_model (see apply_evaluator_settings)
+    ensemble_size = 1
+    ensemble_quorum: Optional[int] = None
+    # Model cascade: when cascade_model is set it scores first, and the call is
+    # escalated to llm_model only if its confidence is not in
+    # cascade_accept_confidence or its score is at least cascade_escalate_min_score
+    llm_model = "gpt-4.1"
+    cascade_model: Optional[str] = None
+    cascade_accept_confidence = ("high",)
+    cascade_escalate_min_score = 3
+    # Record per-section prompt token counts on every result (see profile_prompt)
+    profile_prompts = False
+    # Extra instructions or context appended to the evaluation prompt, e.g. a
+    # prompt experiment variant (see runners/prompt_experiments.py)
+    prompt_instructions = ""
+
     def __init__(self, dimension_name: str, rubric: str):
         self.dimension_name = dimension_name
         self.rubric = rubric
-        self.llm = ChatOpenAI(
-            model="gpt-4.1"
-        )
+        self.llm = self.build_llm()
+        self._cascade_llm = None
         self.search_tool = search_tool
         self.logger = logging.getLogger(__name__)
         
@@ -215,7 +289,7 @@ class BaseEvaluator:
             self.logger.warning("Received empty data")
             return None
             
-        if not isinstance(data, dict):
+        if not isinstance(data, Mapping):
             self.logger.warning(f"Expected dict, got {type(data)}")
             return None
             
@@ -238,51 +312,527 @@ class BaseEvaluator:
         company_name = company_data.get("name", "")
         return [f"{company_name} {self.dimension_name}"]
         
-    def search_web(self, company_data: Dict[str, Any]) -> str:
-        """Perform multiple targeted web searches for the company"""
+    def get_relevance_terms(self, company_data: Dict[str, Any]) -> List[str]:
+        """Terms used to rank web snippets for this dimension"""
+        company_terms = set(tokenize_terms(company_data.get("name") or ""))
+        terms = tokenize_terms(self.dimension_name)
+        for query in self.get_search_queries(company_data):
+            terms.extend(tokenize_terms(query))
+        return [term for term in dict.fromkeys(terms) if term not in company_terms]
+        
+    def retrieve_passages(self, company_data: Dict[str, Any], passage_index: PassageIndex) -> List[Tuple[str, List[str]]]:
+        """Pull this dimension's top-k passages from the company's passage index, grouped by label"""
+        passages = passage_index.search(self.get_relevance_terms(company_data), k=self.passage_top_k)
+        grouped: Dict[str, List[str]] = {}
+        for passage in passages:
+            grouped.setdefault(passage["label"], []).append(passage["text"])
+        self.logger.info(f"Retrieved {len(passages)} passages from local index")
+        return list(grouped.items())
+        
+    def has_sufficient_structured_data(self, company_data: Dict[str, Any]) -> bool:
+        """Whether the structured record already answers this dimension, so web search can be skipped. Override in subclasses."""
+        return False
+        
+    def input_hash(self, company_data: Dict[str, Any]) -> str:
+        """
+        Hash of everything this dimension's score depends on: the trimmed
+        company data, the search queries, the rubric and the models scoring it
+        (main, cascade and ensemble settings). A stored result whose hash
+        still matches can be reused instead of re-evaluating.
+        """
+        inputs = {
+            "dimension": self.dimension_name,
+            "trimmed_data": self.trim_company_data(company_data),
+            "search_queries": self.get_search_queries(company_data),
+            "rubric": self.rubric,
+            "scoring": {
+                "llm_model": self.llm_model,
+                "cascade_model": self.cascade_model,
+                "ensemble_size": self.ensemble_size,
+                "ensemble_quorum": self.ensemble_quorum
+            }
+        }
+        if self.prompt_instructions:
+            inputs["prompt_instructions"] = self.prompt_instructions
+        canonical = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        
+    def collect_search_results(
+        self,
+        company_data: Dict[str, Any],
+        run_query: Optional[Callable[[str], Any]] = None,
+        stats: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> List[Tuple[str, Any]]:
+        """
+        Run this dimension's search queries under the adaptive search policy.
+        
+        Queries are issued in order (the first min_search_queries, then
+        search_concurrency at a time) and stop early once enough new evidence
+        has been gathered; search is skipped entirely when the structured
+        data is sufficient, and the remaining queries are
+        skipped while the search circuit is open or once the deadline has
+        passed. The number of queries spent and skipped is written to stats.
+        """
+        run_query = run_query or self.search_tool.run
+        stats = stats if stats is not None else {}
+        queries = self.get_search_queries(company_data)
+        stats.update({"queries_planned": len(queries), "queries_spent": 0, "queries_skipped": 0, "stop_reason": None})
+        
+        if self.has_sufficient_structured_data(company_data):
+            self.logger.info(f"Structured data is sufficient for {self.dimension_name}, skipping web search")
+            stats.update({"queries_skipped": len(queries), "stop_reason": "structured_data_sufficient"})
+            return []
+        
+        all_results = []
+        seen = set()
+        new_per_query = None
+        position = 0
+        while position < len(queries):
+            # Search is down: evaluate with whatever evidence we have instead of
+            # waiting out every remaining query
+            if not self.search_available(deadline):
+                stats.update({"queries_skipped": len(queries) - position, "stop_reason": "circuit_open"})
+                self.logger.warning(f"Search circuit is open, skipping {len(queries) - position} queries")
+                break
+            if deadline is not None and deadline.expired():
+                stats.update({"queries_skipped": len(queries) - position, "stop_reason": "deadline"})
+                self.logger.warning(f"Deadline passed, skipping {len(queries) - position} queries")
+                break
+            if position >= self.min_search_queries:
+                if len(seen) >= self.evidence_target_snippets:
+                    stats["stop_reason"] = "evidence_target_reached"
+                elif new_per_query is not None and new_per_query < self.min_new_snippets_per_query:
+                    stats["stop_reason"] = "evidence_saturated"
+                if stats["stop_reason"]:
+                    stats["queries_skipped"] = len(queries) - position
+                    self.logger.info(
+                        f"Stopping search after {position} queries ({stats['stop_reason']}, {len(seen)} unique snippets)"
+                    )
+                    break
+            
+            # Queries in a wave run concurrently; the policy is checked between waves
+            wave_size = max(1, self.min_search_queries if position == 0 else self.search_concurrency)
+            if not search_breaker.is_closed():
+                # Half-open: a single query probes whether search has recovered
+                wave_size = 1
+            wave = queries[position:position + wave_size]
+            position += len(wave)
+            stats["queries_spent"] += len(wave)
+            
+            new_snippets = []
+            for query, results in zip(wave, self.run_queries_concurrently(wave, run_query, stats, deadline)):
+                if results is None:
+                    continue
+                all_results.append((query, results))
+                new_count = 0
+                for snippet in split_snippets(results):
+                    key = normalize_snippet(snippet)
+                    if key and key not in seen:
+                        seen.add(key)
+                        new_count += 1
+                new_snippets.append(new_count)
+            new_per_query = sum(new_snippets) / len(new_snippets) if new_snippets else None
+        
+        return all_results
+        
+    def search_available(self, deadline: Optional[Deadline] = None) -> bool:
+        """
+        Whether search queries may be sent now.
+        
+        Under the "pause" policy an open search circuit is waited out here,
+        before any query thread starts: a query paused inside its thread
+        would only be abandoned at search_timeout. Under "degrade", or once
+        max_pause or the deadline has passed, an open circuit means no.
+        """
+        if search_breaker.is_open() and search_breaker.policy == "pause":
+            search_breaker.wait_until_closed(deadline.remaining() if deadline is not None else None)
+        return not search_breaker.is_open()
+        
+    def run_queries_concurrently(
+        self,
+        queries: List[str],
+        run_query: Callable[[str], Any],
+        stats: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> List[Optional[Any]]:
+        """
+        Issue the queries concurrently, each with its own timeout.
+        
+        Returns the results in the original query order, with None for queries
+        that failed or timed out. A slow query never delays the others' results
+        beyond search_timeout, or beyond the deadline when that comes first.
+        Failures count against the search circuit where the backend call is
+        made (SearchBackendRouter), not here.
+        """
+        if not queries:
+            return []
+        
+        timeout = deadline.cap(self.search_timeout) if deadline is not None else self.search_timeout
+        executor = ThreadPoolExecutor(max_workers=len(queries))
+        futures = [executor.submit(run_query, query) for query in queries]
+        done, _ = wait(futures, timeout=timeout)
+        # Abandon queries that are still running rather than waiting for them
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        results = []
+        for query, future in zip(queries, futures):
+            if future not in done:
+                if timeout < self.search_timeout:
+                    self.logger.warning(f"Search query '{query}' abandoned at the deadline")
+                else:
+                    self.logger.error(f"Search query '{query}' timed out after {self.search_timeout}s")
+                if stats is not None:
+                    stats["queries_timed_out"] = stats.get("queries_timed_out", 0) + 1
+                results.append(None)
+                continue
+            try:
+                results.append(future.result())
+            except Exception as e:
+                self.logger.error(f"Error in individual search query '{query}': {str(e)}")
+                results.append(None)
+        return results
+        
+    def search_web(
+        self,
+        company_data: Dict[str, Any],
+        passage_index: Optional[PassageIndex] = None,
+        stats: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> str:
+        """Perform multiple targeted web searches for the company, or retrieve from its passage index"""
         try:
-            queries = self.get_search_queries(company_data)
             all_results = []
             
-            for query in queries:
-                try:
-                    results = self.search_tool.run(query)
-                    all_results.append(f"Search results for '{query}':\n{results}")
-                except Exception as e:
-                    self.logger.error(f"Error in individual search query '{query}': {str(e)}")
+            if passage_index is not None:
+                all_results = self.retrieve_passages(company_data, passage_index)
+            else:
+                all_results = self.collect_search_results(company_data, stats=stats, deadline=deadline)
                     
-            return "\n\n".join(all_results) if all_results else ""
+            if not all_results:
+                return ""
+                
+            web_results, pack_stats = pack_evidence(
+                all_results,
+                self.get_relevance_terms(company_data),
+                self.evidence_token_budget,
+                model=self.llm.model_name,
+                label=self.dimension_name
+            )
+            self.logger.info(
+                f"Packed {pack_stats['snippets_kept']}/{pack_stats['snippets_total']} snippets "
+                f"into {pack_stats['evidence_tokens']}/{pack_stats['token_budget']} tokens"
+            )
+            return web_results
             
         except Exception as e:
             self.logger.error(f"Error performing web search: {str(e)}")
             return ""
             
-    def evaluate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def evaluate(
+        self,
+        data: Dict[str, Any],
+        passage_index: Optional[PassageIndex] = None,
+        search_stats: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         self.logger.info(f"Starting evaluation for {self.dimension_name}")
+        start_time = time.time()
         
-        company_data = self.get_company_data(data)
-        if not company_data:
-            self.logger.warning("No company data found")
+        evidence = self.gather_evidence(data, passage_index=passage_index, search_stats=search_stats, deadline=deadline)
+        if evidence is None:
             return {
                 "score": 1,
                 "rationale": f"Insufficient company information to evaluate {self.dimension_name}"
             }
+        if deadline is not None and deadline.expired():
+            # The caller has stopped waiting; don't spend an LLM call on a discarded result
+            raise DeadlineExceeded(f"{deadline.label} of {deadline.seconds:g}s expired before scoring")
+        result = self.score_evidence(evidence)
+        metrics.observe("echo_dimension_latency_seconds", time.time() - start_time, dimension=self.dimension_name)
+        return result
+        
+    def gather_evidence(
+        self,
+        data: Dict[str, Any],
+        passage_index: Optional[PassageIndex] = None,
+        search_stats: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Everything the LLM stage needs: the company data, its trimmed version,
+        the packed web results and the search stats. Returns None when there
+        is not enough company information to evaluate. Searches still pending
+        when the deadline passes are skipped.
+        """
+        company_data = self.get_company_data(data)
+        if not company_data:
+            self.logger.warning("No company data found")
+            return None
             
         # Get trimmed company data
         trimmed_data = self.trim_company_data(company_data)
         if not trimmed_data:
             self.logger.warning("No trimmed data available after processing")
-            return {
-                "score": 1,
-                "rationale": f"Insufficient company information to evaluate {self.dimension_name}"
-            }
+            return None
             
         # Perform targeted web searches
         self.logger.info("Starting web search")
-        web_results = self.search_web(company_data)
+        # Searches spent when the passage index was built are passed in by the caller
+        search_stats = dict(search_stats or {})
+        web_results = self.search_web(company_data, passage_index=passage_index, stats=search_stats, deadline=deadline)
         self.logger.info(f"Web search completed, found {len(web_results.split())} words")
+        return {
+            "company_data": company_data,
+            "trimmed_data": trimmed_data,
+            "web_results": web_results,
+            "search_stats": search_stats
+        }
+        
+    def score_evidence(self, evidence: Dict[str, Any]) -> Dict[str, Any]:
+        """LLM stage of evaluate: build the prompt from gathered evidence and score it"""
+        company_data = evidence["company_data"]
+        trimmed_data = evidence["trimmed_data"]
+        web_results = evidence["web_results"]
+        search_stats = dict(evidence["search_stats"])
+        
+        # Create evaluation prompt
+        self.logger.info("Creating evaluation prompt")
+        prompt = self.build_prompt(company_data, trimmed_data, web_results)
+        prompt_info: Dict[str, Any] = {"prompt_tokens": count_tokens(prompt, self.llm.model_name)}
+        if self.profile_prompts:
+            prompt_info["prompt_profile"] = self.profile_prompt(prompt, trimmed_data, web_results)
+        
+        try:
+            if self.ensemble_size > 1:
+                score, rationale, ensemble = self.evaluate_ensemble(prompt)
+                self.logger.info(f"Evaluation complete. Final score: {score}")
+                return {
+                    "score": score,
+                    "rationale": rationale,
+                    "search": search_stats,
+                    **prompt_info,
+                    "ensemble": ensemble
+                }
+            
+            if self.cascade_model:
+                score, rationale, cascade = self.evaluate_with_cascade(prompt)
+                self.logger.info(f"Evaluation complete. Final score: {score}")
+                return {
+                    "score": score,
+                    "rationale": rationale,
+                    "search": search_stats,
+                    **prompt_info,
+                    "cascade": cascade
+                }
+            
+            self.logger.info("Sending evaluation prompt to LLM")
+            response = self._call_llm(prompt)
+            self.logger.info(f"Raw response from LLM (first 200 chars): {response[:200]}...")
+            self.logger.debug(f"Full response: {response}")
+            
+            score, rationale = self.parse_response(response)
+            
+            self.logger.info(f"Evaluation complete. Final score: {score}")
+            return {
+                "score": score,
+                "rationale": rationale,
+                "search": search_stats,
+                **prompt_info
+            }
+            
+        except CircuitOpenError as e:
+            # An outage is not a verdict on the company: leave the dimension
+            # unscored so it is excluded from Overall
+            self.logger.warning(f"LLM circuit is open, leaving {self.dimension_name} unscored: {str(e)}")
+            metrics.inc("echo_dimension_errors_total", dimension=self.dimension_name)
+            return {
+                "score": None,
+                "rationale": f"Not evaluated: {str(e)}",
+                "circuit_open": True,
+                "error": str(e)
+            }
+        except Exception as e:
+            # A failed call says nothing about the company either: unscored,
+            # excluded from Overall and never reused by --incremental
+            self.logger.error(f"Error during evaluation: {str(e)}", exc_info=True)
+            metrics.inc("echo_dimension_errors_total", dimension=self.dimension_name)
+            return {
+                "score": None,
+                "rationale": f"Error during evaluation: {str(e)}",
+                "error": str(e)
+            }
+            
+    def _call_llm(self, prompt: str, llm: Optional[Any] = None) -> str:
+        """Send a prompt to the dimension's LLM (or the given one) and return the raw reply"""
+        llm = llm or self.llm
+        model = llm.model_name
+        
+        def predict(text: str) -> str:
+            # Counted per request actually sent, so hedged duplicates show up in-flight and in tokens
+            with metrics.in_flight("echo_llm_in_flight", model=model):
+                metrics.inc("echo_llm_calls_total", model=model)
+                metrics.inc("echo_llm_tokens_total", count_tokens(text, model), model=model, kind="prompt")
+                try:
+                    response = llm.predict(text)
+                except Exception:
+                    metrics.inc("echo_llm_errors_total", model=model)
+                    raise
+                metrics.inc("echo_llm_tokens_total", count_tokens(response, model), model=model, kind="completion")
+                return response
         
-        # Get calibration examples for this dimension
+        # Fails fast while this model's circuit is open; hedged against stalled
+        # requests when hedging is enabled for the run
+        return llm_breakers.for_key(model).call(llm_hedger.call, predict, prompt, key=model)
+        
+    def build_llm(self) -> Any:
+        """The scoring model client for llm_model and llm_timeout"""
+        return ChatOpenAI(
+            model=self.llm_model,
+            timeout=self.llm_timeout
+        )
+        
+    def get_cascade_llm(self) -> Any:
+        """The cheap first-pass model, created on first use so cascade_model can be set per run"""
+        if self._cascade_llm is None or self._cascade_llm.model_name != self.cascade_model:
+            self._cascade_llm = ChatOpenAI(model=self.cascade_model, timeout=self.llm_timeout)
+        return self._cascade_llm
+        
+    def parse_confidence(self, response: str) -> Tuple[Optional[str], str]:
+        """Split the "Confidence: ..." line off a cascade reply. Returns (confidence, rest of reply)."""
+        match = re.search(r'(?im)^\s*confidence:\s*(high|medium|low)\b.*$', response)
+        if not match:
+            return None, response
+        return match.group(1).lower(), (response[:match.start()] + response[match.end():]).strip()
+        
+    def build_cascade_prompt(self, prompt: str) -> str:
+        """The evaluation prompt from build_prompt with the confidence section appended last"""
+        return prompt + CASCADE_CONFIDENCE_INSTRUCTION
+
+    def evaluate_with_cascade(self, prompt: str) -> Tuple[int, str, Dict[str, Any]]:
+        """
+        Score with the cheap cascade model and escalate to the main model when needed.
+        
+        Escalation happens when the cheap reply has no explicit score, its
+        confidence is not accepted, its score falls in the escalation band, or
+        the cheap call fails. Returns the score, rationale and cascade stats,
+        including the estimated cost of the same call on the main model alone.
+        """
+        start_time = time.time()
+        cascade_prompt = self.build_cascade_prompt(prompt)
+        prompt_tokens = count_tokens(prompt, self.llm_model)
+        cost = 0.0
+        cheap_score = None
+        confidence = None
+        
+        self.logger.info(f"Sending evaluation prompt to cascade model {self.cascade_model}")
+        try:
+            response = self._call_llm(cascade_prompt, llm=self.get_cascade_llm())
+            confidence, response = self.parse_confidence(response)
+            cost += estimate_cost(self.cascade_model, count_tokens(cascade_prompt, self.cascade_model), count_tokens(response, self.cascade_model))
+            cheap_score, rationale = self.parse_response(response)
+            if not re.search(r'(?i)score:\s*\d|^\s*\d', response):
+                reason = "no_score"
+            elif confidence not in self.cascade_accept_confidence:
+                reason = f"confidence_{confidence or 'missing'}"
+            elif cheap_score >= self.cascade_escalate_min_score:
+                reason = "score_band"
+            else:
+                reason = None
+        except Exception as e:
+            self.logger.warning(f"Cascade model call failed, escalating: {str(e)}")
+            reason = "cascade_error"
+        cheap_latency = time.time() - start_time
+        
+        score = cheap_score
+        if reason is not None:
+            self.logger.info(f"Escalating to {self.llm_model} ({reason})")
+            response = self._call_llm(prompt)
+            cost += estimate_cost(self.llm_model, prompt_tokens, count_tokens(response, self.llm_model))
+            score, rationale = self.parse_response(response)
+        
+        cascade = {
+            "model": self.llm_model if reason else self.cascade_model,
+            "cascade_model": self.cascade_model,
+            "escalated": reason is not None,
+            "escalation_reason": reason,
+            "cheap_score": cheap_score,
+            "confidence": confidence,
+            "cheap_latency_seconds": round(cheap_latency, 3),
+            "latency_seconds": round(time.time() - start_time, 3),
+            "cost_usd": round(cost, 6),
+            "baseline_cost_usd": round(estimate_cost(self.llm_model, prompt_tokens, count_tokens(response, self.llm_model)), 6)
+        }
+        return score, rationale, cascade
+        
+    def evaluate_ensemble(self, prompt: str) -> Tuple[int, str, Dict[str, Any]]:
+        """
+        Score the prompt with samples drawn in waves and stop once a quorum agrees.
+        
+        The first wave is quorum samples, run concurrently; when they agree no
+        more are drawn. Otherwise each further wave is the fewest samples that
+        could still complete a quorum, until ensemble_size have been requested.
+        
+        Returns the chosen score, the rationale of a sample with that score and
+        the score distribution across the samples that completed.
+        """
+        quorum = min(self.ensemble_quorum or self.ensemble_size // 2 + 1, self.ensemble_size)
+        self.logger.info(f"Sampling up to {self.ensemble_size} scores from LLM in waves (quorum {quorum})")
+        
+        samples: List[Tuple[int, str]] = []
+        counts: Dict[int, int] = {}
+        requested = 0
+        circuit_error: Optional[CircuitOpenError] = None
+        executor = ThreadPoolExecutor(max_workers=quorum)
+        try:
+            while requested < self.ensemble_size and max(counts.values(), default=0) < quorum:
+                wave = min(quorum - max(counts.values(), default=0), self.ensemble_size - requested)
+                requested += wave
+                futures = [executor.submit(self._call_llm, prompt) for _ in range(wave)]
+                for future in as_completed(futures):
+                    try:
+                        score, rationale = self.parse_response(future.result())
+                    except CircuitOpenError as e:
+                        circuit_error = e
+                        continue
+                    except Exception as e:
+                        self.logger.warning(f"Ensemble sample failed: {str(e)}")
+                        continue
+                    samples.append((score, rationale))
+                    counts[score] = counts.get(score, 0) + 1
+                if circuit_error is not None:
+                    # Further waves would be rejected by the open circuit too
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if not samples:
+            if circuit_error is not None:
+                raise circuit_error
+            raise RuntimeError("All ensemble samples failed")
+        
+        scores = [score for score, _ in samples]
+        mean = sum(scores) / len(scores)
+        variance = sum((score - mean) ** 2 for score in scores) / len(scores)
+        # Most common score; ties go to the lower (more conservative) score
+        chosen = min(counts, key=lambda score: (-counts[score], score))
+        rationale = next(rationale for score, rationale in samples if score == chosen)
+        
+        ensemble = {
+            "samples_requested": requested,
+            "samples_completed": len(samples),
+            "scores": scores,
+            "distribution": {str(score): count for score, count in sorted(counts.items())},
+            "mean": round(mean, 2),
+            "variance": round(variance, 3),
+            "agreement": round(counts[chosen] / len(samples), 2),
+            "quorum_reached": counts[chosen] >= quorum
+        }
+        self.logger.info(f"Ensemble chose score {chosen} from distribution {ensemble['distribution']}")
+        return chosen, rationale, ensemble
+        
+    def build_calibration_examples_text(self) -> str:
+        """Render the calibration examples for this dimension"""
         dimension_examples = CALIBRATION_EXAMPLES.get(self.dimension_name, {})
         calibration_examples_text = ""
         if dimension_examples:
@@ -292,9 +842,35 @@ class BaseEvaluator:
                 calibration_examples_text += f"\nScore {score}:\n"
                 for example in examples:
                     calibration_examples_text += f"- {example}\n"
-
-        # Create evaluation prompt
-        self.logger.info("Creating evaluation prompt")
+        return calibration_examples_text
+        
+    def profile_prompt(self, prompt: str, trimmed_data: Dict[str, Any], web_results: str) -> Dict[str, int]:
+        """
+        Token count of each section of a built prompt.
+        
+        The variable sections are located in the prompt text, and whatever is
+        left (role, scoring guidelines, instructions, output format) counts as
+        the preamble, so subclasses that override build_prompt are profiled too.
+        """
+        model = self.llm.model_name
+        sections = {
+            "calibration": self.build_calibration_examples_text(),
+            "company_data": str(trimmed_data),
+            "web_results": web_results,
+            "rubric": self.rubric
+        }
+        preamble = prompt
+        for text in sections.values():
+            if text:
+                preamble = preamble.replace(text, "", 1)
+        profile = {"preamble": count_tokens(preamble, model)}
+        profile.update({name: count_tokens(text, model) for name, text in sections.items()})
+        return profile
+        
+    def build_prompt(self, company_data: Dict[str, Any], trimmed_data: Dict[str, Any], web_results: str) -> str:
+        """Build the single-company evaluation prompt"""
+        calibration_examples_text = self.build_calibration_examples_text()
+        
         prompt = f"""
             You are a critical evaluator assessing {company_data.get('name')} for the {self.dimension_name} dimension, specifically analyzing its potential as a fast follower opportunity. Assume nothing until proven.
 
@@ -337,83 +913,173 @@ class BaseEvaluator:
             1. A concise, informative analysis of the company's potential as a fast follower opportunity for the {self.dimension_name} dimension. Your rationale must be no longer than 250 words. Avoid repetition and unnecessary detail.
             2. After providing the rationale, determine the appropriate score from 1-5 using the rubric.
             """
+        if self.prompt_instructions:
+            prompt += f"""
+            Additional Instructions:
+            {self.prompt_instructions}
+            """
+        return prompt
         
-        try:
-            self.logger.info("Sending evaluation prompt to LLM")
-            response = self.llm.predict(prompt)
-            self.logger.info(f"Raw response from LLM (first 200 chars): {response[:200]}...")
-            self.logger.debug(f"Full response: {response}")
+    def parse_response(self, response: str) -> Tuple[int, str]:
+        """Extract the score and rationale from the LLM's reply"""
+        # Parse response to extract score and rationale
+        score = 1
+        rationale = response
+        
+        # First try to find an explicit score
+        self.logger.info("Attempting to parse score")
+        if "score:" in response.lower():
+            try:
+                score_part = response.lower().split("score:")[1].split("\n")[0].strip()
+                self.logger.debug(f"Found score part: {score_part}")
+                # Extract first number from the score part
+                numbers = re.findall(r'\d+', score_part)
+                if numbers:
+                    score = int(numbers[0])
+                    self.logger.info(f"Successfully parsed score from 'Score:' prefix: {score}")
+            except Exception as e:
+                self.logger.warning(f"Failed to parse score after 'Score:': {str(e)}")
+        
+        # If no explicit score found, try to find a number at the start
+        if score == 1:
+            try:
+                self.logger.info("Attempting to find score at start of response")
+                # Look for a single digit at the start of the response
+                match = re.match(r'^\s*(\d)', response)
+                if match:
+                    score = int(match.group(1))
+                    self.logger.info(f"Successfully parsed score from start of response: {score}")
+            except Exception as e:
+                self.logger.warning(f"Failed to parse score from start: {str(e)}")
+        
+        # Ensure score is in valid range
+        original_score = score
+        score = max(1, min(5, score))
+        if score != original_score:
+            self.logger.warning(f"Score adjusted from {original_score} to {score} to stay within valid range")
+        
+        # Clean up rationale - try multiple patterns
+        self.logger.info("Attempting to extract rationale")
+        rationale_patterns = [
+            r'(?i)rationale:\s*(.*)', # Case-insensitive "rationale:"
+            r'(?i)evaluation:\s*(.*)', # Case-insensitive "evaluation:"
+            r'^\s*(?:score:?\s*\d+|[1-5])\s*\n+(.*)', # After score
+            r'^\s*(?:score:?\s*\d+|[1-5])\s*(.*)' # After score without newline
+        ]
+        
+        original_rationale = rationale
+        for i, pattern in enumerate(rationale_patterns):
+            self.logger.debug(f"Trying pattern {i + 1}: {pattern}")
+            match = re.search(pattern, response, re.DOTALL)
+            if match:
+                rationale = match.group(1).strip()
+                self.logger.info(f"Successfully extracted rationale using pattern {i + 1}")
+                self.logger.debug(f"Rationale starts with: {rationale[:100]}...")
+                break
+        
+        if rationale == original_rationale:
+            self.logger.warning("No rationale pattern matched, using full response as rationale")
+        
+        return score, rationale
             
-            # Parse response to extract score and rationale
-            score = 1
-            rationale = response
+    def build_batch_prompt(self, trimmed_records: List[Dict[str, Any]]) -> str:
+        """Build one prompt that scores several companies from their trimmed data only"""
+        calibration_examples_text = self.build_calibration_examples_text()
+        companies_text = "\n\n".join(
+            f"Company {i + 1}:\n{trimmed_data}" for i, trimmed_data in enumerate(trimmed_records)
+        )
+        
+        prompt = f"""
+            You are a critical evaluator assessing {len(trimmed_records)} companies for the {self.dimension_name} dimension, specifically analyzing each one's potential as a fast follower opportunity. Assume nothing until proven. Evaluate every company independently.
             
-            # First try to find an explicit score
-            self.logger.info("Attempting to parse score")
-            if "score:" in response.lower():
-                try:
-                    score_part = response.lower().split("score:")[1].split("\n")[0].strip()
-                    self.logger.debug(f"Found score part: {score_part}")
-                    # Extract first number from the score part
-                    numbers = re.findall(r'\d+', score_part)
-                    if numbers:
-                        score = int(numbers[0])
-                        self.logger.info(f"Successfully parsed score from 'Score:' prefix: {score}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse score after 'Score:': {str(e)}")
-            
-            # If no explicit score found, try to find a number at the start
-            if score == 1:
-                try:
-                    self.logger.info("Attempting to find score at start of response")
-                    # Look for a single digit at the start of the response
-                    match = re.match(r'^\s*(\d)', response)
-                    if match:
-                        score = int(match.group(1))
-                        self.logger.info(f"Successfully parsed score from start of response: {score}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse score from start: {str(e)}")
-            
-            # Ensure score is in valid range
-            original_score = score
-            score = max(1, min(5, score))
-            if score != original_score:
-                self.logger.warning(f"Score adjusted from {original_score} to {score} to stay within valid range")
-            
-            # Clean up rationale - try multiple patterns
-            self.logger.info("Attempting to extract rationale")
-            rationale_patterns = [
-                r'(?i)rationale:\s*(.*)', # Case-insensitive "rationale:"
-                r'(?i)evaluation:\s*(.*)', # Case-insensitive "evaluation:"
-                r'^\s*(?:score:?\s*\d+|[1-5])\s*\n+(.*)', # After score
-                r'^\s*(?:score:?\s*\d+|[1-5])\s*(.*)' # After score without newline
-            ]
-            
-            original_rationale = rationale
-            for i, pattern in enumerate(rationale_patterns):
-                self.logger.debug(f"Trying pattern {i + 1}: {pattern}")
-                match = re.search(pattern, response, re.DOTALL)
-                if match:
-                    rationale = match.group(1).strip()
-                    self.logger.info(f"Successfully extracted rationale using pattern {i + 1}")
-                    self.logger.debug(f"Rationale starts with: {rationale[:100]}...")
-                    break
+            {calibration_examples_text}
             
-            if rationale == original_rationale:
-                self.logger.warning("No rationale pattern matched, using full response as rationale")
+            Important Instructions:
+            1. Use only the company data provided for each company
+            2. Be skeptical - distinguish between genuine signals and funding-driven growth
+            3. Explicitly identify missing information that would strengthen the evaluation
+            4. Justify why each company doesn't deserve a higher score
             
-            self.logger.info(f"Evaluation complete. Final score: {score}")
-            return {
-                "score": score,
-                "rationale": rationale
-            }
+            Companies:
+            {companies_text}
             
-        except Exception as e:
-            self.logger.error(f"Error during evaluation: {str(e)}", exc_info=True)
-            return {
-                "score": 1,
-                "rationale": f"Error during evaluation: {str(e)}"
-            }
+            Evaluation Rubric:
+            {self.rubric}
+            
+            Respond with ONLY a JSON array containing one object per company, in the same order as above:
+            [{{"company": 1, "score": <1-5>, "rationale": "<no more than 150 words>"}}, ...]
+            """
+        return prompt
+        
+    def parse_batch_response(self, response: str, count: int) -> List[Optional[Tuple[int, str]]]:
+        """Split a batched reply into (score, rationale) per company; None where a company is missing"""
+        parsed: List[Optional[Tuple[int, str]]] = [None] * count
+        match = re.search(r'\[.*\]', response, re.DOTALL)
+        if not match:
+            self.logger.warning("No JSON array found in batched response")
+            return parsed
+        
+        try:
+            entries = json.loads(match.group(0))
+        except json.JSONDecodeError as e:
+            self.logger.warning(f"Failed to decode batched response: {str(e)}")
+            return parsed
+        
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry.get("company", position + 1)) - 1
+                score = max(1, min(5, int(entry["score"])))
+            except (KeyError, TypeError, ValueError):
+                self.logger.warning(f"Skipping malformed batched entry: {entry}")
+                continue
+            if 0 <= index < count:
+                parsed[index] = (score, str(entry.get("rationale", "")).strip())
+        return parsed
+        
+    def evaluate_batch(self, data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score several companies with a single LLM request.
+        
+        Only the trimmed structured data is sent, no web search is performed.
+        Companies the reply does not cover fall back to a regular evaluate call.
+        """
+        self.logger.info(f"Starting batched evaluation of {len(data_list)} companies for {self.dimension_name}")
+        results: List[Optional[Dict[str, Any]]] = [None] * len(data_list)
+        batch_positions = []
+        trimmed_records = []
+        
+        for position, data in enumerate(data_list):
+            company_data = self.get_company_data(data)
+            trimmed_data = self.trim_company_data(company_data) if company_data else None
+            if not trimmed_data:
+                results[position] = {
+                    "score": 1,
+                    "rationale": f"Insufficient company information to evaluate {self.dimension_name}"
+                }
+                continue
+            batch_positions.append(position)
+            trimmed_records.append(trimmed_data)
+        
+        if trimmed_records:
+            try:
+                response = self._call_llm(self.build_batch_prompt(trimmed_records))
+                self.logger.debug(f"Full batched response: {response}")
+                parsed = self.parse_batch_response(response, len(trimmed_records))
+            except Exception as e:
+                self.logger.error(f"Error during batched evaluation: {str(e)}", exc_info=True)
+                parsed = [None] * len(trimmed_records)
+            
+            for position, entry in zip(batch_positions, parsed):
+                if entry is None:
+                    self.logger.warning(f"Batched response missed company {position + 1}, evaluating it individually")
+                    results[position] = self.evaluate(data_list[position])
+                else:
+                    score, rationale = entry
+                    results[position] = {"score": score, "rationale": rationale, "batched": True}
+        
+        return results
             
     def trim_company_data(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
         """Base method to trim company data - should be overridden by subclasses"""
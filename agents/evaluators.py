@@ -8,10 +8,29 @@ from agents.rubrics import (
     INVESTOR_BEHAVIOR_RUBRIC,
     INCUMBENT_BLIND_SPOT_RUBRIC
 )
-from typing import Dict, Any, List
+from tools.founder_cache import founder_cache, extract_founders, DEFAULT_PROFILE_TTL
+from tools.deadline import Deadline
+from tools.evidence_packer import split_snippets
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from langchain.chat_models import ChatOpenAI
 
 class FounderEdgeEvaluator(BaseEvaluator):
+    company_fields = (
+        "name",
+        "summary",
+        "employee_count",
+        "employee_count_by_role",
+        "average_tenure_by_level",
+        "funding_details",
+        "linkedin_url",
+        "twitter_url"
+    )
+    # Founder enrichment: resolve the people behind the company, then reuse
+    # each person's cached background instead of searching it per company
+    use_founder_cache = True
+    founder_profile_ttl = DEFAULT_PROFILE_TTL
+    max_founders = 3
+    
     def __init__(self):
         super().__init__("Founder Edge", FOUNDER_EDGE_RUBRIC)
     
@@ -24,6 +43,98 @@ class FounderEdgeEvaluator(BaseEvaluator):
             f"{company_name} founders previous startups"
         ]
     
+    def get_founder_resolution_queries(self, company_data: Dict[str, Any]) -> List[str]:
+        """Queries that name the people behind the company"""
+        company_name = company_data.get("name", "")
+        return [f"{company_name} founding team", f"{company_name} CEO linkedin"]
+    
+    def get_founder_profile_queries(self, founder: Dict[str, str], company_data: Dict[str, Any]) -> List[str]:
+        """
+        Background queries for one person, run only when their profile is not
+        cached. They are about the person alone, not this company, since the
+        profile is reused for every company they appear in.
+        """
+        return [
+            f"{founder['name']} founder background experience",
+            f"{founder['name']} previous startups"
+        ]
+    
+    def collect_search_results(
+        self,
+        company_data: Dict[str, Any],
+        run_query: Optional[Callable[[str], Any]] = None,
+        stats: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> List[Tuple[str, Any]]:
+        """
+        Founder enrichment sub-stage.
+        
+        Runs the resolution queries, extracts the founders they name, and uses
+        each founder's cached profile (by LinkedIn URL or normalized name) when
+        it is younger than founder_profile_ttl; only uncached founders are
+        searched, and their profiles are cached for other companies. Falls back
+        to the per-company search when no founder can be identified.
+        """
+        if not self.use_founder_cache:
+            return super().collect_search_results(company_data, run_query=run_query, stats=stats, deadline=deadline)
+        
+        run_query = run_query or self.search_tool.run
+        stats = stats if stats is not None else {}
+        company_name = company_data.get("name", "")
+        resolution_queries = self.get_founder_resolution_queries(company_data)
+        results = [
+            (query, result)
+            for query, result in zip(resolution_queries, self.run_queries_concurrently(resolution_queries, run_query, stats, deadline))
+            if result is not None
+        ]
+        founders = extract_founders([result for _, result in results], company_name, limit=self.max_founders)
+        if not founders:
+            self.logger.info(f"No founders identified for {company_name}, searching company-level founder queries")
+            return super().collect_search_results(company_data, run_query=run_query, stats=stats, deadline=deadline)
+        
+        stats.update({
+            "queries_planned": len(resolution_queries),
+            "queries_spent": len(resolution_queries),
+            "queries_skipped": 0,
+            "stop_reason": None,
+            "founders": [founder["name"] for founder in founders],
+            "founder_profiles_cached": 0
+        })
+        for founder in founders:
+            profile = founder_cache.get(founder["name"], founder["linkedin_url"], ttl=self.founder_profile_ttl)
+            if profile is not None:
+                stats["founder_profiles_cached"] += 1
+                results.append((f"Founder profile: {profile['name']}", profile["snippets"]))
+                continue
+            
+            profile_queries = self.get_founder_profile_queries(founder, company_data)
+            stats["queries_planned"] += len(profile_queries)
+            if not self.search_available(deadline):
+                stats["queries_skipped"] += len(profile_queries)
+                stats["stop_reason"] = "circuit_open"
+                continue
+            if deadline is not None and deadline.expired():
+                stats["queries_skipped"] += len(profile_queries)
+                stats["stop_reason"] = "deadline"
+                continue
+            stats["queries_spent"] += len(profile_queries)
+            fetched = [
+                (query, result)
+                for query, result in zip(profile_queries, self.run_queries_concurrently(profile_queries, run_query, stats, deadline))
+                if result is not None
+            ]
+            # A profile cut short by the deadline is not cached, so it is searched in full next time
+            if fetched and not (deadline is not None and deadline.expired()):
+                snippets = [snippet for _, result in fetched for snippet in split_snippets(result)]
+                founder_cache.put(founder["name"], founder["linkedin_url"], snippets, company=company_name)
+            results.extend(fetched)
+        
+        self.logger.info(
+            f"Founder enrichment for {company_name}: {len(founders)} founders, "
+            f"{stats['founder_profiles_cached']} profiles from cache"
+        )
+        return results
+    
     def trim_company_data(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
         if not company_data:
             return None
@@ -40,6 +151,16 @@ class FounderEdgeEvaluator(BaseEvaluator):
         }
 
 class NovelWedgeEvaluator(BaseEvaluator):
+    company_fields = (
+        "name",
+        "summary",
+        "founded",
+        "industry",
+        "headline",
+        "website",
+        "linkedin_url"
+    )
+    
     def __init__(self):
         super().__init__("Novel Wedge", NOVEL_WEDGE_RUBRIC)
     
@@ -68,6 +189,16 @@ class NovelWedgeEvaluator(BaseEvaluator):
         }
 
 class CustomerSignalEvaluator(BaseEvaluator):
+    company_fields = (
+        "name",
+        "summary",
+        "employee_count",
+        "employee_count_by_month",
+        "inferred_revenue",
+        "employee_growth_rate",
+        "linkedin_follower_count"
+    )
+    
     def __init__(self):
         super().__init__("Customer Signal", CUSTOMER_SIGNAL_RUBRIC)
     
@@ -95,6 +226,15 @@ class CustomerSignalEvaluator(BaseEvaluator):
         }
 
 class SalesMotionEvaluator(BaseEvaluator):
+    company_fields = (
+        "name",
+        "summary",
+        "employee_count_by_role",
+        "size",
+        "employee_count",
+        "inferred_revenue"
+    )
+    
     def __init__(self):
         super().__init__("Sales Motion", SALES_MOTION_RUBRIC)
     
@@ -121,6 +261,15 @@ class SalesMotionEvaluator(BaseEvaluator):
         }
 
 class MoatPotentialEvaluator(BaseEvaluator):
+    company_fields = (
+        "name",
+        "summary",
+        "industry",
+        "technologies",
+        "employee_count_by_role",
+        "average_employee_tenure"
+    )
+    
     def __init__(self):
         super().__init__("Moat Potential", MOAT_POTENTIAL_RUBRIC)
     
@@ -148,6 +297,16 @@ class MoatPotentialEvaluator(BaseEvaluator):
         }
 
 class InvestorBehaviorEvaluator(BaseEvaluator):
+    supports_batching = True
+    company_fields = (
+        "name",
+        "funding_details",
+        "latest_funding_stage",
+        "total_funding_raised",
+        "last_funding_date",
+        "number_funding_rounds"
+    )
+    
     def __init__(self):
         super().__init__("Investor Behavior", INVESTOR_BEHAVIOR_RUBRIC)
     
@@ -160,6 +319,17 @@ class InvestorBehaviorEvaluator(BaseEvaluator):
             f"{company_name} investment news"
         ]
     
+    def has_sufficient_structured_data(self, company_data: Dict[str, Any]) -> bool:
+        # Every round is on record with its amount and date
+        funding_details = company_data.get("funding_details") or []
+        number_funding_rounds = company_data.get("number_funding_rounds") or 0
+        if not funding_details or len(funding_details) < number_funding_rounds:
+            return False
+        return all(
+            round_details.get("funding_raised") and round_details.get("funding_round_date")
+            for round_details in funding_details
+        ) and bool(company_data.get("latest_funding_stage"))
+    
     def trim_company_data(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
         if not company_data:
             return None
@@ -174,6 +344,16 @@ class InvestorBehaviorEvaluator(BaseEvaluator):
         }
 
 class IncumbentBlindSpotEvaluator(BaseEvaluator):
+    company_fields = (
+        "name",
+        "summary",
+        "industry",
+        "competitors",
+        "employee_count",
+        "inferred_revenue",
+        "size"
+    )
+    
     def __init__(self):
         super().__init__("Incumbent Blind Spot", INCUMBENT_BLIND_SPOT_RUBRIC)
     
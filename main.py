@@ -1,42 +1,75 @@
 import sys
 import json
+import argparse
+import logging
 from dotenv import load_dotenv
 load_dotenv()  # Load environment variables from .env file
 
 # Added imports
 import os
-import csv
 
-from runners.evaluate_company import run_evaluation
+from runners.evaluate_company import (
+    run_evaluation,
+    run_batched_dimensions,
+    get_required_fields,
+    build_evaluators,
+    find_reusable_results,
+    summarize_cascade,
+    summarize_timeouts,
+    EVALUATOR_CLASSES
+)
+from runners.prescreen import prescreen_companies, PRESCREEN_FIELDS
+from runners.entity_resolution import resolve_entities, ENTITY_FIELDS
+from tools.company_record import project_record
+from tools.search_tool import set_search_backend
+from tools.output_sinks import CSVSink, create_sink
+from tools.hedging import configure_hedging, hedging_report
+from tools.circuit_breaker import configure_circuit_breakers, circuit_report, CIRCUIT_POLICIES
+from tools.metrics import metrics, start_metrics_server, ProgressView
+from runners.work_queue import WorkQueue, enqueue_companies, run_worker, collect_results
+from runners.service import serve
+from runners.scheduler import run_scheduled_evaluations
+from runners.prompt_profiler import build_profile_report, write_profile_report
+from runners.prompt_experiments import load_variants, run_prompt_experiment, build_shift_report, write_experiment_report
+from runners.dry_run import estimate_run
+from tools.company_dump import CompanyDumpReader, select_positions, parse_slice, parse_shard
 
 # Added helper function to simulate database fetch
-def get_simulated_bulk_data(companies_file_path="companies.json"):
+def get_simulated_bulk_data(companies_file_path="companies.json", record_slice=None, shard=None, fields=None):
     """
     Simulates fetching bulk data from a database by reading from the specified JSON file.
-    The file is expected to be a JSON list, where each element is an object
-    containing a "data" key, which in turn holds the company data dictionary.
+    The file is expected to be a JSON list (or JSONL file), where each element is an object
+    containing a "data" key, which in turn holds the company data dictionary. A
+    PeopleDataLabs response whose "data" key holds a list of companies is also accepted.
     This function returns the list of wrapper objects.
+
+    Records are read through a byte-offset index, so with record_slice ("a:b")
+    and shard ((i, N)) only the selected records are ever parsed. When fields is
+    given, each company is projected to a compact record holding only those
+    fields and the full parsed record is dropped straight away.
     """
     wrapped_company_data_list = []
     try:
-        with open(companies_file_path, 'r') as f:
-            content_list = json.load(f)
-
-        if not isinstance(content_list, list):
-            print(f"Error: Content of {companies_file_path} is not a list as expected.")
-            return []
-
-        for item_wrapper in content_list:
-            if isinstance(item_wrapper, dict) and "data" in item_wrapper:
-                company_data = item_wrapper["data"]
-                if isinstance(company_data, dict) and "name" in company_data:
-                    wrapped_company_data_list.append(item_wrapper)
-                elif isinstance(company_data, dict):
-                    print(f"Warning: Company data item in {companies_file_path} is missing a 'name' field: {company_data}")
+        with CompanyDumpReader(companies_file_path) as reader:
+            positions = select_positions(len(reader), record_slice=record_slice, shard=shard)
+            print(f"Reading {len(positions)} of {len(reader)} records from {companies_file_path}")
+
+            for item_wrapper in reader.iter_records(positions):
+                # Bare company records (e.g. a PDL response's "data" list) get wrapped
+                if isinstance(item_wrapper, dict) and "data" not in item_wrapper and "name" in item_wrapper:
+                    item_wrapper = {"data": item_wrapper}
+                if isinstance(item_wrapper, dict) and "data" in item_wrapper:
+                    company_data = item_wrapper["data"]
+                    if isinstance(company_data, dict) and "name" in company_data:
+                        if fields is not None:
+                            item_wrapper = {"data": project_record(company_data, fields)}
+                        wrapped_company_data_list.append(item_wrapper)
+                    elif isinstance(company_data, dict):
+                        print(f"Warning: Company data item in {companies_file_path} is missing a 'name' field: {company_data}")
+                    else:
+                        print(f"Warning: 'data' field in an item in {companies_file_path} is not a dictionary: {item_wrapper}")
                 else:
-                    print(f"Warning: 'data' field in an item in {companies_file_path} is not a dictionary: {item_wrapper}")
-            else:
-                print(f"Warning: Item in {companies_file_path} does not have the expected structure (object with a 'data' key): {item_wrapper}")
+                    print(f"Warning: Item in {companies_file_path} does not have the expected structure (object with a 'data' key): {item_wrapper}")
         
         return wrapped_company_data_list
 
@@ -56,112 +89,594 @@ def normalize_name_for_file(name: str) -> str:
     return name.lower().replace(" ", "_").replace(".", "").replace(",", "")
 
 
+# Define the fields to be extracted for the CSV, based on Problem.md
+# "name" will be added separately as the first column.
+SCORE_AND_RATIONALE_FIELDS = [
+    "overall_score",
+    "founder_edge_score", "novel_wedge_score", "customer_signal_score",
+    "sales_motion_score", "moat_potential_score", "investor_behavior_score",
+    "incumbent_blind_spot_score",
+    "founder_edge_rationale", "novel_wedge_rationale", "customer_signal_rationale",
+    "sales_motion_rationale", "moat_potential_rationale",
+    "investor_behavior_rationale", "incumbent_blind_spot_rationale"
+]
+
+CSV_METADATA_FIELDS = [
+    "website", "linkedin_url"
+]
+
+PRESCREEN_CSV_FIELDS = [
+    "prescreen_score", "prescreen_rank", "prescreen_selected"
+]
+
+# Set on rows of duplicate records to the name of the record that was evaluated
+ENTITY_CSV_FIELDS = [
+    "duplicate_of"
+]
+
+# Dimensions abandoned at their deadline, left out of overall_score
+TIMEOUT_CSV_FIELDS = [
+    "timed_out_dimensions"
+]
+
+CSV_HEADERS = (
+    ["name"] + CSV_METADATA_FIELDS + ENTITY_CSV_FIELDS + PRESCREEN_CSV_FIELDS + SCORE_AND_RATIONALE_FIELDS
+    + TIMEOUT_CSV_FIELDS
+)
+
+
+def parse_dimension_timeouts(value: str) -> dict:
+    """
+    Parse --dimension-timeout: "60" for every dimension, or per dimension as
+    "Founder Edge=90,Novel Wedge=45" (a bare number sets the default for the rest)
+    """
+    timeouts = {}
+    for part in [part.strip() for part in value.split(",") if part.strip()]:
+        dimension, _, seconds = part.rpartition("=")
+        timeouts[dimension.strip() or None] = float(seconds)
+    return timeouts
+
+
+def save_company_log(original_name: str, evaluation_results: dict) -> None:
+    """Save a company's evaluation results to logs/<normalized name>.json"""
+    log_file_path = f"logs/{normalize_name_for_file(original_name)}.json"
+    with open(log_file_path, 'w') as f:
+        json.dump(evaluation_results, f, indent=2)
+    print(f"Saved evaluation log for '{original_name}' to '{log_file_path}'")
+
+
+def build_csv_row(company_data_item, evaluation_results=None, prescreen_row=None) -> dict:
+    """Flatten a company's metadata, pre-screen and evaluation results into one CSV row."""
+    csv_row = {"name": company_data_item.get("name"), **(prescreen_row or {})}
+
+    # Extract metadata fields
+    for field in CSV_METADATA_FIELDS:
+        csv_row[field] = company_data_item.get(field, "")
+
+    if evaluation_results is None:
+        return csv_row
+
+    if evaluation_results and isinstance(evaluation_results, dict):
+        csv_row["overall_score"] = evaluation_results.get("Overall", {}).get("score")
+        csv_row["timed_out_dimensions"] = ", ".join(evaluation_results.get("Overall", {}).get("timed_out_dimensions") or [])
+
+        def get_nested_value(results_dict, main_key, sub_key):
+            return results_dict.get(main_key, {}).get(sub_key)
+
+        csv_row["founder_edge_score"] = get_nested_value(evaluation_results, "Founder Edge", "score")
+        csv_row["founder_edge_rationale"] = get_nested_value(evaluation_results, "Founder Edge", "rationale")
+        csv_row["novel_wedge_score"] = get_nested_value(evaluation_results, "Novel Wedge", "score")
+        csv_row["novel_wedge_rationale"] = get_nested_value(evaluation_results, "Novel Wedge", "rationale")
+        csv_row["customer_signal_score"] = get_nested_value(evaluation_results, "Customer Signal", "score")
+        csv_row["customer_signal_rationale"] = get_nested_value(evaluation_results, "Customer Signal", "rationale")
+        csv_row["sales_motion_score"] = get_nested_value(evaluation_results, "Sales Motion", "score")
+        csv_row["sales_motion_rationale"] = get_nested_value(evaluation_results, "Sales Motion", "rationale")
+        csv_row["moat_potential_score"] = get_nested_value(evaluation_results, "Moat Potential", "score")
+        csv_row["moat_potential_rationale"] = get_nested_value(evaluation_results, "Moat Potential", "rationale")
+        csv_row["investor_behavior_score"] = get_nested_value(evaluation_results, "Investor Behavior", "score")
+        csv_row["investor_behavior_rationale"] = get_nested_value(evaluation_results, "Investor Behavior", "rationale")
+        csv_row["incumbent_blind_spot_score"] = get_nested_value(evaluation_results, "Incumbent Blind Spot", "score")
+        csv_row["incumbent_blind_spot_rationale"] = get_nested_value(evaluation_results, "Incumbent Blind Spot", "rationale")
+    else:
+        for field in SCORE_AND_RATIONALE_FIELDS:
+            if field not in csv_row: 
+                csv_row[field] = evaluation_results.get(field, "ERROR_FALLBACK") if isinstance(evaluation_results, dict) else "ERROR_UNEXPECTED_RESULTS_TYPE"
+
+    return csv_row
+
+
+def build_prescreen_row(prescreen: dict) -> dict:
+    """Pre-screen columns of a company's CSV row"""
+    return {
+        "prescreen_score": prescreen["score"],
+        "prescreen_rank": prescreen["rank"],
+        "prescreen_selected": prescreen["selected"]
+    }
+
+
+def open_output_sinks(csv_output_filename: str, sink_specs=None, batch_size=None, flush_interval=None) -> list:
+    """The summary CSV sink plus any extra sinks given as specs (see create_sink)"""
+    options = {}
+    if batch_size is not None:
+        options["batch_size"] = batch_size
+    if flush_interval is not None:
+        options["flush_interval"] = flush_interval
+    sinks = [CSVSink(csv_output_filename, CSV_HEADERS, **options)]
+    for spec in sink_specs or []:
+        sinks.append(create_sink(spec, CSV_HEADERS, batch_size=batch_size, flush_interval=flush_interval))
+    return sinks
+
+
+def write_row(sinks: list, csv_row: dict) -> None:
+    """Hand a row to every sink; they buffer it and write it in the background"""
+    for sink in sinks:
+        sink.write(csv_row)
+
+
+def emit_company(sinks: list, company_data_item, evaluation_results=None, prescreen_row=None, aliases=None) -> None:
+    """
+    Save a company's log and write its row, plus one row per duplicate record
+    pointing at the canonical company's results.
+    """
+    original_name = company_data_item.get("name")
+    if evaluation_results is not None:
+        failed = not isinstance(evaluation_results.get("metadata"), dict)
+        metrics.inc("echo_companies_failed_total" if failed else "echo_companies_completed_total")
+        if aliases and isinstance(evaluation_results.get("metadata"), dict):
+            evaluation_results["metadata"]["aliases"] = [alias.get("name") for alias in aliases]
+        save_company_log(original_name, evaluation_results)
+    write_row(sinks, build_csv_row(company_data_item, evaluation_results, prescreen_row))
+    for alias in aliases or []:
+        # An exact duplicate adds nothing beyond the canonical row
+        if normalize_name_for_file(alias.get("name")) == normalize_name_for_file(original_name):
+            continue
+        write_row(sinks, {**build_csv_row(alias, evaluation_results, prescreen_row), "duplicate_of": original_name})
+
+
+def close_output_sinks(sinks: list, csv_output_filename: str) -> None:
+    """Flush and close every sink"""
+    for sink in sinks:
+        sink.close()
+
+    print(f"\nProcessing complete. Summary CSV generated: '{csv_output_filename}'")
+    print(f"Processed {sinks[0].rows_written} companies.")
+    for sink in sinks[1:]:
+        print(f"Wrote {sink.rows_written} rows to {sink.name} sink.")
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch-evaluate companies across all dimensions")
+    parser.add_argument("input_filename", nargs="?", default="companies.json",
+                        help="JSON file with the companies to evaluate (default: companies.json)")
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help="Score batching-enabled dimensions for this many companies per LLM request (default: off)")
+    parser.add_argument("--prescreen-top", type=float, default=None,
+                        help="Only fully evaluate this fraction of the batch, ranked by the rule-based pre-screen (e.g. 0.2)")
+    parser.add_argument("--prescreen-threshold", type=float, default=None,
+                        help="Only fully evaluate companies whose pre-screen score (0-100) is at least this value")
+    parser.add_argument("--ensemble", type=int, default=1,
+                        help="Score every dimension with up to this many LLM samples, drawn in waves until a majority agrees (default: 1)")
+    parser.add_argument("--slice", type=parse_slice, default=None, dest="record_slice", metavar="A:B",
+                        help="Only process records A (inclusive) to B (exclusive) of the input, e.g. 2:12")
+    parser.add_argument("--shard", type=parse_shard, default=None, metavar="I/N",
+                        help="Split the (sliced) input into N contiguous shards and process shard I (0-based)")
+    parser.add_argument("--search-backend", default="serpapi",
+                        help="Search backend(s): serpapi, local:DIR, or a comma-separated list whose results are merged "
+                             "(default: serpapi)")
+    parser.add_argument("--queue", default=None, metavar="PATH",
+                        help="Work-queue mode: SQLite queue file shared by the coordinator and all workers. "
+                             "With an input file, enqueue its (pre-screened) companies and exit")
+    parser.add_argument("--per-dimension", action="store_true",
+                        help="With --queue, enqueue one task per company and dimension instead of per company")
+    parser.add_argument("--worker", action="store_true",
+                        help="With --queue, claim and evaluate tasks until the queue is drained")
+    parser.add_argument("--worker-id", default=None,
+                        help="Worker name recorded on leased tasks (default: hostname-pid)")
+    parser.add_argument("--lease-seconds", type=float, default=600.0,
+                        help="How long a claimed task stays leased without a heartbeat (default: 600)")
+    parser.add_argument("--export", action="store_true",
+                        help="With --queue, write logs/ and the summary CSV from the results in the queue")
+    parser.add_argument("--cascade-model", default=None,
+                        help="Score with this cheaper model first and escalate to gpt-4.1 only when it is unsure "
+                             "or the score is high (e.g. gpt-4.1-mini)")
+    parser.add_argument("--cascade-dimensions", default=None,
+                        help="Comma-separated dimensions that use the cascade (default: all)")
+    parser.add_argument("--cascade-min-score", type=int, default=3,
+                        help="Escalate cheap-model scores at or above this value (default: 3)")
+    parser.add_argument("--profile-prompts", action="store_true",
+                        help="Count prompt tokens per section (preamble, calibration, company data, web results, rubric) "
+                             "and write a profile report to reports/")
+    parser.add_argument("--experiment", metavar="VARIANTS_JSON", default=None,
+                        help="Score the selected companies under each prompt/rubric variant in this file, "
+                             "searching once per company, and write a score-shift report to reports/")
+    parser.add_argument("--experiment-dimensions", default=None,
+                        help="Comma-separated dimensions to score in --experiment (default: all)")
+    parser.add_argument("--hedge-percentile", type=float, default=None,
+                        help="Send a duplicate LLM/search request when one runs past this percentile of recent "
+                             "latencies, e.g. 0.95 (default: off)")
+    parser.add_argument("--hedge-max-ratio", type=float, default=0.1,
+                        help="Cap duplicate requests at this fraction of all calls (default: 0.1)")
+    parser.add_argument("--circuit-threshold", type=int, default=5,
+                        help="Open the search/LLM circuit after this many consecutive failures (default: 5)")
+    parser.add_argument("--circuit-reset", type=float, default=60.0,
+                        help="Seconds an open circuit waits before a half-open probe request (default: 60)")
+    parser.add_argument("--circuit-policy", choices=CIRCUIT_POLICIES, default="degrade",
+                        help="While a circuit is open: 'degrade' fails fast and evaluates without web results, "
+                             "'pause' holds the batch until the backend recovers (default: degrade)")
+    parser.add_argument("--no-dedupe", action="store_true",
+                        help="Evaluate every input record, even ones resolved to the same company "
+                             "(by domain, LinkedIn id/slug, profile or name)")
+    parser.add_argument("--founder-ttl-days", type=float, default=None,
+                        help="Re-search a founder's background once their cached profile is this old (default: 30)")
+    parser.add_argument("--no-founder-cache", action="store_true",
+                        help="Search Founder Edge per company instead of reusing cached founder profiles")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse dimension results from logs/<company>.json whose inputs are unchanged and only "
+                             "re-evaluate the dimensions affected by new data")
+    parser.add_argument("--company-timeout", type=float, default=None, metavar="SECONDS",
+                        help="Wall-clock deadline per company; unfinished dimensions are marked timed out and "
+                             "Overall averages the ones that finished (default: none)")
+    parser.add_argument("--dimension-timeout", type=parse_dimension_timeouts, default=None, metavar="SECONDS",
+                        help="Wall-clock deadline per dimension evaluation, for all dimensions (60) or per "
+                             "dimension (\"Founder Edge=90,Novel Wedge=45\")")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Build every prompt without sending it and estimate search queries, LLM calls, tokens, "
+                             "cost and wall time for the run, then exit")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Run this many dimension jobs concurrently across companies, longest estimated jobs first "
+                             "(default: 1, companies one at a time)")
+    parser.add_argument("--sink", action="append", default=[], metavar="SPEC",
+                        help="Also stream result rows to csv:PATH, jsonl:PATH, sqlite:PATH, "
+                             "sheets:SPREADSHEET_KEY[/WORKSHEET] or sheets:fake (repeatable)")
+    parser.add_argument("--sink-batch-size", type=int, default=None,
+                        help="Rows per sink write (default: 50, 100 for Google Sheets)")
+    parser.add_argument("--sink-flush-interval", type=float, default=None,
+                        help="Seconds between background sink flushes (default: 5, 10 for Google Sheets)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve live Prometheus metrics on http://127.0.0.1:PORT/metrics (default: off)")
+    parser.add_argument("--progress", action="store_true",
+                        help="Show a one-line live progress view instead of INFO logs")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run a long-lived HTTP evaluation service instead of a batch (POST /evaluate)")
+    parser.add_argument("--host", default="127.0.0.1", help="Service bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Service port (default: 8080)")
+    parser.add_argument("--cache-ttl", type=float, default=3600.0,
+                        help="Seconds the service serves a company's result from memory (default: 3600)")
+    args = parser.parse_args()
+    
     # Get input filename from command line argument, default to companies.json
-    if len(sys.argv) > 1:
-        input_filename = sys.argv[1]
-    else:
-        input_filename = "companies.json"
+    input_filename = args.input_filename
     
     # Generate output filename based on input filename
     base_name = os.path.splitext(input_filename)[0]  # Remove extension
+    if args.shard:
+        base_name = f"{base_name}_shard{args.shard[0]}of{args.shard[1]}"
     csv_output_filename = f"{base_name}_evaluation_summary.csv"
     
+    set_search_backend(args.search_backend)
+    configure_circuit_breakers(args.circuit_threshold, args.circuit_reset, args.circuit_policy)
+    if args.hedge_percentile:
+        configure_hedging(args.hedge_percentile, max_extra_ratio=args.hedge_max_ratio)
+
+    evaluator_settings = {"ensemble_size": args.ensemble, "profile_prompts": args.profile_prompts}
+    if args.cascade_model:
+        if args.ensemble > 1:
+            parser.error("--ensemble cannot be combined with --cascade-model")
+        cascade_settings = {"cascade_model": args.cascade_model, "cascade_escalate_min_score": args.cascade_min_score}
+        if args.cascade_dimensions:
+            cascade_dimensions = [d.strip() for d in args.cascade_dimensions.split(",") if d.strip()]
+            unknown = [d for d in cascade_dimensions if d not in EVALUATOR_CLASSES]
+            if unknown:
+                parser.error(f"Unknown dimensions for --cascade-dimensions: {', '.join(unknown)}")
+            evaluator_settings["dimension_settings"] = {d: cascade_settings for d in cascade_dimensions}
+        else:
+            evaluator_settings.update(cascade_settings)
+
+    founder_settings = {}
+    if args.founder_ttl_days is not None:
+        founder_settings["founder_profile_ttl"] = args.founder_ttl_days * 24 * 3600
+    if args.no_founder_cache:
+        founder_settings["use_founder_cache"] = False
+    if founder_settings:
+        dimension_settings = evaluator_settings.setdefault("dimension_settings", {})
+        dimension_settings["Founder Edge"] = {**dimension_settings.get("Founder Edge", {}), **founder_settings}
+
+    for dimension, seconds in (args.dimension_timeout or {}).items():
+        if dimension is None:
+            evaluator_settings["evaluation_timeout"] = seconds
+        elif dimension not in EVALUATOR_CLASSES:
+            parser.error(f"Unknown dimension for --dimension-timeout: {dimension}")
+        else:
+            dimension_settings = evaluator_settings.setdefault("dimension_settings", {})
+            dimension_settings[dimension] = {**dimension_settings.get(dimension, {}), "evaluation_timeout": seconds}
+
     # Create data and logs directories if they don't exist
     os.makedirs("data", exist_ok=True)
     os.makedirs("logs", exist_ok=True)
 
-    companies_data_list = get_simulated_bulk_data(input_filename)
-    all_csv_rows = []
-
-    # Define the fields to be extracted for the CSV, based on Problem.md
-    # "name" will be added separately as the first column.
-    score_and_rationale_fields = [
-        "overall_score",
-        "founder_edge_score", "novel_wedge_score", "customer_signal_score",
-        "sales_motion_score", "moat_potential_score", "investor_behavior_score",
-        "incumbent_blind_spot_score",
-        "founder_edge_rationale", "novel_wedge_rationale", "customer_signal_rationale",
-        "sales_motion_rationale", "moat_potential_rationale",
-        "investor_behavior_rationale", "incumbent_blind_spot_rationale"
-    ]
-
-    metadata_fields = [
-        "website", "linkedin_url"
-    ]
-
-    # Process companies based on slicing (e.g., companies_data_list[2:12])
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+
+    # Service mode: keep evaluators warm and answer evaluation requests over HTTP
+    if args.serve:
+        serve(host=args.host, port=args.port, cache_ttl=args.cache_ttl,
+              evaluator_settings=evaluator_settings)
+        sys.exit(0)
+
+    # Work-queue worker / export: everything comes from the shared queue file
+    if args.queue and (args.worker or args.export):
+        queue = WorkQueue(args.queue, lease_seconds=args.lease_seconds)
+        if args.worker:
+            run_worker(queue, worker_id=args.worker_id, evaluator_settings=evaluator_settings,
+                       company_timeout=args.company_timeout)
+        if args.export:
+            export_csv_filename = f"{os.path.splitext(args.queue)[0]}_evaluation_summary.csv"
+            sinks = open_output_sinks(export_csv_filename, args.sink, args.sink_batch_size, args.sink_flush_interval)
+            for entry in collect_results(queue).values():
+                save_company_log(entry["company_data"]["name"], entry["results"])
+                write_row(sinks, build_csv_row(entry["company_data"], entry["results"]))
+            close_output_sinks(sinks, export_csv_filename)
+        print(f"Queue status: {queue.counts()}")
+        queue.close()
+        sys.exit(0)
+
+    # Only the fields some stage actually reads are kept in memory
+    companies_data_list = get_simulated_bulk_data(
+        input_filename,
+        record_slice=args.record_slice,
+        shard=args.shard,
+        fields=get_required_fields(PRESCREEN_FIELDS, ENTITY_FIELDS)
+    )
+    all_evaluation_results = []
+
+    # Slicing and sharding (--slice 2:12, --shard 0/4) are applied while reading the input
+    company_items = []
     for company_data_wrapper in companies_data_list:
         company_data_item = company_data_wrapper.get("data")
         if not company_data_item:
             print("Skipping item due to missing 'data' field:", company_data_wrapper)
             continue
             
-        original_name = company_data_item.get("name")
-        if not original_name:
+        if not company_data_item.get("name"):
             print("Skipping item due to missing 'name':", company_data_item)
             continue
+        
+        company_items.append(company_data_item)
+
+    # Entity resolution: records sharing a domain, LinkedIn id/slug, profile or name
+    # are one company, evaluated once; the other records become its aliases
+    company_aliases = {}
+    if not args.no_dedupe:
+        canonical_positions, _ = resolve_entities(company_items)
+        kept_positions = [p for p, canonical in enumerate(canonical_positions) if p == canonical]
+        new_index = {p: i for i, p in enumerate(kept_positions)}
+        for position, canonical in enumerate(canonical_positions):
+            if position != canonical:
+                company_aliases.setdefault(new_index[canonical], []).append(company_items[position])
+        if company_aliases:
+            print(f"Entity resolution: {len(company_items) - len(kept_positions)} duplicate records collapsed "
+                  f"into {len(company_aliases)} companies.")
+        company_items = [company_items[p] for p in kept_positions]
+
+    # Cheap rule-based pre-screen over the whole batch; only selected companies get the full evaluation
+    prescreen_results = prescreen_companies(
+        company_items,
+        top_fraction=args.prescreen_top,
+        threshold=args.prescreen_threshold
+    )
+    selected_positions = [i for i, prescreen in enumerate(prescreen_results) if prescreen["selected"]]
+    print(f"Pre-screen selected {len(selected_positions)} of {len(company_items)} companies for full evaluation.")
+    metrics.start_run(len(selected_positions))
+
+    # Prompt experiment: evidence is gathered once per company, only the LLM stage runs per variant
+    if args.experiment:
+        experiment_dimensions = None
+        if args.experiment_dimensions:
+            experiment_dimensions = [d.strip() for d in args.experiment_dimensions.split(",") if d.strip()]
+            unknown = [d for d in experiment_dimensions if d not in EVALUATOR_CLASSES]
+            if unknown:
+                parser.error(f"Unknown dimensions for --experiment-dimensions: {', '.join(unknown)}")
+        variants = load_variants(args.experiment)
+        experiment_results = run_prompt_experiment(
+            [company_items[i] for i in selected_positions],
+            variants,
+            dimensions=experiment_dimensions,
+            evaluator_settings=evaluator_settings,
+            workers=max(4, args.workers)
+        )
+        shift_report = build_shift_report(experiment_results)
+        for variant, dimension_shifts in shift_report["shifts"].items():
+            overall = dimension_shifts.get("Overall")
+            if overall:
+                print(f"Variant '{variant}': Overall shift {overall['mean_shift']:+} "
+                      f"(mean abs {overall['mean_abs_shift']}) over {overall['companies']} companies")
+        json_path, markdown_path = write_experiment_report(shift_report, experiment_results)
+        print(f"Prompt experiment written to '{json_path}' and '{markdown_path}'")
+        sys.exit(0)
+
+    # Work-queue coordinator: enqueue the selected companies for the workers
+    if args.queue:
+        queue = WorkQueue(args.queue, lease_seconds=args.lease_seconds)
+        selected_items = [company_items[i] for i in selected_positions]
+        added = enqueue_companies(
+            queue,
+            selected_items,
+            [normalize_name_for_file(item.get("name")) for item in selected_items],
+            per_dimension=args.per_dimension
+        )
+        print(f"Enqueued {added} new tasks into '{args.queue}'. Queue status: {queue.counts()}")
+        queue.close()
+        sys.exit(0)
+
+    # Refresh: reuse stored dimension results whose trimmed data, queries and rubric are unchanged
+    reused_results = {}
+    if args.incremental:
+        # Built once with this run's settings, so the hashes reflect the models and prompts actually used
+        incremental_evaluators = build_evaluators(**evaluator_settings)
+        for position in selected_positions:
+            log_file_path = f"logs/{normalize_name_for_file(company_items[position].get('name'))}.json"
+            if not os.path.exists(log_file_path):
+                continue
+            try:
+                with open(log_file_path, 'r') as f:
+                    previous_results = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Warning: could not read previous results from '{log_file_path}': {e}")
+                continue
+            reused_results[position] = find_reusable_results(
+                company_items[position], previous_results, evaluators=incremental_evaluators
+            )
+        print(f"Reusing {sum(len(r) for r in reused_results.values())} unchanged dimension results.")
+
+    # Dry run: count what the run would spend, skipping work that earlier runs cached
+    if args.dry_run:
+        estimate = estimate_run(
+            [company_items[i] for i in selected_positions],
+            evaluator_settings=evaluator_settings,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            reused_results=[reused_results.get(i, {}) for i in selected_positions]
+        )
+        for dimension, entry in estimate["dimensions"].items():
+            print(f"Dry run {dimension}: {entry['jobs']} jobs, {entry['reused']} reused, "
+                  f"{entry['search_queries_expected']:g}/{entry['search_queries_planned']} queries "
+                  f"({entry['search_cached']} cached), {sum(entry['llm_calls'].values()):g} LLM calls, "
+                  f"{entry['prompt_tokens']:.0f} prompt tokens, ${entry['cost_usd']:.4f}")
+        totals = estimate["totals"]
+        calls = ", ".join(f"{model}: {count:g}" for model, count in totals["llm_calls"].items()) or "none"
+        print(f"Dry run total: {totals['search_queries_expected']:g} search queries, LLM calls ({calls}), "
+              f"{totals['prompt_tokens']:.0f} prompt + {totals['completion_tokens']:.0f} completion tokens, "
+              f"${totals['cost_usd']:.4f}, ~{totals['wall_seconds']:.0f}s wall time with {args.workers} workers "
+              f"({estimate['traces_used']} past traces)")
+        dry_run_filename = f"{base_name}_dry_run.json"
+        with open(dry_run_filename, 'w') as f:
+            json.dump(estimate, f, indent=2)
+        print(f"Dry-run estimate written to '{dry_run_filename}'")
+        sys.exit(0)
+
+    # Score data-only dimensions for several companies per request when enabled
+    batched_results = {}
+    if args.batch_size > 1:
+        selected_items = [company_items[i] for i in selected_positions]
+        batched_results = dict(zip(selected_positions, run_batched_dimensions(
+            selected_items,
+            args.batch_size,
+            precomputed_results=[reused_results.get(i, {}) for i in selected_positions],
+            evaluator_settings=evaluator_settings
+        )))
+    precomputed = {
+        position: {**reused_results.get(position, {}), **batched_results.get(position, {})}
+        for position in selected_positions
+    }
+
+    sinks = open_output_sinks(csv_output_filename, args.sink, args.sink_batch_size, args.sink_flush_interval)
+
+    progress_view = None
+    if args.progress:
+        logging.getLogger().setLevel(logging.WARNING)
+        progress_view = ProgressView().start()
+
+    # Concurrent dimension jobs ordered by estimated cost from past traces;
+    # each company's row is streamed to the sinks as soon as it finishes
+    scheduled_results = {}
+    emitted_positions = set()
+    if args.workers > 1:
+        selected_items = [company_items[i] for i in selected_positions]
+
+        def emit_scheduled_company(selected_index, evaluation_results):
+            position = selected_positions[selected_index]
+            all_evaluation_results.append(evaluation_results)
+            emit_company(sinks, company_items[position], evaluation_results,
+                         build_prescreen_row(prescreen_results[position]), company_aliases.get(position))
+            emitted_positions.add(position)
+
+        schedule_results, schedule_stats = run_scheduled_evaluations(
+            selected_items,
+            workers=args.workers,
+            precomputed_results=[precomputed[i] for i in selected_positions],
+            evaluator_settings=evaluator_settings,
+            on_company_done=emit_scheduled_company,
+            company_timeout=args.company_timeout
+        )
+        scheduled_results = dict(zip(selected_positions, schedule_results))
+        print(f"Schedule stats: {schedule_stats}")
+
+    for position, (company_data_item, prescreen) in enumerate(zip(company_items, prescreen_results)):
+        original_name = company_data_item.get("name")
+
+        prescreen_row = build_prescreen_row(prescreen)
+
+        if not prescreen["selected"]:
+            emit_company(sinks, company_data_item, prescreen_row=prescreen_row, aliases=company_aliases.get(position))
+            print(f"Skipped full evaluation for '{original_name}' (pre-screen score {prescreen['score']})")
+            continue
+
+        if position in emitted_positions:
+            continue
 
-        normalized_base_name = normalize_name_for_file(original_name)
+        precomputed_results = precomputed.get(position)
 
         # Run evaluation
         try:
-            evaluation_results = run_evaluation(company_data_item)
+            if position in scheduled_results:
+                evaluation_results = scheduled_results[position]
+                if evaluation_results is None:
+                    raise ValueError("invalid company data")
+            else:
+                evaluation_results = run_evaluation(
+                    company_data_item,
+                    precomputed_results=precomputed_results,
+                    evaluator_settings=evaluator_settings,
+                    company_timeout=args.company_timeout
+                )
         except Exception as e:
             print(f"Error running evaluation for {original_name}: {e}")
-            evaluation_results = {field: "ERROR" for field in score_and_rationale_fields}
-            if "overall_score" in score_and_rationale_fields: # Ensure overall_score is handled if defined
+            evaluation_results = {field: "ERROR" for field in SCORE_AND_RATIONALE_FIELDS}
+            if "overall_score" in SCORE_AND_RATIONALE_FIELDS: # Ensure overall_score is handled if defined
                  evaluation_results["overall_score"] = "ERROR"
             else: # Fallback if overall_score wasn't in the list for some reason
                  evaluation_results["Overall"] = {"score": "ERROR"} 
 
-        # Save the evaluation results to logs/
-        log_file_path = f"logs/{normalized_base_name}.json"
-        with open(log_file_path, 'w') as f:
-            json.dump(evaluation_results, f, indent=2)
-        print(f"Saved evaluation log for '{original_name}' to '{log_file_path}'")
-
-        # Prepare data for CSV
-        csv_row = {"name": original_name}
-
-        # Extract metadata fields
-        for field in metadata_fields:
-            csv_row[field] = company_data_item.get(field, "")
-
-        if evaluation_results and isinstance(evaluation_results, dict):
-            csv_row["overall_score"] = evaluation_results.get("Overall", {}).get("score")
-
-            def get_nested_value(results_dict, main_key, sub_key):
-                return results_dict.get(main_key, {}).get(sub_key)
-
-            csv_row["founder_edge_score"] = get_nested_value(evaluation_results, "Founder Edge", "score")
-            csv_row["founder_edge_rationale"] = get_nested_value(evaluation_results, "Founder Edge", "rationale")
-            csv_row["novel_wedge_score"] = get_nested_value(evaluation_results, "Novel Wedge", "score")
-            csv_row["novel_wedge_rationale"] = get_nested_value(evaluation_results, "Novel Wedge", "rationale")
-            csv_row["customer_signal_score"] = get_nested_value(evaluation_results, "Customer Signal", "score")
-            csv_row["customer_signal_rationale"] = get_nested_value(evaluation_results, "Customer Signal", "rationale")
-            csv_row["sales_motion_score"] = get_nested_value(evaluation_results, "Sales Motion", "score")
-            csv_row["sales_motion_rationale"] = get_nested_value(evaluation_results, "Sales Motion", "rationale")
-            csv_row["moat_potential_score"] = get_nested_value(evaluation_results, "Moat Potential", "score")
-            csv_row["moat_potential_rationale"] = get_nested_value(evaluation_results, "Moat Potential", "rationale")
-            csv_row["investor_behavior_score"] = get_nested_value(evaluation_results, "Investor Behavior", "score")
-            csv_row["investor_behavior_rationale"] = get_nested_value(evaluation_results, "Investor Behavior", "rationale")
-            csv_row["incumbent_blind_spot_score"] = get_nested_value(evaluation_results, "Incumbent Blind Spot", "score")
-            csv_row["incumbent_blind_spot_rationale"] = get_nested_value(evaluation_results, "Incumbent Blind Spot", "rationale")
-        else:
-            for field in score_and_rationale_fields:
-                if field not in csv_row: 
-                    csv_row[field] = evaluation_results.get(field, "ERROR_FALLBACK") if isinstance(evaluation_results, dict) else "ERROR_UNEXPECTED_RESULTS_TYPE"
-        
-        all_csv_rows.append(csv_row)
+        # Save the evaluation results to logs/ and write the CSV rows
+        all_evaluation_results.append(evaluation_results)
+        emit_company(sinks, company_data_item, evaluation_results, prescreen_row, company_aliases.get(position))
 
-    # Write the compiled CSV file
-    csv_headers = ["name"] + metadata_fields + score_and_rationale_fields
+    if progress_view is not None:
+        progress_view.stop()
+    close_output_sinks(sinks, csv_output_filename)
 
-    with open(csv_output_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=csv_headers, extrasaction='ignore')
-        writer.writeheader()
-        writer.writerows(all_csv_rows)
+    timeout_summary = summarize_timeouts(all_evaluation_results)
+    if timeout_summary["timed_out"] or args.company_timeout or args.dimension_timeout:
+        per_dimension = ", ".join(f"{dimension}: {count}" for dimension, count in timeout_summary["dimensions"].items())
+        print(f"Timeouts: {timeout_summary['timed_out']} dimension evaluations in {timeout_summary['companies']} "
+              f"companies timed out" + (f" ({per_dimension})" if per_dimension else ""))
 
-    print(f"\nProcessing complete. Summary CSV generated: '{csv_output_filename}'")
-    print(f"Processed {len(all_csv_rows)} companies.")
+    if args.cascade_model:
+        cascade_summary = summarize_cascade(all_evaluation_results)
+        cascade_report_filename = f"{base_name}_cascade_report.json"
+        with open(cascade_report_filename, 'w') as f:
+            json.dump(cascade_summary, f, indent=2)
+        for dimension, entry in cascade_summary.items():
+            print(f"Cascade {dimension}: escalated {entry['escalated']}/{entry['calls']} "
+                  f"({entry['escalation_rate']:.0%}), saved ${entry['savings_usd']:.4f}")
+        print(f"Cascade report written to '{cascade_report_filename}'")
+
+    if args.profile_prompts:
+        json_path, markdown_path = write_profile_report(build_profile_report(all_evaluation_results))
+        print(f"Prompt profile written to '{json_path}' and '{markdown_path}'")
+
+    if args.hedge_percentile:
+        hedge_report = hedging_report()
+        hedge_report_filename = f"{base_name}_hedging_report.json"
+        with open(hedge_report_filename, 'w') as f:
+            json.dump(hedge_report, f, indent=2)
+        for kind, entries in hedge_report.items():
+            for key, entry in entries.items():
+                print(f"Hedging {kind} {key}: hedged {entry['hedged']}/{entry['calls']} ({entry['hedge_rate']:.0%}), "
+                      f"p95 {entry['p95_seconds']}s vs {entry['unhedged_p95_seconds']}s unhedged")
+        print(f"Hedging report written to '{hedge_report_filename}'")
+
+    for circuit, entry in circuit_report().items():
+        if entry["opened"]:
+            print(f"Circuit {circuit}: opened {entry['opened']} times, {entry['fast_failures']} calls failed fast, "
+                  f"{entry['paused_seconds']:.0f}s paused")
@@ -0,0 +1,210 @@
+from typing import Dict, Any, List, Optional
+import heapq
+import logging
+
+from runners.evaluate_company import build_evaluators
+from runners.scheduler import CostModel, TraceStore
+from tools.model_pricing import estimate_cost
+from tools.passage_index import PassageIndex, company_index_path, PASSAGE_INDEX_TTL
+from tools.tokenizer import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# A rationale of at most 250 words plus the score line
+DEFAULT_COMPLETION_TOKENS = 350
+# Share of cascade calls assumed to escalate to the main model
+DEFAULT_ESCALATION_RATE = 0.5
+# Share of ensembles whose first wave is assumed to disagree and draw more samples
+DEFAULT_ENSEMBLE_DISAGREEMENT_RATE = 0.5
+
+
+def open_existing_index(company_data: Dict[str, Any]) -> Optional[PassageIndex]:
+    """The company's passage index from an earlier run, without creating one"""
+    path = company_index_path(company_data)
+    return PassageIndex(path) if path.exists() else None
+
+
+def new_totals() -> Dict[str, Any]:
+    return {
+        "jobs": 0,
+        "reused": 0,
+        "search_cached": 0,
+        "search_queries_planned": 0,
+        "search_queries_expected": 0.0,
+        "llm_calls": {},
+        "prompt_tokens": 0.0,
+        "completion_tokens": 0.0,
+        "cost_usd": 0.0,
+        "work_seconds": 0.0
+    }
+
+
+def add_llm_calls(totals: Dict[str, Any], calls: List[tuple]) -> float:
+    """Add (model, prompt tokens, expected calls) to the totals; returns the expected number of calls"""
+    for model, prompt_tokens, weight in calls:
+        completion_tokens = DEFAULT_COMPLETION_TOKENS * weight
+        totals["llm_calls"][model] = totals["llm_calls"].get(model, 0.0) + weight
+        totals["prompt_tokens"] += prompt_tokens * weight
+        totals["completion_tokens"] += completion_tokens
+        totals["cost_usd"] += estimate_cost(model, prompt_tokens * weight, completion_tokens)
+    return sum(weight for _, _, weight in calls)
+
+
+def planned_calls(evaluator: Any, prompt_tokens: int) -> List[tuple]:
+    """The LLM calls one evaluation makes, as (model, prompt tokens, expected calls)"""
+    model = evaluator.llm.model_name
+    if evaluator.ensemble_size > 1:
+        # A first wave of quorum samples, and the rest only when they disagree
+        quorum = min(evaluator.ensemble_quorum or evaluator.ensemble_size // 2 + 1, evaluator.ensemble_size)
+        extra = (evaluator.ensemble_size - quorum) * DEFAULT_ENSEMBLE_DISAGREEMENT_RATE
+        return [(model, prompt_tokens, quorum + extra)]
+    if evaluator.cascade_model:
+        # The cheap model's prompt carries the confidence section on top
+        cheap_tokens = prompt_tokens + count_tokens(evaluator.build_cascade_prompt(""), evaluator.cascade_model)
+        return [(evaluator.cascade_model, cheap_tokens, 1), (model, prompt_tokens, DEFAULT_ESCALATION_RATE)]
+    return [(model, prompt_tokens, 1)]
+
+
+def project_wall_time(job_seconds: List[float], workers: int) -> float:
+    """Makespan of the jobs run longest first on this many workers (their sum when workers is 1)"""
+    if workers <= 1:
+        return sum(job_seconds)
+    loads = [0.0] * workers
+    for seconds in sorted(job_seconds, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + seconds)
+    return max(loads)
+
+
+def estimate_run(
+    company_data_list: List[Dict[str, Any]],
+    evaluator_settings: Optional[Dict[str, Any]] = None,
+    workers: int = 1,
+    batch_size: int = 0,
+    reused_results: Optional[List[Dict[str, Any]]] = None,
+    trace_store: Optional[TraceStore] = None
+) -> Dict[str, Any]:
+    """
+    Estimate what evaluating the companies would cost, without searching or
+    calling the LLM.
+
+    Every prompt is built and counted with the model's tokenizer, then
+    discarded. Work that earlier runs already did is not counted: dimensions
+    reused by --incremental, and searches already stored in a company's
+    passage index (whose evidence is packed from the index so the prompt size
+    is exact). Fresh searches are assumed to fill the evidence token budget.
+    Seconds per query and per prompt token, and the share of planned queries
+    actually spent, come from past job traces (see CostModel).
+
+    Args:
+        company_data_list: Companies that would be fully evaluated
+        evaluator_settings: See build_evaluators
+        workers: Concurrent dimension jobs (see run_scheduled_evaluations)
+        batch_size: Companies per request for batching-enabled dimensions
+        reused_results: Per company, dimension results --incremental would reuse
+        trace_store: Past job traces; defaults to cache/traces.jsonl
+
+    Returns:
+        Estimate with per-dimension and total search queries, LLM calls per
+        model, prompt and completion tokens, cost, work seconds and the
+        projected wall time
+    """
+    evaluators = build_evaluators(**(evaluator_settings or {}))
+    traces = (trace_store or TraceStore()).load()
+    cost_model = CostModel(traces)
+    reused_results = reused_results or [{} for _ in company_data_list]
+    batched_dimensions = {
+        dimension for dimension, evaluator in evaluators.items() if batch_size > 1 and evaluator.supports_batching
+    }
+
+    dimensions = {dimension: new_totals() for dimension in evaluators}
+    job_seconds: List[float] = []
+    batch_pending: Dict[str, List[Dict[str, Any]]] = {dimension: [] for dimension in batched_dimensions}
+
+    for company_data, reused in zip(company_data_list, reused_results):
+        index = open_existing_index(company_data)
+        distinct_queries = set()
+        try:
+            for dimension, evaluator in evaluators.items():
+                totals = dimensions[dimension]
+                if dimension in reused:
+                    totals["reused"] += 1
+                    continue
+                trimmed_data = evaluator.trim_company_data(company_data)
+                if not trimmed_data:
+                    continue
+                if dimension in batched_dimensions:
+                    batch_pending[dimension].append(trimmed_data)
+                    continue
+
+                totals["jobs"] += 1
+                web_results = ""
+                evidence_tokens = 0
+                queries: List[str] = []
+                if evaluator.has_sufficient_structured_data(company_data):
+                    pass
+                elif index is not None and index.get_meta(f"search:{dimension}", max_age=PASSAGE_INDEX_TTL) is not None:
+                    totals["search_cached"] += 1
+                    web_results = evaluator.search_web(company_data, passage_index=index)
+                else:
+                    # A query shared by several dimensions is only sent once per company
+                    queries = [q for q in evaluator.get_search_queries(company_data) if q not in distinct_queries]
+                    distinct_queries.update(queries)
+                    evidence_tokens = evaluator.evidence_token_budget
+                expected_queries = len(queries) * cost_model.spend_ratio(dimension)
+                totals["search_queries_planned"] += len(queries)
+                totals["search_queries_expected"] += expected_queries
+
+                prompt = evaluator.build_prompt(company_data, trimmed_data, web_results)
+                prompt_tokens = count_tokens(prompt, evaluator.llm.model_name) + evidence_tokens
+                samples = add_llm_calls(totals, planned_calls(evaluator, prompt_tokens))
+                seconds = cost_model.seconds(dimension, expected_queries, prompt_tokens, samples)
+                totals["work_seconds"] += seconds
+                job_seconds.append(seconds)
+        finally:
+            if index is not None:
+                index.close()
+
+    for dimension, trimmed_records in batch_pending.items():
+        evaluator = evaluators[dimension]
+        totals = dimensions[dimension]
+        for start in range(0, len(trimmed_records), batch_size):
+            chunk = trimmed_records[start:start + batch_size]
+            prompt_tokens = count_tokens(evaluator.build_batch_prompt(chunk), evaluator.llm.model_name)
+            totals["jobs"] += 1
+            add_llm_calls(totals, [(evaluator.llm.model_name, prompt_tokens, 1)])
+            # One reply covers the whole chunk
+            totals["completion_tokens"] += DEFAULT_COMPLETION_TOKENS * (len(chunk) - 1)
+            seconds = cost_model.seconds(dimension, 0, prompt_tokens)
+            totals["work_seconds"] += seconds
+            job_seconds.append(seconds)
+
+    overall = new_totals()
+    for totals in dimensions.values():
+        for key, value in totals.items():
+            if key == "llm_calls":
+                for model, calls in value.items():
+                    overall["llm_calls"][model] = overall["llm_calls"].get(model, 0.0) + calls
+            else:
+                overall[key] += value
+    overall["wall_seconds"] = project_wall_time(job_seconds, workers)
+
+    for totals in list(dimensions.values()) + [overall]:
+        totals["llm_calls"] = {model: round(calls, 1) for model, calls in totals["llm_calls"].items()}
+        for key in ("search_queries_expected", "prompt_tokens", "completion_tokens", "work_seconds", "wall_seconds"):
+            if key in totals:
+                totals[key] = round(totals[key], 1)
+        totals["cost_usd"] = round(totals["cost_usd"], 4)
+
+    return {
+        "companies": len(company_data_list),
+        "workers": workers,
+        "traces_used": sum(len(entries) for entries in traces.values()),
+        "dimensions": dimensions,
+        "totals": overall,
+        "assumptions": {
+            "completion_tokens_per_call": DEFAULT_COMPLETION_TOKENS,
+            "cascade_escalation_rate": DEFAULT_ESCALATION_RATE,
+            "ensemble_disagreement_rate": DEFAULT_ENSEMBLE_DISAGREEMENT_RATE,
+            "fresh_search_evidence_tokens": "evidence_token_budget"
+        }
+    }
@@ -0,0 +1,170 @@
+from typing import Dict, Any, List, Tuple, Set
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Structured PDL fields read when matching duplicate companies
+ENTITY_FIELDS = [
+    "id",
+    "name",
+    "display_name",
+    "alternative_names",
+    "website",
+    "alternative_domains",
+    "linkedin_url",
+    "linkedin_id",
+    "linkedin_slug",
+    "profiles",
+    "location",
+    "founded"
+]
+
+# Hosts that identify a platform rather than a company
+SHARED_DOMAINS = {
+    "linkedin.com", "facebook.com", "twitter.com", "x.com", "instagram.com", "github.com",
+    "crunchbase.com", "angel.co", "wellfound.com", "linktr.ee", "medium.com", "notion.site", "google.com"
+}
+LEGAL_SUFFIXES = {"inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "gmbh", "plc", "sa", "bv"}
+
+_LINKEDIN_COMPANY = re.compile(r"linkedin\.com/company/([^/?#]+)", re.IGNORECASE)
+
+
+def normalize_domain(url: Any) -> str:
+    """Bare lowercase host of a URL or domain, without scheme, www. or path"""
+    if not url or not isinstance(url, str):
+        return ""
+    host = re.sub(r"^[a-z]+://", "", url.strip().lower())
+    host = re.split(r"[/?#]", host, 1)[0].split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def normalize_company_name(name: Any) -> str:
+    """Lowercase name without punctuation or trailing legal suffixes"""
+    if not name or not isinstance(name, str):
+        return ""
+    words = re.sub(r"[^\w\s]", " ", name.lower()).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def company_locality(company_data: Dict[str, Any]) -> str:
+    """Lowercase city (or full location name) of a PDL record, "" if unknown"""
+    location = company_data.get("location")
+    if isinstance(location, dict):
+        location = location.get("locality") or location.get("name")
+    return location.strip().lower() if isinstance(location, str) else ""
+
+
+def founded_year(company_data: Dict[str, Any]) -> str:
+    """Leading four-digit year of the founded field, "" if there is none"""
+    match = re.match(r"\s*(\d{4})", str(company_data.get("founded") or ""))
+    return match.group(1) if match else ""
+
+
+def entity_keys(company_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    Identifiers a company can be matched on, as (kind, value) pairs.
+
+    A name is not an identifier on its own, since distinct companies share
+    names: it only appears together with the company's city ("name_location")
+    or founding year ("name_founded").
+    """
+    keys = []
+    if company_data.get("id"):
+        keys.append(("pdl_id", str(company_data["id"])))
+
+    for domain in [company_data.get("website")] + list(company_data.get("alternative_domains") or []):
+        domain = normalize_domain(domain)
+        if domain and domain not in SHARED_DOMAINS:
+            keys.append(("domain", domain))
+
+    if company_data.get("linkedin_id"):
+        keys.append(("linkedin_id", str(company_data["linkedin_id"])))
+    if company_data.get("linkedin_slug"):
+        keys.append(("linkedin_slug", str(company_data["linkedin_slug"]).lower()))
+    for profile in [company_data.get("linkedin_url")] + list(company_data.get("profiles") or []):
+        if not profile or not isinstance(profile, str):
+            continue
+        match = _LINKEDIN_COMPANY.search(profile)
+        if match:
+            handle = match.group(1).lower()
+            keys.append(("linkedin_id" if handle.isdigit() else "linkedin_slug", handle))
+        elif normalize_domain(profile) in SHARED_DOMAINS:
+            keys.append(("profile", re.sub(r"^[a-z]+://(www\.)?", "", profile.strip().lower()).rstrip("/")))
+
+    locality = company_locality(company_data)
+    year = founded_year(company_data)
+    for name in [company_data.get("name"), company_data.get("display_name")] + list(company_data.get("alternative_names") or []):
+        name = normalize_company_name(name)
+        if name and locality:
+            keys.append(("name_location", f"{name} @ {locality}"))
+        if name and year:
+            keys.append(("name_founded", f"{name} / {year}"))
+    return list(dict.fromkeys(keys))
+
+
+def resolve_entities(companies: List[Dict[str, Any]]) -> Tuple[List[int], Dict[int, List[Tuple[str, str]]]]:
+    """
+    Group records that describe the same company.
+
+    Records sharing a PDL id, website or alternative domain, LinkedIn id or
+    slug, or profile URL are merged. A shared name or alternative name is not
+    enough on its own: it has to be corroborated by the same city or founding
+    year, and even then records carrying different LinkedIn ids stay apart,
+    since distinct companies do share names. Each group's canonical record is
+    its most complete one (earliest on ties).
+
+    Returns:
+        Tuple of the canonical position of every record (its own position if
+        it is canonical) and, per canonical position with duplicates, the keys
+        the group was matched on
+    """
+    parent = list(range(len(companies)))
+    linkedin_ids: Dict[int, Set[str]] = {
+        i: {value for kind, value in entity_keys(company) if kind == "linkedin_id"}
+        for i, company in enumerate(companies)
+    }
+    matched_on: Dict[int, Set[Tuple[str, str]]] = {}
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owners: Dict[Tuple[str, str], int] = {}
+    for position, company in enumerate(companies):
+        for key in entity_keys(company):
+            if key not in owners:
+                owners[key] = position
+                continue
+            a, b = find(owners[key]), find(position)
+            if a == b:
+                continue
+            if key[0] in ("name_location", "name_founded") and linkedin_ids[a] and linkedin_ids[b] and not linkedin_ids[a] & linkedin_ids[b]:
+                logger.info(f"Not merging '{company.get('name')}' on name alone: LinkedIn ids differ")
+                continue
+            parent[b] = a
+            linkedin_ids[a] |= linkedin_ids.pop(b)
+            matched_on.setdefault(a, set()).update(matched_on.pop(b, set()))
+            matched_on[a].add(key)
+
+    groups: Dict[int, List[int]] = {}
+    for position in range(len(companies)):
+        groups.setdefault(find(position), []).append(position)
+
+    canonical_positions = list(range(len(companies)))
+    group_keys = {}
+    for root, members in groups.items():
+        canonical = max(members, key=lambda i: (sum(1 for value in companies[i].values() if value not in (None, "", [], {})), -i))
+        for member in members:
+            canonical_positions[member] = canonical
+        if len(members) > 1:
+            group_keys[canonical] = sorted(matched_on.get(root, set()))
+            logger.info(
+                f"Resolved {len(members)} records to '{companies[canonical].get('name')}': "
+                f"{', '.join(str(companies[m].get('name')) for m in members)}"
+            )
+    return canonical_positions, group_keys
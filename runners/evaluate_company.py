@@ -7,9 +7,15 @@ from agents.evaluators import (
     InvestorBehaviorEvaluator,
     IncumbentBlindSpotEvaluator
 )
+from tools.evidence_packer import split_snippets
+from tools.passage_index import PassageIndex, company_index_path, SEARCH_SOURCE, PROFILE_SOURCE, PASSAGE_INDEX_TTL
+from tools.search_tool import search_tool
+from tools.metrics import metrics, cache_lookup
+from tools.deadline import Deadline, DeadlineExceeded, call_with_deadline, when_done
 import logging
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from collections.abc import Mapping
 from datetime import datetime
 import json
 import os
@@ -49,15 +55,14 @@ def validate_company_data(company_data: Dict[str, Any]) -> None:
     if "data" in company_data and isinstance(company_data["data"], list) and len(company_data["data"]) > 0:
         company_data = company_data["data"][0]  # Use the first company in the array
     
-    required_fields = ["name", "display_name", "summary"]
-    missing_fields = [field for field in required_fields if field not in company_data]
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in company_data]
     
     if missing_fields:
         raise InputValidationError(
             f"Missing required fields in company data: {', '.join(missing_fields)}"
         )
     
-    if not isinstance(company_data, dict):
+    if not isinstance(company_data, Mapping):
         raise InputValidationError("Company data must be a dictionary")
     
     logger.info(f"Validating company: {company_data.get('name', 'Unknown')}")
@@ -81,12 +86,527 @@ def save_evaluation_log(results: Dict[str, Any], company_name: str) -> None:
     
     logger.info(f"Evaluation log saved to {log_file}")
 
-def run_evaluation(company_data: Dict[str, Any]) -> Dict[str, Any]:
+EVALUATOR_CLASSES = {
+    "Founder Edge": FounderEdgeEvaluator,
+    "Novel Wedge": NovelWedgeEvaluator,
+    "Customer Signal": CustomerSignalEvaluator,
+    "Sales Motion": SalesMotionEvaluator,
+    "Moat Potential": MoatPotentialEvaluator,
+    "Investor Behavior": InvestorBehaviorEvaluator,
+    "Incumbent Blind Spot": IncumbentBlindSpotEvaluator
+}
+
+# Fields read outside the evaluators: validation and result metadata
+REQUIRED_FIELDS = ["name", "display_name", "summary"]
+METADATA_FIELDS = ["name", "display_name", "website", "linkedin_url"]
+
+def get_required_fields(*extra_fields: Any) -> List[str]:
+    """
+    Union of every company field the pipeline reads.
+    
+    Args:
+        *extra_fields: Additional field lists needed by the caller (e.g. the pre-screen)
+        
+    Returns:
+        Sorted list of field names to keep when projecting company records
+    """
+    fields = set(REQUIRED_FIELDS) | set(METADATA_FIELDS)
+    for evaluator_class in EVALUATOR_CLASSES.values():
+        fields.update(evaluator_class.company_fields)
+    for field_list in extra_fields:
+        fields.update(field_list)
+    return sorted(fields)
+
+def build_evaluators(**settings: Any) -> Dict[str, Any]:
+    """
+    Instantiate one evaluator per dimension, keyed by dimension name.
+    
+    Args:
+        **settings: Evaluator attributes to override on every evaluator
+            (e.g. ensemble_size=5), plus optional per-dimension overrides
+            under dimension_settings (see apply_evaluator_settings)
+    """
+    evaluators = {dimension: evaluator_class() for dimension, evaluator_class in EVALUATOR_CLASSES.items()}
+    for evaluator in evaluators.values():
+        apply_evaluator_settings(evaluator, settings)
+    return evaluators
+
+def apply_evaluator_settings(evaluator: Any, settings: Dict[str, Any]) -> None:
+    """
+    Override evaluator attributes, rejecting names the evaluator doesn't have.
+    
+    Settings under "dimension_settings" are keyed by dimension name and only
+    applied to that dimension's evaluator, after the shared ones. The LLM
+    client is rebuilt when llm_model or llm_timeout changes. An ensemble
+    (ensemble_size > 1) and a cascade_model cannot both apply to a dimension.
+    """
+    dimension_settings = (settings.get("dimension_settings") or {}).get(evaluator.dimension_name, {})
+    shared_settings = {name: value for name, value in settings.items() if name != "dimension_settings"}
+    overrides = {**shared_settings, **dimension_settings}
+    for name, value in overrides.items():
+        if not hasattr(evaluator, name):
+            raise ValueError(f"Unknown evaluator setting: {name}")
+        setattr(evaluator, name, value)
+    if "llm_model" in overrides or "llm_timeout" in overrides:
+        evaluator.llm = evaluator.build_llm()
+    if evaluator.ensemble_size > 1 and evaluator.cascade_model:
+        raise ValueError(f"{evaluator.dimension_name}: an ensemble cannot be combined with a cascade model")
+
+def tag_input_hash(result: Dict[str, Any], evaluator: Any, company_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Record the evaluator's input hash on a dimension result so later runs can
+    tell whether it is stale. Failed results (with an "error") get none, so
+    they are never reused.
+    """
+    if "error" in result:
+        return result
+    if "data" in company_data and isinstance(company_data["data"], list) and len(company_data["data"]) > 0:
+        company_data = company_data["data"][0]
+    try:
+        result.setdefault("input_hash", evaluator.input_hash(company_data))
+    except Exception as e:
+        logger.warning(f"Could not hash {evaluator.dimension_name} inputs: {str(e)}")
+    return result
+
+def find_reusable_results(
+    company_data: Dict[str, Any],
+    previous_results: Optional[Dict[str, Any]],
+    evaluators: Optional[Dict[str, Any]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Pick the dimension results of an earlier run whose inputs are unchanged.
+    
+    A dimension is reused when its stored input_hash matches the hash of the
+    current trimmed data, search queries and rubric, and it did not fail. The
+    other dimensions have to be re-evaluated.
+    
+    Args:
+        company_data: Current company information
+        previous_results: Results of the last evaluation of this company
+        evaluators: Evaluators to hash with; built with defaults when omitted
+        
+    Returns:
+        Dimension results to pass to run_evaluation as precomputed_results
+    """
+    if not previous_results:
+        return {}
+    if "data" in company_data and isinstance(company_data["data"], list) and len(company_data["data"]) > 0:
+        company_data = company_data["data"][0]
+    evaluators = evaluators or build_evaluators()
+    
+    reusable = {}
+    for dimension, evaluator in evaluators.items():
+        previous = previous_results.get(dimension)
+        if not isinstance(previous, dict) or "error" in previous or not previous.get("input_hash"):
+            continue
+        if previous["input_hash"] == evaluator.input_hash(company_data):
+            reusable[dimension] = {**previous, "reused": True}
+    for dimension in evaluators:
+        cache_lookup("incremental", dimension in reusable)
+    
+    changed = [dimension for dimension in evaluators if dimension not in reusable]
+    logger.info(
+        f"{company_data.get('name', 'Unknown')}: reusing {len(reusable)} unchanged dimensions, "
+        f"re-evaluating {', '.join(changed) or 'none'}"
+    )
+    return reusable
+
+def run_batched_dimensions(
+    company_data_list: List[Dict[str, Any]],
+    batch_size: int,
+    precomputed_results: Optional[List[Dict[str, Dict[str, Any]]]] = None,
+    evaluator_settings: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Score the batching-enabled dimensions for many companies at once.
+    
+    Companies are packed into groups of batch_size and each opted-in evaluator
+    scores a whole group with one LLM request.
+    
+    Args:
+        company_data_list: Company information for every company in the run
+        batch_size: Maximum number of companies per LLM request
+        precomputed_results: Per company, dimension results that are already
+            known (e.g. reused by find_reusable_results); those are not re-scored
+        evaluator_settings: Evaluator attributes to override, see build_evaluators
+        
+    Returns:
+        One dictionary per company mapping dimension name to its result, in
+        the same order as company_data_list. Pass it to run_evaluation as
+        precomputed_results.
+    """
+    batched_results: List[Dict[str, Dict[str, Any]]] = [{} for _ in company_data_list]
+    batch_size = max(1, batch_size)
+    
+    precomputed_results = precomputed_results or [{} for _ in company_data_list]
+    
+    for dimension, evaluator in build_evaluators(**(evaluator_settings or {})).items():
+        if not evaluator.supports_batching:
+            continue
+        positions = [i for i, known in enumerate(precomputed_results) if dimension not in known]
+        for start in range(0, len(positions), batch_size):
+            chunk_positions = positions[start:start + batch_size]
+            chunk = [company_data_list[i] for i in chunk_positions]
+            logger.info(f"Batch-evaluating {dimension} for {len(chunk)} companies")
+            try:
+                chunk_results = evaluator.evaluate_batch(chunk)
+            except Exception as e:
+                logger.error(f"Error in batched {dimension} evaluation: {str(e)}", exc_info=True)
+                continue
+            for position, result in zip(chunk_positions, chunk_results):
+                tag_input_hash(result, evaluator, company_data_list[position])
+                batched_results[position][dimension] = result
+    
+    return batched_results
+
+def build_passage_index(
+    company_data: Dict[str, Any],
+    evaluators: Dict[str, Any],
+    index_path: Optional[Path] = None,
+    refresh: bool = False,
+    deadline: Optional[Deadline] = None,
+    max_age: Optional[float] = PASSAGE_INDEX_TTL
+) -> Tuple[PassageIndex, Dict[str, Dict[str, Any]]]:
+    """
+    Build (or reopen) the local passage index for a company.
+    
+    Each evaluator's search queries are run under its adaptive search policy,
+    a query shared by several dimensions is only sent once, and the snippets are
+    stored alongside the PDL summary and headline. When the index already holds
+    a dimension's searches from an earlier run, younger than max_age, they are
+    reused, so re-scoring a dimension needs no new searches. A query that is
+    run again replaces the passages it stored before.
+    
+    Args:
+        company_data: Company information (flat or nested under "data")
+        evaluators: Evaluators whose searches should be covered, keyed by dimension
+        index_path: Where to persist the index; defaults to
+            cache/passages/<identity>.sqlite (see company_index_path)
+        refresh: Re-run the searches even if the index already has results
+        deadline: The company's deadline. Each dimension's searches are also
+            bounded by its evaluation_timeout (see dimension_deadline), and
+            the seconds they took are recorded as search_seconds in its stats
+        max_age: Seconds stored searches stay reusable; None never expires them
+        
+    Returns:
+        Tuple of the PassageIndex and the search stats per dimension
+    """
+    if "data" in company_data and isinstance(company_data["data"], list) and len(company_data["data"]) > 0:
+        company_data = company_data["data"][0]
+    
+    index = PassageIndex(index_path or company_index_path(company_data))
+    
+    for field in ["summary", "headline"]:
+        if company_data.get(field):
+            index.add_passages(PROFILE_SOURCE, f"Company {field}", [company_data[field]])
+    
+    fetched: Dict[str, Any] = {}
+    
+    def run_query(query: str) -> Any:
+        if query not in fetched:
+            fetched[query] = search_tool.run(query)
+            index.remove_label(query)
+            index.add_passages(SEARCH_SOURCE, query, split_snippets(fetched[query]))
+        return fetched[query]
+    
+    search_stats = {}
+    for dimension, evaluator in evaluators.items():
+        stored_stats = None if refresh else index.get_meta(f"search:{dimension}", max_age=max_age)
+        cache_lookup("passage_index", stored_stats is not None)
+        if stored_stats is not None:
+            search_stats[dimension] = {
+                **stored_stats,
+                "queries_spent": 0,
+                "queries_skipped": stored_stats["queries_planned"],
+                "search_seconds": 0.0,
+                "reused_index": True
+            }
+            continue
+        
+        stats: Dict[str, Any] = {}
+        search_start = time.time()
+        search_deadline = dimension_deadline(evaluator, deadline)
+        for label, results in evaluator.collect_search_results(
+            company_data, run_query=run_query, stats=stats, deadline=search_deadline
+        ):
+            # Evidence that did not come from a search here (e.g. cached founder profiles)
+            if label not in fetched:
+                index.add_passages(SEARCH_SOURCE, label, split_snippets(results))
+        stats["search_seconds"] = round(time.time() - search_start, 3)
+        # Searches cut short by an open circuit or the deadline are not recorded, so the next run retries them
+        if stats.get("stop_reason") not in ("circuit_open", "deadline"):
+            index.set_meta(f"search:{dimension}", stats)
+        search_stats[dimension] = stats
+    
+    if fetched:
+        logger.info(f"Ran {len(fetched)} distinct search queries, passage index holds {index.count()} passages")
+    else:
+        logger.info(f"Reusing {index.count(SEARCH_SOURCE)} indexed search passages for {company_data.get('name')}")
+    return index, search_stats
+
+def build_metadata(company_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Metadata block stored with every evaluation"""
+    return {
+        "company_name": company_data.get("name") or company_data.get("display_name") or "Unknown Company",
+        "evaluation_date": datetime.now().isoformat(),
+        "evaluation_version": "1.0",
+        "website": company_data.get("website", ""),
+        "linkedin_url": company_data.get("linkedin_url", "")
+    }
+
+def compute_overall(results: Dict[str, Any], total_dimensions: int) -> Dict[str, Any]:
+    """
+    Compute the Overall block from the dimension results.
+    
+    Args:
+        results: Evaluation results keyed by dimension (metadata and Overall are ignored)
+        total_dimensions: Number of dimensions that were meant to be evaluated
+        
+    Returns:
+        Overall block with the average score of the successful evaluations;
+        timed-out dimensions are left out and listed
+    """
+    # Calculate average score only from successful evaluations
+    scores = [
+        result["score"] for dimension, result in results.items()
+        if dimension not in ("metadata", "Overall") and isinstance(result, dict) and "error" not in result
+    ]
+    timed_out = [
+        dimension for dimension, result in results.items()
+        if dimension not in ("metadata", "Overall") and isinstance(result, dict) and result.get("timed_out")
+    ]
+    if scores:
+        return {
+            "score": round(sum(scores) / len(scores), 2),
+            "rationale": f"Average score across {len(scores)} dimensions"
+                         + (f" ({len(timed_out)} timed out)" if timed_out else ""),
+            "successful_evaluations": len(scores),
+            "total_dimensions": total_dimensions,
+            "timed_out_dimensions": timed_out
+        }
+    return {
+        "score": 1,
+        "rationale": "No successful evaluations",
+        "successful_evaluations": 0,
+        "total_dimensions": total_dimensions,
+        "timed_out_dimensions": timed_out
+    }
+
+def build_timeout_result(dimension: str, reason: str) -> Dict[str, Any]:
+    """
+    Result of a dimension abandoned at its deadline. It has no score and
+    carries an error, so it is left out of Overall and never reused.
+    """
+    logger.warning(f"{dimension} evaluation timed out: {reason}")
+    metrics.inc("echo_dimension_timeouts_total", dimension=dimension)
+    return {
+        "score": None,
+        "rationale": f"Timed out: {reason}",
+        "timed_out": True,
+        "error": f"timeout: {reason}"
+    }
+
+def dimension_deadline(evaluator: Any, company_deadline: Optional[Deadline] = None, spent: float = 0.0) -> Deadline:
+    """
+    The earlier of the company's deadline and the dimension's own
+    evaluation_timeout, counted from now less the seconds already spent on
+    the dimension (e.g. its share of the company's search stage)
+    """
+    timeout = evaluator.evaluation_timeout
+    return Deadline.earliest(
+        company_deadline,
+        Deadline(timeout - spent if timeout is not None else None, f"{evaluator.dimension_name} deadline")
+    )
+
+def summarize_timeouts(all_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Count timed-out dimensions across a batch.
+    
+    Returns:
+        Number of timed-out dimension evaluations, of companies with at least
+        one, and the count per dimension
+    """
+    per_dimension: Dict[str, int] = {}
+    companies = 0
+    for results in all_results:
+        if not isinstance(results, dict):
+            continue
+        timed_out = [
+            dimension for dimension, result in results.items()
+            if isinstance(result, dict) and result.get("timed_out")
+        ]
+        companies += 1 if timed_out else 0
+        for dimension in timed_out:
+            per_dimension[dimension] = per_dimension.get(dimension, 0) + 1
+    return {
+        "timed_out": sum(per_dimension.values()),
+        "companies": companies,
+        "dimensions": per_dimension
+    }
+
+def summarize_cascade(all_results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate model-cascade stats per dimension across a batch.
+    
+    Args:
+        all_results: run_evaluation results of every company
+        
+    Returns:
+        Per dimension: calls, escalation rate and reasons, mean latency with and
+        without escalation, and cost against running the main model only
+    """
+    summary: Dict[str, Dict[str, Any]] = {}
+    for results in all_results:
+        if not isinstance(results, dict):
+            continue
+        for dimension, result in results.items():
+            cascade = result.get("cascade") if isinstance(result, dict) else None
+            if not cascade:
+                continue
+            entry = summary.setdefault(dimension, {
+                "calls": 0, "escalated": 0, "escalation_reasons": {},
+                "latencies": [], "escalated_latencies": [], "cost_usd": 0.0, "baseline_cost_usd": 0.0
+            })
+            entry["calls"] += 1
+            entry["cost_usd"] += cascade["cost_usd"]
+            entry["baseline_cost_usd"] += cascade["baseline_cost_usd"]
+            if cascade["escalated"]:
+                entry["escalated"] += 1
+                reason = cascade["escalation_reason"]
+                entry["escalation_reasons"][reason] = entry["escalation_reasons"].get(reason, 0) + 1
+                entry["escalated_latencies"].append(cascade["latency_seconds"])
+            else:
+                entry["latencies"].append(cascade["latency_seconds"])
+    
+    for entry in summary.values():
+        latencies = entry.pop("latencies")
+        escalated_latencies = entry.pop("escalated_latencies")
+        entry["escalation_rate"] = round(entry["escalated"] / entry["calls"], 3)
+        entry["mean_latency_seconds"] = round(sum(latencies) / len(latencies), 3) if latencies else None
+        entry["mean_escalated_latency_seconds"] = (
+            round(sum(escalated_latencies) / len(escalated_latencies), 3) if escalated_latencies else None
+        )
+        entry["savings_usd"] = round(entry["baseline_cost_usd"] - entry["cost_usd"], 6)
+        entry["cost_usd"] = round(entry["cost_usd"], 6)
+        entry["baseline_cost_usd"] = round(entry["baseline_cost_usd"], 6)
+    return summary
+
+def run_dimension_evaluation(
+    company_data: Dict[str, Any],
+    dimension: str,
+    use_passage_index: bool = True,
+    evaluator_settings: Optional[Dict[str, Any]] = None,
+    evaluator: Optional[Any] = None,
+    timings: Optional[Dict[str, float]] = None,
+    deadline: Optional[Deadline] = None,
+    passage_index: Optional[PassageIndex] = None,
+    search_stats: Optional[Dict[str, Dict[str, Any]]] = None,
+    abandoned: Optional[List[Any]] = None
+) -> Dict[str, Any]:
+    """
+    Evaluate a single dimension for a company.
+    
+    Args:
+        company_data: Dictionary containing company information
+        dimension: Name of the dimension to evaluate (a key of EVALUATOR_CLASSES)
+        use_passage_index: See run_evaluation
+        evaluator_settings: See run_evaluation
+        evaluator: Already-built evaluator for the dimension to reuse
+        timings: Filled with the seconds spent searching ("search_seconds")
+            and scoring ("evaluate_seconds")
+        deadline: The company's deadline, if any; the evaluator's own
+            evaluation_timeout applies too, whichever comes first
+        passage_index: The company's passage index, already built (with
+            search_stats) by build_passage_index and shared with its other
+            dimensions. It is left open; the caller closes it
+        search_stats: The search stats build_passage_index returned with it
+        abandoned: Collects the evaluation still running when its deadline
+            passed, so the caller can close a shared index once it finishes
+        
+    Returns:
+        The dimension's result; failures are returned with an "error" key and
+        a dimension past its deadline with "timed_out" (see build_timeout_result)
+    """
+    if dimension not in EVALUATOR_CLASSES:
+        raise ValueError(f"Unknown dimension: {dimension}")
+    
+    validate_company_data(company_data)
+    if evaluator is None:
+        evaluator = EVALUATOR_CLASSES[dimension]()
+        apply_evaluator_settings(evaluator, evaluator_settings or {})
+    timings = timings if timings is not None else {}
+    shared_index = passage_index is not None
+    abandoned = abandoned if abandoned is not None else []
+    
+    try:
+        search_stats = search_stats or {}
+        phase_start = time.time()
+        if shared_index:
+            # The dimension's searches in the company's search stage count against its timeout
+            timings["search_seconds"] = search_stats.get(dimension, {}).get("search_seconds", 0.0)
+            deadline = dimension_deadline(evaluator, deadline, spent=timings["search_seconds"])
+        else:
+            deadline = dimension_deadline(evaluator, deadline)
+            if use_passage_index:
+                passage_index, search_stats = build_passage_index(company_data, {dimension: evaluator}, deadline=deadline)
+            timings["search_seconds"] = time.time() - phase_start
+        phase_start = time.time()
+        result = call_with_deadline(
+            deadline,
+            evaluator.evaluate,
+            company_data,
+            passage_index=passage_index,
+            search_stats=search_stats.get(dimension),
+            deadline=deadline
+        )
+        timings["evaluate_seconds"] = time.time() - phase_start
+        return tag_input_hash(result, evaluator, company_data)
+    except DeadlineExceeded as e:
+        timings["evaluate_seconds"] = time.time() - phase_start
+        if e.future is not None:
+            abandoned.append(e.future)
+        return build_timeout_result(dimension, str(e))
+    except Exception as e:
+        logger.error(f"Error in {dimension} evaluation: {str(e)}", exc_info=True)
+        metrics.inc("echo_dimension_errors_total", dimension=dimension)
+        return {
+            "score": 1,
+            "rationale": f"Error during evaluation: {str(e)}",
+            "error": str(e)
+        }
+    finally:
+        if passage_index is not None and not shared_index:
+            # An evaluation abandoned at its deadline may still be reading the index
+            when_done(abandoned, passage_index.close)
+
+def run_evaluation(
+    company_data: Dict[str, Any],
+    use_passage_index: bool = True,
+    precomputed_results: Optional[Dict[str, Dict[str, Any]]] = None,
+    evaluator_settings: Optional[Dict[str, Any]] = None,
+    evaluators: Optional[Dict[str, Any]] = None,
+    company_timeout: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Run evaluation across all dimensions for a company.
     
     Args:
         company_data: Dictionary containing company information
+        use_passage_index: Search once per company into a local passage index
+            and let each dimension retrieve from it, instead of every
+            dimension running its own searches
+        precomputed_results: Dimension results that were already computed
+            (e.g. by run_batched_dimensions, or unchanged ones picked by
+            find_reusable_results); those evaluators are skipped
+        evaluator_settings: Evaluator attributes to override for this run,
+            see build_evaluators
+        evaluators: Already-built evaluators to reuse (e.g. kept warm by a
+            long-running service); evaluator_settings is ignored when given
+        company_timeout: Wall-clock seconds for the whole company. Searches
+            still pending at the deadline are skipped and dimensions that have
+            not finished are marked timed out; each dimension is also bounded
+            by its evaluator's evaluation_timeout. Overall averages the
+            dimensions that finished.
         
     Returns:
         Dictionary containing scores and rationales for each dimension
@@ -96,42 +616,48 @@ def run_evaluation(company_data: Dict[str, Any]) -> Dict[str, Any]:
         EvaluationError: If evaluation fails
     """
     start_time = time.time()
+    company_deadline = Deadline(company_timeout, "company deadline", start=start_time)
     logger.info(f"Starting evaluation for company: {company_data.get('name', 'Unknown')}")
     
     try:
         # Validate input data
         validate_company_data(company_data)
         
-        evaluators = {
-            "Founder Edge": FounderEdgeEvaluator(),
-            "Novel Wedge": NovelWedgeEvaluator(),
-            "Customer Signal": CustomerSignalEvaluator(),
-            "Sales Motion": SalesMotionEvaluator(),
-            "Moat Potential": MoatPotentialEvaluator(),
-            "Investor Behavior": InvestorBehaviorEvaluator(),
-            "Incumbent Blind Spot": IncumbentBlindSpotEvaluator()
-        }
+        if evaluators is None:
+            evaluators = build_evaluators(**(evaluator_settings or {}))
         
-        results = {
-            "metadata": {
-                "company_name": company_data.get("name") or company_data.get("display_name") or "Unknown Company",
-                "evaluation_date": datetime.now().isoformat(),
-                "evaluation_version": "1.0",
-                "website": company_data.get("website", ""),
-                "linkedin_url": company_data.get("linkedin_url", "")
-            }
-        }
-        total_score = 0
-        successful_evaluations = 0
+        results = {"metadata": build_metadata(company_data)}
+        
+        precomputed_results = precomputed_results or {}
+        pending = {dimension: evaluator for dimension, evaluator in evaluators.items() if dimension not in precomputed_results}
+        
+        passage_index = None
+        search_stats = {}
+        abandoned = []
+        if use_passage_index and pending:
+            passage_index, search_stats = build_passage_index(company_data, pending, deadline=company_deadline)
         
         for dimension, evaluator in evaluators.items():
             dimension_start_time = time.time()
             try:
-                logger.info(f"Starting {dimension} evaluation...")
-                result = evaluator.evaluate(company_data)
+                if dimension in precomputed_results:
+                    logger.info(f"Using precomputed {dimension} result")
+                    result = precomputed_results[dimension]
+                else:
+                    logger.info(f"Starting {dimension} evaluation...")
+                    # The dimension's searches in the company's search stage count against its timeout
+                    deadline = dimension_deadline(
+                        evaluator, company_deadline, spent=search_stats.get(dimension, {}).get("search_seconds", 0.0)
+                    )
+                    result = tag_input_hash(call_with_deadline(
+                        deadline,
+                        evaluator.evaluate,
+                        company_data,
+                        passage_index=passage_index,
+                        search_stats=search_stats.get(dimension),
+                        deadline=deadline
+                    ), evaluator, company_data)
                 results[dimension] = result
-                total_score += result["score"]
-                successful_evaluations += 1
                 
                 dimension_time = time.time() - dimension_start_time
                 logger.info(
@@ -139,29 +665,27 @@ def run_evaluation(company_data: Dict[str, Any]) -> Dict[str, Any]:
                     f"Score: {result['score']}"
                 )
                 
+            except DeadlineExceeded as e:
+                if e.future is not None:
+                    abandoned.append(e.future)
+                results[dimension] = build_timeout_result(dimension, str(e))
             except Exception as e:
                 logger.error(f"Error in {dimension} evaluation: {str(e)}", exc_info=True)
+                metrics.inc("echo_dimension_errors_total", dimension=dimension)
                 results[dimension] = {
                     "score": 1,
                     "rationale": f"Error during evaluation: {str(e)}",
                     "error": str(e)
                 }
         
-        # Calculate average score only from successful evaluations
-        if successful_evaluations > 0:
-            results["Overall"] = {
-                "score": round(total_score / successful_evaluations, 2),
-                "rationale": f"Average score across {successful_evaluations} dimensions",
-                "successful_evaluations": successful_evaluations,
-                "total_dimensions": len(evaluators)
-            }
-        else:
-            results["Overall"] = {
-                "score": 1,
-                "rationale": "No successful evaluations",
-                "successful_evaluations": 0,
-                "total_dimensions": len(evaluators)
-            }
+        results["Overall"] = compute_overall(results, len(evaluators))
+        results["metadata"]["reused_dimensions"] = [
+            dimension for dimension, result in precomputed_results.items() if result.get("reused")
+        ]
+        
+        if passage_index is not None:
+            # Evaluations abandoned at their deadline may still be reading the index
+            when_done(abandoned, passage_index.close)
         
         # Add timing information
         total_time = time.time() - start_time
@@ -0,0 +1,149 @@
+from typing import Dict, Any, List, Optional
+from datetime import date, datetime
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Structured PDL fields read by the pre-screen
+PRESCREEN_FIELDS = [
+    "name",
+    "founded",
+    "last_funding_date",
+    "number_funding_rounds",
+    "total_funding_raised",
+    "employee_growth_rate",
+    "employee_churn_rate"
+]
+
+# (maximum months since last round, points)
+FUNDING_RECENCY_POINTS = [(12, 25), (24, 15), (36, 5)]
+# (minimum number of rounds, points)
+FUNDING_ROUNDS_POINTS = [(3, 20), (2, 15), (1, 8)]
+# (minimum total raised in USD, points)
+TOTAL_FUNDING_POINTS = [(20_000_000, 15), (5_000_000, 12), (1_000_000, 8), (1, 4)]
+# (minimum 12 month headcount growth rate, points)
+HEADCOUNT_GROWTH_POINTS = [(0.5, 25), (0.2, 15), (0.0, 8)]
+# (maximum company age in years, points)
+COMPANY_AGE_POINTS = [(8, 15), (15, 5)]
+# 12 month churn above this costs HIGH_CHURN_PENALTY points
+HIGH_CHURN_RATE = 0.3
+HIGH_CHURN_PENALTY = 10
+
+
+def _months_between(start: date, end: date) -> int:
+    return (end.year - start.year) * 12 + (end.month - start.month)
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%d", "%Y-%m", "%Y"):
+        try:
+            return datetime.strptime(str(value), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _rate(rates: Any, period: str = "12_month") -> Optional[float]:
+    if isinstance(rates, dict) and rates.get(period) is not None:
+        try:
+            return float(rates[period])
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _year(value: Any) -> Optional[int]:
+    """The leading four-digit year of e.g. 2015, "2015" or "2015-03-01"; None if there is none"""
+    match = re.match(r"\s*(\d{4})", str(value)) if value else None
+    return int(match.group(1)) if match else None
+
+
+def prescreen_score(company_data: Dict[str, Any], reference_date: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Score a company from its structured fields with fixed rules, no LLM or search.
+
+    Args:
+        company_data: Flat PDL company record
+        reference_date: Date funding recency and company age are measured from (default: today)
+
+    Returns:
+        Dictionary with the total "score" (0-100) and the points per "signals"
+    """
+    reference_date = reference_date or date.today()
+    signals = {}
+
+    last_funding = _parse_date(company_data.get("last_funding_date"))
+    signals["funding_recency"] = 0
+    if last_funding:
+        months = _months_between(last_funding, reference_date)
+        signals["funding_recency"] = next((points for limit, points in FUNDING_RECENCY_POINTS if months <= limit), 0)
+
+    rounds = _number(company_data.get("number_funding_rounds")) or 0
+    signals["funding_rounds"] = next((points for minimum, points in FUNDING_ROUNDS_POINTS if rounds >= minimum), 0)
+
+    raised = _number(company_data.get("total_funding_raised")) or 0
+    signals["total_funding"] = next((points for minimum, points in TOTAL_FUNDING_POINTS if raised >= minimum), 0)
+
+    growth = _rate(company_data.get("employee_growth_rate"))
+    signals["headcount_growth"] = 0
+    if growth is not None:
+        signals["headcount_growth"] = next((points for minimum, points in HEADCOUNT_GROWTH_POINTS if growth >= minimum), 0)
+
+    founded = _year(company_data.get("founded"))
+    signals["company_age"] = 0
+    if founded:
+        age = reference_date.year - founded
+        signals["company_age"] = next((points for limit, points in COMPANY_AGE_POINTS if age <= limit), 0)
+
+    churn = _rate(company_data.get("employee_churn_rate"))
+    signals["churn_penalty"] = -HIGH_CHURN_PENALTY if churn is not None and churn > HIGH_CHURN_RATE else 0
+
+    return {
+        "score": max(0, sum(signals.values())),
+        "signals": signals
+    }
+
+
+def prescreen_companies(
+    company_data_list: List[Dict[str, Any]],
+    top_fraction: Optional[float] = None,
+    threshold: Optional[float] = None,
+    reference_date: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    """
+    Rank a whole batch with the rule-based pre-screen and pick who goes on to full evaluation.
+
+    Args:
+        company_data_list: Flat PDL company records
+        top_fraction: Keep only this fraction of the batch (best scores first)
+        threshold: Keep only companies scoring at least this much
+        reference_date: Passed through to prescreen_score
+
+    Returns:
+        One dictionary per company, in input order, with "score", "signals",
+        "rank" (1 = best) and "selected"
+    """
+    results = [prescreen_score(company, reference_date) for company in company_data_list]
+    order = sorted(range(len(results)), key=lambda i: -results[i]["score"])
+    for rank, index in enumerate(order, start=1):
+        results[index]["rank"] = rank
+
+    keep = len(results)
+    if top_fraction is not None:
+        keep = max(1, round(len(results) * top_fraction)) if results else 0
+    for result in results:
+        result["selected"] = result["rank"] <= keep and (threshold is None or result["score"] >= threshold)
+
+    selected = sum(result["selected"] for result in results)
+    logger.info(f"Pre-screen selected {selected} of {len(results)} companies for full evaluation")
+    return results
@@ -0,0 +1,290 @@
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import json
+import logging
+
+from runners.evaluate_company import (
+    build_evaluators,
+    build_passage_index,
+    compute_overall,
+    validate_company_data,
+    EVALUATOR_CLASSES
+)
+from runners.prompt_profiler import REPORT_DIR
+
+logger = logging.getLogger(__name__)
+
+BASELINE_VARIANT = "baseline"
+
+
+def load_variants(path: str) -> List[Dict[str, Any]]:
+    """
+    Read prompt variants from a JSON file: a list (or {"variants": [...]}) of
+    objects with a "name" and any of
+        "instructions": text appended to every prompt (prompt_instructions)
+        "rubrics": {dimension: rubric text} replacing dimension rubrics
+        "settings": other evaluator attributes, see build_evaluators
+    A "baseline" variant with the current prompts is added first unless the
+    file defines one.
+    """
+    with open(path, "r") as f:
+        loaded = json.load(f)
+    variants = loaded.get("variants", []) if isinstance(loaded, dict) else loaded
+
+    names = [variant.get("name") for variant in variants]
+    if not all(names) or len(set(names)) != len(names):
+        raise ValueError("Every prompt variant needs a unique name")
+    for variant in variants:
+        unknown = [d for d in variant.get("rubrics", {}) if d not in EVALUATOR_CLASSES]
+        if unknown:
+            raise ValueError(f"Variant '{variant['name']}' has rubrics for unknown dimensions: {', '.join(unknown)}")
+    if BASELINE_VARIANT not in names:
+        variants = [{"name": BASELINE_VARIANT}] + variants
+    return variants
+
+
+def variant_settings(variant: Dict[str, Any], base_settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Evaluator settings for a variant, layered over the run's settings"""
+    settings = {**(base_settings or {}), **variant.get("settings", {})}
+    if variant.get("instructions"):
+        settings["prompt_instructions"] = variant["instructions"]
+    if variant.get("rubrics"):
+        dimension_settings = {
+            dimension: dict(overrides) for dimension, overrides in (settings.get("dimension_settings") or {}).items()
+        }
+        for dimension, rubric in variant["rubrics"].items():
+            dimension_settings.setdefault(dimension, {})["rubric"] = rubric
+        settings["dimension_settings"] = dimension_settings
+    return settings
+
+
+def gather_company_evidence(company_data: Dict[str, Any], evaluators: Dict[str, Any]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Search once into the company's passage index and gather every dimension's
+    evidence (see BaseEvaluator.gather_evidence). Retrieval always uses the
+    run's evaluators, so variants cannot change what evidence they are given.
+    """
+    passage_index, search_stats = build_passage_index(company_data, evaluators)
+    try:
+        return {
+            dimension: evaluator.gather_evidence(
+                company_data, passage_index=passage_index, search_stats=search_stats.get(dimension)
+            )
+            for dimension, evaluator in evaluators.items()
+        }
+    finally:
+        passage_index.close()
+
+
+def experiment_key(position: int, company_data: Dict[str, Any]) -> str:
+    """Label of a company in experiment results: its name and input position, so same-named companies stay apart"""
+    return f"{company_data.get('name', 'Unknown Company')} [#{position}]"
+
+
+def score_variant(evaluator: Any, evidence: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Score one dimension's evidence; a failed call is left unscored and carries an error"""
+    if evidence is None:
+        return {
+            "score": 1,
+            "rationale": f"Insufficient company information to evaluate {evaluator.dimension_name}"
+        }
+    try:
+        return evaluator.score_evidence(evidence)
+    except Exception as e:
+        logger.error(f"Error scoring {evaluator.dimension_name}: {str(e)}", exc_info=True)
+        return {"score": None, "rationale": f"Error during evaluation: {str(e)}", "error": str(e)}
+
+
+def run_prompt_experiment(
+    company_data_list: List[Dict[str, Any]],
+    variants: List[Dict[str, Any]],
+    dimensions: Optional[List[str]] = None,
+    evaluator_settings: Optional[Dict[str, Any]] = None,
+    workers: int = 4
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Score companies under several prompt/rubric variants.
+
+    Search evidence and trimmed data are gathered once per company; only the
+    LLM stage is repeated, with every (variant, dimension) call of a company
+    submitted to a shared pool while the next company's evidence is gathered.
+
+    Args:
+        company_data_list: Companies to evaluate
+        variants: Variants as returned by load_variants
+        dimensions: Dimensions to score (default: all)
+        evaluator_settings: Settings shared by every variant, see build_evaluators
+        workers: Concurrent LLM calls
+
+    Returns:
+        Results keyed by company (see experiment_key), then variant name,
+        each in the run_evaluation layout (dimension results plus Overall)
+    """
+    dimensions = dimensions or list(EVALUATOR_CLASSES)
+    retrieval_evaluators = {
+        dimension: evaluator for dimension, evaluator in build_evaluators(**(evaluator_settings or {})).items()
+        if dimension in dimensions
+    }
+    variant_evaluators = {
+        variant["name"]: build_evaluators(**variant_settings(variant, evaluator_settings))
+        for variant in variants
+    }
+
+    futures: Dict[Tuple[str, str, str], Any] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for position, company_data in enumerate(company_data_list):
+            company_name = company_data.get("name", "Unknown Company")
+            company_key = experiment_key(position, company_data)
+            try:
+                validate_company_data(company_data)
+                evidence = gather_company_evidence(company_data, retrieval_evaluators)
+            except Exception as e:
+                logger.error(f"Could not gather evidence for {company_name}: {str(e)}")
+                continue
+            logger.info(f"Gathered evidence for {company_name}, scoring {len(variants)} variants")
+            for variant_name, evaluators in variant_evaluators.items():
+                for dimension in dimensions:
+                    futures[(company_key, variant_name, dimension)] = executor.submit(
+                        score_variant, evaluators[dimension], evidence[dimension]
+                    )
+
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for (company_key, variant_name, dimension), future in futures.items():
+        results.setdefault(company_key, {}).setdefault(variant_name, {})[dimension] = future.result()
+    for variant_results in results.values():
+        for variant_name, dimension_results in variant_results.items():
+            dimension_results["Overall"] = compute_overall(dimension_results, len(dimensions))
+    return results
+
+
+def comparable(result: Dict[str, Any]) -> bool:
+    """Whether a dimension (or Overall) result has a score worth comparing across variants"""
+    if not isinstance(result.get("score"), (int, float)) or "error" in result:
+        return False
+    # Overall averages over whichever dimensions succeeded
+    return result.get("successful_evaluations", 0) >= result.get("total_dimensions", 0)
+
+
+def build_shift_report(results: Dict[str, Dict[str, Dict[str, Any]]], baseline: str = BASELINE_VARIANT) -> Dict[str, Any]:
+    """
+    Score shifts of every variant against the baseline.
+
+    A dimension is only compared when neither side carries an "error", and
+    Overall only when every dimension on both sides succeeded, so failed
+    calls do not show up as score shifts.
+
+    Returns:
+        Report with, per variant and dimension (and Overall), the mean shift,
+        mean absolute shift and number of companies whose score changed, plus
+        a side-by-side score table per company
+    """
+    variants: List[str] = []
+    for variant_results in results.values():
+        variants += [name for name in variant_results if name not in variants]
+    dimensions: List[str] = []
+    for variant_results in results.values():
+        for dimension_results in variant_results.values():
+            dimensions += [d for d in dimension_results if d not in dimensions]
+
+    shifts: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    companies = {}
+    for company_key, variant_results in results.items():
+        companies[company_key] = {
+            dimension: {name: variant_results.get(name, {}).get(dimension, {}).get("score") for name in variants}
+            for dimension in dimensions
+        }
+        baseline_results = variant_results.get(baseline, {})
+        for name in variants:
+            if name == baseline:
+                continue
+            for dimension in dimensions:
+                before_result = baseline_results.get(dimension, {})
+                after_result = variant_results.get(name, {}).get(dimension, {})
+                if not comparable(before_result) or not comparable(after_result):
+                    continue
+                before, after = before_result["score"], after_result["score"]
+                entry = shifts.setdefault(name, {}).setdefault(dimension, {"deltas": []})
+                entry["deltas"].append(after - before)
+
+    for dimension_shifts in shifts.values():
+        for entry in dimension_shifts.values():
+            deltas = entry.pop("deltas")
+            entry.update({
+                "companies": len(deltas),
+                "mean_shift": round(sum(deltas) / len(deltas), 3),
+                "mean_abs_shift": round(sum(abs(delta) for delta in deltas) / len(deltas), 3),
+                "changed": sum(1 for delta in deltas if delta)
+            })
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "baseline": baseline,
+        "variants": variants,
+        "dimensions": dimensions,
+        "shifts": shifts,
+        "companies": companies
+    }
+
+
+def render_markdown(report: Dict[str, Any]) -> str:
+    """Human-readable, side-by-side version of a shift report"""
+    baseline = report["baseline"]
+    others = [name for name in report["variants"] if name != baseline]
+    lines = [
+        "# Prompt experiment",
+        "",
+        f"Generated {report['generated_at']} over {len(report['companies'])} companies, against `{baseline}`.",
+        "",
+        "## Score shifts",
+        "",
+        "| Variant | Dimension | Mean shift | Mean abs shift | Changed |",
+        "|---|---|---|---|---|"
+    ]
+    for name in others:
+        for dimension, entry in report["shifts"].get(name, {}).items():
+            lines.append(
+                f"| {name} | {dimension} | {entry['mean_shift']:+} | {entry['mean_abs_shift']} | "
+                f"{entry['changed']}/{entry['companies']} |"
+            )
+    lines.append("")
+
+    for company_name, scores in report["companies"].items():
+        lines += [
+            f"## {company_name}",
+            "",
+            "| Dimension | " + " | ".join(report["variants"]) + " |",
+            "|---|" + "---|" * len(report["variants"])
+        ]
+        for dimension, by_variant in scores.items():
+            before = by_variant.get(baseline)
+            cells = []
+            for name in report["variants"]:
+                score = by_variant.get(name)
+                delta = ""
+                if name != baseline and isinstance(score, (int, float)) and isinstance(before, (int, float)) and score != before:
+                    delta = f" ({score - before:+g})"
+                cells.append(f"{'' if score is None else score}{delta}")
+            lines.append(f"| {dimension} | " + " | ".join(cells) + " |")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_experiment_report(
+    report: Dict[str, Any],
+    results: Dict[str, Dict[str, Dict[str, Any]]],
+    report_dir: Path = REPORT_DIR
+) -> Tuple[Path, Path]:
+    """Write the shift report (with every variant's full results) as JSON, and as Markdown"""
+    report_dir = Path(report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"prompt_experiment_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    json_path = report_dir / f"{stem}.json"
+    markdown_path = report_dir / f"{stem}.md"
+    with open(json_path, "w") as f:
+        json.dump({**report, "results": results}, f, indent=2)
+    with open(markdown_path, "w") as f:
+        f.write(render_markdown(report))
+    logger.info(f"Prompt experiment written to {json_path} and {markdown_path}")
+    return json_path, markdown_path
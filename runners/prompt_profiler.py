@@ -0,0 +1,176 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+import hashlib
+import json
+import logging
+
+from runners.evaluate_company import build_evaluators
+from runners.scheduler import percentile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SECTIONS = ["preamble", "calibration", "company_data", "web_results", "rubric"]
+REPORT_DIR = Path("reports")
+HISTOGRAM_BINS = 10
+# A prompt is an outlier when its total exceeds Q3 + OUTLIER_IQR_FACTOR * IQR of its
+# dimension, and is at least OUTLIER_MIN_RATIO times the dimension's median
+OUTLIER_IQR_FACTOR = 1.5
+OUTLIER_MIN_RATIO = 1.5
+
+
+def prompt_revision(evaluators: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Short hash of every dimension's prompt template, calibration examples and
+    rubric, rendered with placeholder data, so reports can be compared across
+    prompt revisions.
+    """
+    evaluators = evaluators or build_evaluators()
+    digest = hashlib.sha1()
+    for dimension in sorted(evaluators):
+        placeholder = {"name": "<company>"}
+        digest.update(evaluators[dimension].build_prompt(placeholder, {}, "").encode("utf-8"))
+    return digest.hexdigest()[:10]
+
+
+def histogram(values: List[int], bins: int = HISTOGRAM_BINS) -> List[Dict[str, int]]:
+    """Equal-width token-count histogram from 0 to the largest value"""
+    if not values:
+        return []
+    width = max(1, -(-max(values) // bins))
+    counts = [0] * bins
+    for value in values:
+        counts[min(bins - 1, value // width)] += 1
+    return [
+        {"from": index * width, "to": (index + 1) * width, "count": count}
+        for index, count in enumerate(counts)
+    ]
+
+
+def summarize(values: List[int]) -> Dict[str, Any]:
+    return {
+        "mean": round(sum(values) / len(values), 1) if values else 0,
+        "p50": percentile(values, 0.5),
+        "p95": percentile(values, 0.95),
+        "max": max(values) if values else 0
+    }
+
+
+def collect_profiles(all_results: List[Dict[str, Any]]) -> Dict[str, List[Tuple[str, Dict[str, int]]]]:
+    """Per dimension, the (company, section token counts) of every profiled prompt"""
+    profiles: Dict[str, List[Tuple[str, Dict[str, int]]]] = {}
+    for results in all_results:
+        if not isinstance(results, dict):
+            continue
+        company = results.get("metadata", {}).get("company_name", "Unknown Company")
+        for dimension, result in results.items():
+            if isinstance(result, dict) and result.get("prompt_profile"):
+                profiles.setdefault(dimension, []).append((company, result["prompt_profile"]))
+    return profiles
+
+
+def build_profile_report(all_results: List[Dict[str, Any]], evaluators: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Aggregate per-section prompt token counts across a batch.
+
+    Args:
+        all_results: run_evaluation results of every company, evaluated with
+            profile_prompts enabled
+        evaluators: Evaluators used for the prompt revision hash
+
+    Returns:
+        Report with, per dimension, per-section stats and histograms, each
+        section's share of the prompt, and the outlier companies with the
+        section that grew the most
+    """
+    dimensions = {}
+    for dimension, entries in collect_profiles(all_results).items():
+        totals = [sum(profile.values()) for _, profile in entries]
+        sections = {}
+        for section in PROFILE_SECTIONS:
+            values = [profile.get(section, 0) for _, profile in entries]
+            sections[section] = {
+                **summarize(values),
+                "share": round(sum(values) / sum(totals), 3) if sum(totals) else 0.0,
+                "histogram": histogram(values)
+            }
+
+        q1, q3 = percentile(totals, 0.25), percentile(totals, 0.75)
+        threshold = max(q3 + OUTLIER_IQR_FACTOR * (q3 - q1), OUTLIER_MIN_RATIO * percentile(totals, 0.5))
+        outliers = []
+        for (company, profile), total in zip(entries, totals):
+            if total <= threshold or len(entries) < 4:
+                continue
+            # The section furthest above its typical size explains the blow-up
+            dominant = max(PROFILE_SECTIONS, key=lambda name: profile.get(name, 0) - sections[name]["p50"])
+            outliers.append({
+                "company": company,
+                "total_tokens": total,
+                "dimension_p50": percentile(totals, 0.5),
+                "dominant_section": dominant,
+                "sections": profile
+            })
+
+        dimensions[dimension] = {
+            "prompts": len(entries),
+            "total": {**summarize(totals), "histogram": histogram(totals)},
+            "sections": sections,
+            "outlier_threshold": round(threshold, 1),
+            "outliers": sorted(outliers, key=lambda outlier: outlier["total_tokens"], reverse=True)
+        }
+
+    return {
+        "prompt_revision": prompt_revision(evaluators),
+        "generated_at": datetime.now().isoformat(),
+        "companies": sum(1 for results in all_results if isinstance(results, dict) and "metadata" in results),
+        "dimensions": dimensions
+    }
+
+
+def render_markdown(report: Dict[str, Any]) -> str:
+    """Human-readable version of a profile report"""
+    lines = [
+        f"# Prompt token profile ({report['prompt_revision']})",
+        "",
+        f"Generated {report['generated_at']} over {report['companies']} companies.",
+        ""
+    ]
+    for dimension, entry in report["dimensions"].items():
+        total = entry["total"]
+        lines += [
+            f"## {dimension}",
+            "",
+            f"{entry['prompts']} prompts, total tokens mean {total['mean']} / p50 {total['p50']} / "
+            f"p95 {total['p95']} / max {total['max']}",
+            "",
+            "| Section | Mean | p50 | p95 | Max | Share |",
+            "|---|---|---|---|---|---|"
+        ]
+        for section, stats in entry["sections"].items():
+            lines.append(
+                f"| {section} | {stats['mean']} | {stats['p50']} | {stats['p95']} | {stats['max']} | {stats['share']:.1%} |"
+            )
+        lines.append("")
+        for outlier in entry["outliers"]:
+            lines.append(
+                f"- Outlier: **{outlier['company']}** at {outlier['total_tokens']} tokens "
+                f"(p50 {outlier['dimension_p50']}), driven by {outlier['dominant_section']}"
+            )
+        if entry["outliers"]:
+            lines.append("")
+    return "\n".join(lines)
+
+
+def write_profile_report(report: Dict[str, Any], report_dir: Path = REPORT_DIR) -> Tuple[Path, Path]:
+    """Write the report as JSON and Markdown, named by date and prompt revision"""
+    report_dir = Path(report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"prompt_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{report['prompt_revision']}"
+    json_path = report_dir / f"{stem}.json"
+    markdown_path = report_dir / f"{stem}.md"
+    with open(json_path, "w") as f:
+        json.dump(report, f, indent=2)
+    with open(markdown_path, "w") as f:
+        f.write(render_markdown(report))
+    logger.info(f"Prompt profile written to {json_path} and {markdown_path}")
+    return json_path, markdown_path
@@ -0,0 +1,193 @@
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from runners.evaluate_company import run_evaluation, build_evaluators, InputValidationError
+from tools.metrics import metrics, cache_lookup
+
+logger = logging.getLogger(__name__)
+
+
+def company_input_hash(company_data: Dict[str, Any]) -> str:
+    """Stable hash of a company payload, independent of key order"""
+    canonical = json.dumps(company_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class EvaluationService:
+    """
+    Keeps evaluators and their clients warm across requests.
+
+    Concurrent requests for the same company and input hash are coalesced into
+    a single in-flight evaluation, and recent results are served from an
+    in-memory cache.
+    """
+
+    def __init__(
+        self,
+        cache_ttl: float = 3600.0,
+        cache_size: int = 256,
+        evaluator_settings: Optional[Dict[str, Any]] = None
+    ):
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.evaluators = build_evaluators(**(evaluator_settings or {}))
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats = {"requests": 0, "evaluations": 0, "cache_hits": 0, "coalesced": 0, "errors": 0}
+
+    def _key(self, company_data: Dict[str, Any]) -> Tuple[str, str]:
+        name = (company_data.get("name") or "").strip().lower()
+        return name, company_input_hash(company_data)
+
+    def _cached(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, results = entry
+        if time.time() - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return results
+
+    def evaluate(self, company_data: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """
+        Evaluate a company, reusing a cached or in-flight evaluation when possible.
+
+        Returns:
+            Tuple of the results and how they were obtained: "evaluated", "cached" or "coalesced"
+        """
+        key = self._key(company_data)
+        with self._lock:
+            self.stats["requests"] += 1
+            cached = self._cached(key)
+            cache_lookup("service", cached is not None)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached, "cached"
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            logger.info(f"Joining in-flight evaluation for {key[0]}")
+            return future.result(), "coalesced"
+
+        try:
+            results = run_evaluation(company_data, evaluators=self.evaluators)
+            with self._lock:
+                self.stats["evaluations"] += 1
+                self._cache[key] = (time.time(), results)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            future.set_result(results)
+            return results, "evaluated"
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "in_flight": len(self._in_flight), "cached": len(self._cache)}
+
+
+def make_handler(service: EvaluationService) -> type:
+    """Build the HTTP request handler bound to a service instance"""
+
+    class EvaluationRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif self.path == "/stats":
+                self._send_json(200, service.status())
+            elif self.path == "/metrics":
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+        def do_POST(self) -> None:
+            if self.path != "/evaluate":
+                self._send_json(404, {"error": f"Unknown path: {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                company_data = json.loads(self.rfile.read(length) or b"{}")
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send_json(400, {"error": f"Invalid JSON body: {str(e)}"})
+                return
+            # Accept the same {"data": {...}} wrapper the batch input uses
+            if isinstance(company_data, dict) and isinstance(company_data.get("data"), dict):
+                company_data = company_data["data"]
+            if not isinstance(company_data, dict):
+                self._send_json(400, {"error": "Body must be a company JSON object"})
+                return
+
+            try:
+                results, source = service.evaluate(company_data)
+                self._send_json(200, {"source": source, "results": results})
+            except InputValidationError as e:
+                self._send_json(422, {"error": str(e)})
+            except Exception as e:
+                logger.error(f"Evaluation request failed: {str(e)}", exc_info=True)
+                self._send_json(500, {"error": str(e)})
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.info(f"{self.address_string()} - {format % args}")
+
+    return EvaluationRequestHandler
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    cache_ttl: float = 3600.0,
+    evaluator_settings: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Run the evaluation service until interrupted.
+
+    Endpoints:
+        POST /evaluate  company JSON (flat or {"data": {...}}) -> {"source": ..., "results": ...}
+        GET  /stats     request, cache and coalescing counters
+        GET  /health    liveness check
+    """
+    service = EvaluationService(cache_ttl=cache_ttl, evaluator_settings=evaluator_settings)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    logger.info(f"Evaluation service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down evaluation service")
+    finally:
+        server.server_close()
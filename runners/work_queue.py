@@ -0,0 +1,349 @@
+from typing import Dict, Any, List, Optional, Iterator
+from pathlib import Path
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from runners.evaluate_company import (
+    run_evaluation,
+    run_dimension_evaluation,
+    build_metadata,
+    compute_overall,
+    EVALUATOR_CLASSES
+)
+from tools.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# Dimension value used for whole-company tasks
+COMPANY_TASK = ""
+
+# Expired leases go back to pending, or to failed once the task has been
+# claimed max_attempts times, so a record that keeps killing its worker is
+# dead-lettered instead of cycling through the fleet forever
+_EXPIRE_LEASES_SQL = (
+    "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+    "worker = NULL, lease_expires = NULL, "
+    "error = CASE WHEN attempts >= ? THEN 'lease expired after ' || attempts || ' attempts' ELSE error END, "
+    "updated = ? WHERE status = ? AND lease_expires < ?"
+)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Shared task queue backed by a single SQLite file.
+
+    A coordinator enqueues companies (or company-by-dimension tasks). Workers on
+    any machine that can reach the file claim tasks with a time-limited lease
+    and keep it alive with heartbeats; tasks whose lease expires, because their
+    worker crashed, go back to pending, and are marked failed once they have
+    been claimed max_attempts times. A task can only be completed by the
+    worker currently holding its lease, so nothing is evaluated twice into the
+    results. Results are stored on the task rows, which makes the queue file
+    the shared result sink for the whole fleet.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 600.0, max_attempts: int = 3):
+        self.path = str(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "company_key TEXT NOT NULL, "
+            "dimension TEXT NOT NULL DEFAULT '', "
+            "payload TEXT NOT NULL, "
+            "status TEXT NOT NULL, "
+            "worker TEXT, "
+            "lease_expires REAL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "result TEXT, "
+            "error TEXT, "
+            "updated REAL, "
+            "UNIQUE (company_key, dimension))"
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def enqueue(self, company_key: str, company_data: Dict[str, Any], dimension: str = COMPANY_TASK) -> bool:
+        """Add a task unless one already exists for this company and dimension. Returns True if added."""
+        cursor = self._execute(
+            "INSERT OR IGNORE INTO tasks (company_key, dimension, payload, status, updated) VALUES (?, ?, ?, ?, ?)",
+            (company_key, dimension, json.dumps(dict(company_data)), PENDING, time.time())
+        )
+        return cursor.rowcount > 0
+
+    def _expire_leases_params(self, now: float) -> tuple:
+        return (self.max_attempts, FAILED, PENDING, self.max_attempts, now, LEASED, now)
+
+    def requeue_expired(self) -> int:
+        """
+        Return tasks whose lease has run out to pending, or mark them failed
+        after max_attempts. Returns the number of expired leases released.
+        """
+        cursor = self._execute(_EXPIRE_LEASES_SQL, self._expire_leases_params(time.time()))
+        if cursor.rowcount:
+            logger.warning(f"Released {cursor.rowcount} tasks with expired leases")
+        return cursor.rowcount
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the oldest pending task to this worker, or return None if there is none"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                self._conn.execute(_EXPIRE_LEASES_SQL, self._expire_leases_params(now))
+                row = self._conn.execute(
+                    "SELECT id, company_key, dimension, payload, attempts FROM tasks "
+                    "WHERE status = ? ORDER BY id LIMIT 1",
+                    (PENDING,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE tasks SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, updated = ? "
+                    "WHERE id = ?",
+                    (LEASED, worker_id, now + self.lease_seconds, now, row[0])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return {
+            "id": row[0],
+            "company_key": row[1],
+            "dimension": row[2],
+            "company_data": json.loads(row[3]),
+            "attempt": row[4] + 1
+        }
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """Extend the lease of a task this worker holds. Returns False if the lease was lost."""
+        cursor = self._execute(
+            "UPDATE tasks SET lease_expires = ?, updated = ? WHERE id = ? AND worker = ? AND status = ?",
+            (time.time() + self.lease_seconds, time.time(), task_id, worker_id, LEASED)
+        )
+        return cursor.rowcount > 0
+
+    def complete(self, task_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Store a task's result. Ignored (returns False) if this worker no longer holds the lease."""
+        cursor = self._execute(
+            "UPDATE tasks SET status = ?, result = ?, error = NULL, lease_expires = NULL, updated = ? "
+            "WHERE id = ? AND worker = ? AND status = ?",
+            (DONE, json.dumps(result), time.time(), task_id, worker_id, LEASED)
+        )
+        return cursor.rowcount > 0
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> None:
+        """Release a failed task for retry, or mark it failed after max_attempts"""
+        metrics.inc("echo_retries_total", kind="queue_task")
+        self._execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "worker = NULL, lease_expires = NULL, error = ?, updated = ? "
+            "WHERE id = ? AND worker = ? AND status = ?",
+            (self.max_attempts, FAILED, PENDING, error, time.time(), task_id, worker_id, LEASED)
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks per status"""
+        rows = self._execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def has_outstanding(self) -> bool:
+        counts = self.counts()
+        return counts[PENDING] + counts[LEASED] > 0
+
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Every task with its payload, status and result, in enqueue order"""
+        rows = self._execute(
+            "SELECT company_key, dimension, payload, status, result, error FROM tasks ORDER BY id"
+        ).fetchall()
+        for company_key, dimension, payload, status, result, error in rows:
+            yield {
+                "company_key": company_key,
+                "dimension": dimension,
+                "company_data": json.loads(payload),
+                "status": status,
+                "result": json.loads(result) if result else None,
+                "error": error
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _Heartbeat:
+    """Background thread that keeps a task's lease alive while it is being evaluated"""
+
+    def __init__(self, queue: WorkQueue, task_id: int, worker_id: str):
+        self.queue = queue
+        self.task_id = task_id
+        self.worker_id = worker_id
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.queue.lease_seconds / 3):
+            try:
+                renewed = self.queue.heartbeat(self.task_id, self.worker_id)
+            except Exception as e:
+                # e.g. the queue file is locked or briefly unreachable; the lease outlives a few missed beats
+                logger.warning(f"Heartbeat for task {self.task_id} failed, retrying: {str(e)}")
+                continue
+            if not renewed:
+                logger.warning(f"Lost lease on task {self.task_id}")
+                self.lost = True
+                return
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def enqueue_companies(
+    queue: WorkQueue,
+    companies: List[Dict[str, Any]],
+    company_keys: List[str],
+    per_dimension: bool = False
+) -> int:
+    """
+    Enqueue one task per company, or one per company and dimension.
+
+    Returns:
+        Number of new tasks (tasks that already exist are not enqueued again)
+    """
+    added = 0
+    for company_data, company_key in zip(companies, company_keys):
+        dimensions = list(EVALUATOR_CLASSES) if per_dimension else [COMPANY_TASK]
+        for dimension in dimensions:
+            added += queue.enqueue(company_key, company_data, dimension)
+    logger.info(f"Enqueued {added} new tasks ({queue.counts()})")
+    return added
+
+
+def run_worker(
+    queue: WorkQueue,
+    worker_id: Optional[str] = None,
+    evaluator_settings: Optional[Dict[str, Any]] = None,
+    poll_interval: float = 5.0,
+    company_timeout: Optional[float] = None
+) -> int:
+    """
+    Claim and evaluate tasks until the queue is drained.
+
+    While other workers still hold leases the worker keeps polling, so it can
+    pick up their tasks if they crash and the leases expire. company_timeout
+    bounds each company task (see run_evaluation); dimension tasks are bounded
+    by their evaluator's evaluation_timeout.
+
+    Returns:
+        Number of tasks this worker completed
+    """
+    worker_id = worker_id or default_worker_id()
+    completed = 0
+    logger.info(f"Worker {worker_id} started on {queue.path}")
+
+    while True:
+        task = queue.claim(worker_id)
+        if task is None:
+            if not queue.has_outstanding():
+                break
+            time.sleep(poll_interval)
+            continue
+
+        label = task["company_key"] + (f" / {task['dimension']}" if task["dimension"] else "")
+        logger.info(f"Worker {worker_id} claimed task {task['id']} ({label}, attempt {task['attempt']})")
+        try:
+            with _Heartbeat(queue, task["id"], worker_id) as heartbeat:
+                if task["dimension"]:
+                    result = run_dimension_evaluation(
+                        task["company_data"], task["dimension"], evaluator_settings=evaluator_settings
+                    )
+                else:
+                    result = run_evaluation(
+                        task["company_data"], evaluator_settings=evaluator_settings, company_timeout=company_timeout
+                    )
+            if heartbeat.lost or not queue.complete(task["id"], worker_id, result):
+                logger.warning(f"Discarding result of task {task['id']}: lease was lost to another worker")
+                continue
+            completed += 1
+        except Exception as e:
+            logger.error(f"Task {task['id']} ({label}) failed: {str(e)}", exc_info=True)
+            queue.fail(task["id"], worker_id, str(e))
+
+    logger.info(f"Worker {worker_id} finished, completed {completed} tasks")
+    return completed
+
+
+def collect_results(queue: WorkQueue) -> Dict[str, Dict[str, Any]]:
+    """
+    Assemble per-company evaluation results from the queue.
+
+    Company tasks contribute their full result; dimension tasks are merged
+    per company and Overall is recomputed from them. Companies with tasks
+    still pending or leased are left out until those finish, so no Overall
+    is computed from a partial set of dimensions.
+
+    Returns:
+        Mapping of company key to {"company_data": ..., "results": ...}
+    """
+    companies: Dict[str, Dict[str, Any]] = {}
+    incomplete = set()
+    for task in queue.iter_tasks():
+        if task["status"] in (PENDING, LEASED):
+            incomplete.add(task["company_key"])
+        entry = companies.setdefault(task["company_key"], {
+            "company_data": task["company_data"],
+            "results": {"metadata": build_metadata(task["company_data"])}
+        })
+        if not task["dimension"]:
+            if task["result"] is not None:
+                entry["results"] = task["result"]
+            elif task["status"] == FAILED:
+                entry["results"]["error"] = task["error"]
+            continue
+        if task["result"] is not None:
+            entry["results"][task["dimension"]] = task["result"]
+        elif task["status"] == FAILED:
+            entry["results"][task["dimension"]] = {
+                "score": 1,
+                "rationale": f"Error during evaluation: {task['error']}",
+                "error": task["error"]
+            }
+
+    if incomplete:
+        logger.info(f"Leaving out {len(incomplete)} companies whose tasks are still pending or leased")
+    companies = {key: entry for key, entry in companies.items() if key not in incomplete}
+    for entry in companies.values():
+        results = entry["results"]
+        if "Overall" not in results:
+            results["Overall"] = compute_overall(results, len(EVALUATOR_CLASSES))
+    return companies
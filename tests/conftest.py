@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tools.tokenizer as tokenizer
+
+
+class WhitespaceEncoding:
+    """One token per whitespace-separated word, so tests never download BPE files"""
+
+    def encode(self, text, **kwargs):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY", "test"))
+    monkeypatch.setattr(tokenizer, "get_encoding", lambda model=tokenizer.DEFAULT_MODEL: WhitespaceEncoding())
+
+
+class FakeLLM:
+    """Stands in for ChatOpenAI: replies with each queued response in turn, raising queued exceptions"""
+
+    def __init__(self, responses=None, model_name="gpt-4.1"):
+        self.model_name = model_name
+        self.responses = list(responses or [])
+        self.prompts = []
+
+    def predict(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        response = self.responses.pop(0) if self.responses else "Score: 3\nRationale: fine"
+        if isinstance(response, Exception):
+            raise response
+        return response
@@ -0,0 +1,53 @@
+from agents.base_evaluator import BaseEvaluator
+
+from conftest import FakeLLM
+
+
+def test_confidence_section_comes_last_and_unnumbered():
+    evaluator = BaseEvaluator("Cascade Dimension", "rubric")
+    evaluator.prompt_instructions = "Weigh recent news more heavily."
+    prompt = evaluator.build_cascade_prompt(evaluator.build_prompt({"name": "Acme"}, {"name": "Acme"}, "evidence"))
+
+    assert prompt.index("Additional Instructions:") < prompt.index("Confidence:")
+    assert "3. End your response" not in prompt
+    assert prompt.rstrip().endswith("given the available evidence.")
+
+
+def test_confident_cheap_reply_is_accepted():
+    evaluator = BaseEvaluator("Cascade Dimension", "rubric")
+    evaluator.cascade_model = "gpt-4.1-mini"
+    evaluator._cascade_llm = FakeLLM(["Score: 2\nRationale: thin\nConfidence: high"], model_name="gpt-4.1-mini")
+    evaluator.llm = FakeLLM()
+
+    score, _, cascade = evaluator.evaluate_with_cascade("prompt")
+    assert score == 2
+    assert cascade["model"] == "gpt-4.1-mini"
+    assert "Confidence:" in evaluator._cascade_llm.prompts[0]
+    assert evaluator.llm.prompts == []
+
+
+def test_open_cascade_circuit_does_not_block_the_main_model(monkeypatch):
+    import agents.base_evaluator as base_evaluator
+    from tools.circuit_breaker import CircuitBreakerGroup
+
+    breakers = CircuitBreakerGroup("llm", failure_threshold=1, reset_timeout=60.0)
+    breakers.for_key("gpt-4.1-mini").record_failure()
+    monkeypatch.setattr(base_evaluator, "llm_breakers", breakers)
+    evaluator = BaseEvaluator("Cascade Dimension", "rubric")
+    evaluator.cascade_model = "gpt-4.1-mini"
+    evaluator._cascade_llm = FakeLLM(model_name="gpt-4.1-mini")
+    evaluator.llm = FakeLLM(["Score: 4\nRationale: strong"])
+
+    score, _, cascade = evaluator.evaluate_with_cascade("prompt")
+    assert score == 4
+    assert cascade["escalation_reason"] == "cascade_error"
+    assert evaluator._cascade_llm.prompts == []
+    assert not breakers.for_key("gpt-4.1").is_open()
+
+
+def test_llm_model_setting_rebuilds_the_client():
+    from runners.evaluate_company import build_evaluators
+
+    evaluators = build_evaluators(dimension_settings={"Founder Edge": {"llm_model": "gpt-4o"}})
+    assert evaluators["Founder Edge"].llm.model_name == "gpt-4o"
+    assert evaluators["Investor Behavior"].llm.model_name == "gpt-4.1"
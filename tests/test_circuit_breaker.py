@@ -0,0 +1,68 @@
+import pytest
+
+from agents.base_evaluator import BaseEvaluator
+from runners.evaluate_company import compute_overall
+from tools.circuit_breaker import CircuitBreaker, CircuitBreakerGroup, CircuitOpenError
+import agents.base_evaluator as base_evaluator
+
+from conftest import FakeLLM
+
+
+def make_evidence():
+    return {
+        "company_data": {"name": "Acme"},
+        "trimmed_data": {"name": "Acme", "summary": "Widgets"},
+        "web_results": "",
+        "search_stats": {}
+    }
+
+
+@pytest.fixture
+def open_llm_breaker(monkeypatch):
+    breakers = CircuitBreakerGroup("llm", failure_threshold=1, reset_timeout=60.0)
+    breaker = breakers.for_key("gpt-4.1")
+    breaker.record_failure()
+    monkeypatch.setattr(base_evaluator, "llm_breakers", breakers)
+    return breaker
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60.0)
+    breaker.record_failure()
+    assert not breaker.is_open()
+    breaker.record_failure()
+    assert breaker.is_open()
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "never sent")
+
+
+def test_open_llm_circuit_leaves_dimension_unscored(open_llm_breaker):
+    evaluator = BaseEvaluator("Test Dimension", "rubric")
+    evaluator.llm = FakeLLM()
+    result = evaluator.score_evidence(make_evidence())
+    assert result["score"] is None
+    assert result["circuit_open"] is True
+    assert "error" in result
+    assert evaluator.llm.prompts == []
+
+
+def test_open_llm_circuit_leaves_ensemble_unscored(open_llm_breaker):
+    evaluator = BaseEvaluator("Test Dimension", "rubric")
+    evaluator.llm = FakeLLM()
+    evaluator.ensemble_size = 3
+    result = evaluator.score_evidence(make_evidence())
+    assert result["score"] is None
+    assert "error" in result
+
+
+def test_unscored_dimensions_are_left_out_of_overall(open_llm_breaker):
+    evaluator = BaseEvaluator("Test Dimension", "rubric")
+    evaluator.llm = FakeLLM()
+    results = {
+        "metadata": {},
+        "Founder Edge": {"score": 4, "rationale": "strong"},
+        "Novel Wedge": evaluator.score_evidence(make_evidence())
+    }
+    overall = compute_overall(results, 2)
+    assert overall["score"] == 4
+    assert overall["successful_evaluations"] == 1
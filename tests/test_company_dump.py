@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from tools.company_dump import (
+    CompanyDumpReader,
+    index_path_for,
+    parse_shard,
+    parse_slice,
+    select_positions
+)
+
+
+def company(i):
+    # Braces, brackets and escaped quotes inside strings must not confuse the scanner
+    return {"name": f"Company {i}", "summary": f'Makes {{widgets}} [v{i}] "quoted" \\ back', "tags": [i, {"n": i}]}
+
+
+def write_json_dump(path, count):
+    path.write_text(json.dumps({"status": 200, "data": [company(i) for i in range(count)], "total": count}))
+
+
+def selected_names(path, record_slice=None, shard=None):
+    with CompanyDumpReader(str(path)) as reader:
+        positions = select_positions(len(reader), record_slice, shard)
+        return [record["name"] for record in reader.iter_records(positions)]
+
+
+def test_slice_then_shard_selects_contiguous_records(tmp_path):
+    path = tmp_path / "dump.json"
+    write_json_dump(path, 10)
+
+    assert selected_names(path, parse_slice("2:8")) == [f"Company {i}" for i in range(2, 8)]
+    assert selected_names(path, parse_slice("2:8"), parse_shard("1/3")) == ["Company 4", "Company 5"]
+    shards = [selected_names(path, parse_slice(":"), (i, 3)) for i in range(3)]
+    assert sum(shards, []) == [f"Company {i}" for i in range(10)]
+    assert index_path_for(str(path)).exists()
+
+
+def test_changed_dump_rebuilds_its_offset_index(tmp_path):
+    path = tmp_path / "dump.jsonl"
+    path.write_text("\n".join(json.dumps(company(i)) for i in range(4)) + "\n")
+    assert selected_names(path, shard=(1, 2)) == ["Company 2", "Company 3"]
+
+    with open(path, "a") as f:
+        f.write("\n".join(json.dumps(company(i)) for i in range(4, 8)) + "\n")
+    assert selected_names(path, shard=(1, 2)) == [f"Company {i}" for i in range(4, 8)]
+    assert len(json.loads(index_path_for(str(path)).read_text())["records"]) == 8
+
+
+@pytest.mark.parametrize("value", ["3", "1/0", "2/2", "a/b"])
+def test_invalid_shard_is_rejected(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
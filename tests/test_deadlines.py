@@ -0,0 +1,113 @@
+import time
+
+from agents.base_evaluator import BaseEvaluator
+import runners.evaluate_company as evaluate_company
+from tools.deadline import Deadline, DeadlineExceeded, call_with_deadline, when_done
+
+import pytest
+
+
+class SlowSearch:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.calls = []
+
+    def run(self, query):
+        self.calls.append(query)
+        time.sleep(self.seconds)
+        return str([f"{query}: a snippet", f"{query}: another snippet"])
+
+
+class QueryEvaluator(BaseEvaluator):
+    search_concurrency = 1
+    min_search_queries = 1
+
+    def __init__(self, name="Slow Dimension"):
+        super().__init__(name, "rubric")
+
+    def get_search_queries(self, company_data):
+        return [f"{self.dimension_name} query {i}" for i in range(4)]
+
+    def has_sufficient_structured_data(self, company_data):
+        return False
+
+
+def test_call_with_deadline_stops_waiting():
+    start = time.time()
+    with pytest.raises(DeadlineExceeded):
+        call_with_deadline(Deadline(0.2), time.sleep, 2)
+    assert time.time() - start < 1
+
+
+def test_dimension_timeout_bounds_its_share_of_the_search_stage(monkeypatch, tmp_path):
+    search = SlowSearch(0.2)
+    monkeypatch.setattr(evaluate_company, "search_tool", search)
+    bounded = QueryEvaluator("Bounded")
+    bounded.evaluation_timeout = 0.3
+    unbounded = QueryEvaluator("Unbounded")
+
+    index, stats = evaluate_company.build_passage_index(
+        {"name": "Acme"}, {"Bounded": bounded, "Unbounded": unbounded}, index_path=tmp_path / "acme.sqlite"
+    )
+    try:
+        assert stats["Bounded"]["stop_reason"] == "deadline"
+        assert stats["Bounded"]["queries_spent"] < 4
+        assert stats["Unbounded"]["queries_spent"] == 4
+        # Searches cut short are retried next run
+        assert index.get_meta("search:Bounded") is None
+        assert index.get_meta("search:Unbounded") is not None
+    finally:
+        index.close()
+
+
+def test_search_seconds_count_against_the_scoring_deadline():
+    evaluator = QueryEvaluator()
+    evaluator.evaluation_timeout = 1.0
+    assert evaluate_company.dimension_deadline(evaluator, spent=2.0).expired()
+    assert not evaluate_company.dimension_deadline(evaluator, spent=0.5).expired()
+
+
+def test_abandoned_call_is_handed_back_and_resources_close_after_it():
+    closed = []
+    with pytest.raises(DeadlineExceeded) as raised:
+        call_with_deadline(Deadline(0.05), time.sleep, 0.3)
+    future = raised.value.future
+    assert future is not None and not future.done()
+
+    when_done([future], lambda: closed.append(True))
+    assert closed == []
+    future.result(timeout=2)
+    assert closed == [True]
+
+
+def test_when_done_runs_straight_away_without_pending_work():
+    closed = []
+    when_done([], lambda: closed.append(True))
+    assert closed == [True]
+
+
+def test_timed_out_dimension_does_not_read_a_closed_index(monkeypatch, tmp_path):
+    monkeypatch.setattr(evaluate_company, "search_tool", SlowSearch(0.0))
+    monkeypatch.setattr(evaluate_company, "company_index_path", lambda company_data: tmp_path / f"{company_data['name']}.sqlite")
+    errors = []
+
+    class SlowScoring(QueryEvaluator):
+        def score_evidence(self, evidence):
+            time.sleep(0.3)
+            return {"score": 3, "rationale": "late"}
+
+        def retrieve_passages(self, company_data, passage_index):
+            time.sleep(0.3)
+            try:
+                return super().retrieve_passages(company_data, passage_index)
+            except Exception as e:
+                errors.append(e)
+                raise
+
+    evaluator = SlowScoring()
+    evaluator.evaluation_timeout = 0.1
+    company = {"name": "Acme", "display_name": "Acme", "summary": "Widgets for everyone"}
+    result = evaluate_company.run_dimension_evaluation(company, "Founder Edge", evaluator=evaluator)
+    assert result["timed_out"] is True
+    time.sleep(0.6)
+    assert errors == []
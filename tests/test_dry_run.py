@@ -0,0 +1,55 @@
+import pytest
+
+from runners.dry_run import DEFAULT_COMPLETION_TOKENS, estimate_run
+from runners.evaluate_company import EVALUATOR_CLASSES
+from runners.scheduler import TraceStore
+
+COMPANIES = [
+    {"name": "Acme", "summary": "Widgets for everyone", "website": "acme.com"},
+    {"name": "Beta", "summary": "Gadgets for teams", "website": "beta.io"}
+]
+
+
+@pytest.fixture
+def estimate(tmp_path, monkeypatch):
+    # No passage indexes or job traces from earlier runs
+    monkeypatch.chdir(tmp_path)
+    return lambda **kwargs: estimate_run(COMPANIES, trace_store=TraceStore(tmp_path / "traces.jsonl"), **kwargs)
+
+
+def test_every_dimension_is_one_job_and_one_call_per_company(estimate):
+    report = estimate()
+    totals = report["totals"]
+    jobs = len(COMPANIES) * len(EVALUATOR_CLASSES)
+
+    assert totals["jobs"] == jobs
+    assert totals["llm_calls"] == {"gpt-4.1": jobs}
+    assert totals["completion_tokens"] == DEFAULT_COMPLETION_TOKENS * jobs
+    assert totals["search_queries_planned"] == sum(d["search_queries_planned"] for d in report["dimensions"].values())
+    assert totals["prompt_tokens"] == pytest.approx(sum(d["prompt_tokens"] for d in report["dimensions"].values()), abs=0.5)
+    assert totals["cost_usd"] > 0
+    assert totals["wall_seconds"] == totals["work_seconds"]
+
+
+def test_workers_shorten_the_projected_wall_time(estimate):
+    totals = estimate(workers=4)["totals"]
+    assert totals["work_seconds"] / 4 <= totals["wall_seconds"] < totals["work_seconds"]
+
+
+def test_reused_batched_and_ensemble_dimensions(estimate):
+    report = estimate(
+        evaluator_settings={"ensemble_size": 3},
+        batch_size=2,
+        reused_results=[{"Founder Edge": {"score": 4}}, {}]
+    )
+    founder_edge = report["dimensions"]["Founder Edge"]
+    investor_behavior = report["dimensions"]["Investor Behavior"]
+
+    assert (founder_edge["jobs"], founder_edge["reused"]) == (1, 1)
+    # Two samples for a quorum, plus half the chance of a third
+    assert founder_edge["llm_calls"] == {"gpt-4.1": 2.5}
+    # Both companies in one batched request, no search
+    assert investor_behavior["jobs"] == 1
+    assert investor_behavior["llm_calls"] == {"gpt-4.1": 1}
+    assert investor_behavior["search_queries_planned"] == 0
+    assert investor_behavior["completion_tokens"] == DEFAULT_COMPLETION_TOKENS * len(COMPANIES)
@@ -0,0 +1,49 @@
+from agents.base_evaluator import BaseEvaluator
+from runners.dry_run import planned_calls
+from runners.evaluate_company import apply_evaluator_settings
+
+from conftest import FakeLLM
+
+import pytest
+
+
+def make_evaluator(responses, size=5):
+    evaluator = BaseEvaluator("Ensemble Dimension", "rubric")
+    evaluator.ensemble_size = size
+    evaluator.llm = FakeLLM(responses)
+    return evaluator
+
+
+def test_agreeing_first_wave_draws_no_more_samples():
+    evaluator = make_evaluator(["Score: 4\nRationale: good"] * 5)
+    score, _, ensemble = evaluator.evaluate_ensemble("prompt")
+    assert score == 4
+    assert len(evaluator.llm.prompts) == 3
+    assert ensemble["samples_requested"] == 3
+    assert ensemble["quorum_reached"]
+
+
+def test_disagreement_draws_only_the_samples_a_quorum_still_needs():
+    evaluator = make_evaluator([
+        "Score: 4\nRationale: good",
+        "Score: 4\nRationale: good",
+        "Score: 2\nRationale: weak",
+        "Score: 4\nRationale: good",
+        "Score: 4\nRationale: good"
+    ])
+    score, _, ensemble = evaluator.evaluate_ensemble("prompt")
+    assert score == 4
+    assert len(evaluator.llm.prompts) == 4
+    assert ensemble["distribution"] == {"2": 1, "4": 3}
+
+
+def test_ensemble_and_cascade_are_rejected_together():
+    evaluator = BaseEvaluator("Ensemble Dimension", "rubric")
+    with pytest.raises(ValueError):
+        apply_evaluator_settings(evaluator, {"ensemble_size": 3, "cascade_model": "gpt-4.1-mini"})
+
+
+def test_dry_run_counts_the_first_wave_and_expected_extra_samples():
+    evaluator = make_evaluator([], size=5)
+    [(model, tokens, calls)] = planned_calls(evaluator, 100)
+    assert 3 <= calls < 5
@@ -0,0 +1,38 @@
+from runners.entity_resolution import resolve_entities
+
+
+def test_shared_domain_merges_records():
+    canonical, keys = resolve_entities([
+        {"name": "Acme", "website": "https://www.acme.com"},
+        {"name": "Acme Inc", "website": "acme.com/about", "founded": 2019}
+    ])
+    assert canonical == [1, 1]
+    assert ("domain", "acme.com") in keys[1]
+
+
+def test_name_alone_does_not_merge():
+    canonical, _ = resolve_entities([
+        {"name": "Acme", "website": "acme.com"},
+        {"name": "Acme", "website": "acme.io"},
+        {"name": "Acme Inc"}
+    ])
+    assert canonical == [0, 1, 2]
+
+
+def test_name_with_same_city_or_founding_year_merges():
+    canonical, keys = resolve_entities([
+        {"name": "Acme", "location": {"locality": "Berlin"}},
+        {"name": "Acme GmbH", "location": {"locality": "berlin", "country": "germany"}},
+        {"name": "Beta", "founded": "2015-03-01"},
+        {"name": "Beta Inc", "founded": 2015}
+    ])
+    assert canonical == [0, 0, 2, 2]
+    assert keys[2] == [("name_founded", "beta / 2015")]
+
+
+def test_corroborated_name_with_different_linkedin_ids_stays_apart():
+    canonical, _ = resolve_entities([
+        {"name": "Acme", "founded": 2015, "linkedin_id": "111"},
+        {"name": "Acme", "founded": 2015, "linkedin_id": "222"}
+    ])
+    assert canonical == [0, 1]
@@ -0,0 +1,23 @@
+from tools.evidence_packer import pack_evidence
+
+
+def words(prefix, count):
+    return " ".join(f"{prefix}{i}" for i in range(count))
+
+
+def test_snippet_larger_than_the_rest_of_the_budget_is_truncated():
+    results = [("acme funding", str([f"acme funding {words('a', 40)}", f"acme funding {words('b', 200)}"]))]
+    evidence, stats = pack_evidence(results, ["acme", "funding"], token_budget=100)
+    assert stats["snippets_kept"] == 2
+    assert stats["snippets_truncated"] == 1
+    assert stats["evidence_tokens"] <= 100
+    assert "b0" in evidence and "b199" not in evidence
+    assert evidence.rstrip().endswith("...")
+
+
+def test_small_remainder_leaves_room_for_shorter_snippets():
+    results = [("acme", str([f"acme {words('a', 90)}", f"acme {words('b', 200)}", "acme tiny"]))]
+    evidence, stats = pack_evidence(results, ["acme"], token_budget=100)
+    assert stats["snippets_truncated"] == 0
+    assert stats["snippets_dropped"] == 1
+    assert "acme tiny" in evidence
@@ -0,0 +1,58 @@
+from agents.evaluators import FounderEdgeEvaluator
+from tools.founder_cache import FounderCache, extract_founders
+
+import pytest
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = FounderCache(tmp_path / "founders.sqlite")
+    yield cache
+    cache.close()
+
+
+def test_profile_is_found_by_name_or_linkedin(cache):
+    cache.put("Jane Doe", "https://www.linkedin.com/in/jane-doe/", ["Jane Doe founded Widgets"], company="Acme")
+    assert cache.get("jane doe")["snippets"] == ["Jane Doe founded Widgets"]
+    assert cache.get("Someone Else", "linkedin.com/in/jane-doe")["name"] == "Jane Doe"
+
+
+def test_same_name_different_linkedin_is_another_person(cache):
+    cache.put("David Chen", "linkedin.com/in/david-chen-aaa", ["aaa background"], company="Acme")
+    assert cache.get("David Chen", "linkedin.com/in/david-chen-bbb") is None
+
+    cache.put("David Chen", "linkedin.com/in/david-chen-bbb", ["bbb background"], company="Beta")
+    assert cache.get("David Chen", "linkedin.com/in/david-chen-aaa")["snippets"] == ["aaa background"]
+    assert cache.get("David Chen", "linkedin.com/in/david-chen-bbb")["snippets"] == ["bbb background"]
+    assert cache.count() == 2
+
+
+def test_name_only_profile_is_upgraded_with_linkedin(cache):
+    cache.put("Jane Doe", None, ["first"], company="Acme")
+    cache.put("Jane Doe", "linkedin.com/in/jane-doe", ["second"], company="Beta")
+    profile = cache.get("Jane Doe", "linkedin.com/in/jane-doe")
+    assert profile["companies"] == ["Acme", "Beta"]
+    assert cache.count() == 1
+
+
+def test_expired_profile_is_a_miss(cache):
+    cache.put("Jane Doe", None, ["old"])
+    assert cache.get("Jane Doe", ttl=-1) is None
+
+
+def test_extract_founders_prefers_most_mentioned():
+    results = [str([
+        "Acme was founded by Jane Doe and John Roe in 2019",
+        "Co-founder & CEO Jane Doe said",
+        "https://www.linkedin.com/in/jane-doe-123"
+    ])]
+    founders = extract_founders(results, "Acme")
+    assert founders[0] == {"name": "Jane Doe", "linkedin_url": "linkedin.com/in/jane-doe-123"}
+    assert founders[1]["name"] == "John Roe"
+
+
+def test_profile_queries_do_not_mention_the_company():
+    evaluator = FounderEdgeEvaluator()
+    queries = evaluator.get_founder_profile_queries({"name": "Jane Doe", "linkedin_url": ""}, {"name": "Acme Robotics"})
+    assert queries
+    assert all("Acme" not in query for query in queries)
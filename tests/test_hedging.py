@@ -0,0 +1,60 @@
+import itertools
+import threading
+import time
+
+from tools.hedging import Hedger
+
+
+def warmed_up_hedger(**kwargs):
+    """A hedger with enough ~10ms samples that calls are hedged after ~10ms"""
+    hedger = Hedger("test", percentile=0.5, max_extra_ratio=1.0, min_samples=3, **kwargs)
+    hedger.configure(enabled=True)
+    for _ in range(3):
+        hedger.call(time.sleep, 0.01, key="model")
+    return hedger
+
+
+def test_stalled_call_is_hedged_and_the_duplicate_wins():
+    hedger = warmed_up_hedger()
+    attempts = itertools.count()
+    release = threading.Event()
+
+    def stalls_first_time():
+        if next(attempts) == 0:
+            release.wait(2.0)
+            return "primary"
+        return "hedge"
+
+    start = time.time()
+    assert hedger.call(stalls_first_time, key="model") == "hedge"
+    assert time.time() - start < 1.0
+    release.set()
+
+    report = hedger.report()["model"]
+    assert report["hedged"] == 1
+    assert report["hedge_wins"] == 1
+
+
+def test_fast_call_is_not_hedged():
+    hedger = warmed_up_hedger()
+    calls = []
+    assert hedger.call(lambda: calls.append(1) or "done", key="model") == "done"
+    assert calls == [1]
+    assert hedger.report()["model"]["hedged"] == 0
+
+
+def test_hedge_that_has_not_started_is_cancelled_when_the_primary_wins():
+    # One worker: the hedge queues behind the primary, which then finishes first
+    hedger = warmed_up_hedger(max_workers=1)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return "primary"
+
+    assert hedger.call(slow, key="model") == "primary"
+    time.sleep(0.05)
+    assert calls == [1]
+    assert hedger.report()["model"]["hedged"] == 1
+    assert hedger.report()["model"]["hedge_wins"] == 0
@@ -0,0 +1,59 @@
+from runners.evaluate_company import build_evaluators, find_reusable_results, tag_input_hash
+
+COMPANY = {"name": "Acme", "display_name": "Acme", "summary": "Widgets for everyone"}
+
+
+def previous_results(evaluators):
+    return {
+        dimension: tag_input_hash({"score": 4, "rationale": "good"}, evaluator, COMPANY)
+        for dimension, evaluator in evaluators.items()
+    }
+
+
+def test_unchanged_settings_reuse_every_dimension():
+    evaluators = build_evaluators()
+    reusable = find_reusable_results(COMPANY, previous_results(evaluators), evaluators=evaluators)
+    assert set(reusable) == set(evaluators)
+
+
+def test_changed_scoring_models_are_not_reused():
+    previous = previous_results(build_evaluators())
+    for settings in ({"cascade_model": "gpt-4.1-mini"}, {"ensemble_size": 3}, {"llm_model": "gpt-4o"}):
+        evaluators = build_evaluators(**settings)
+        assert find_reusable_results(COMPANY, previous, evaluators=evaluators) == {}
+
+
+def test_failed_llm_call_is_not_reused(monkeypatch):
+    import agents.base_evaluator as base_evaluator
+    from tools.circuit_breaker import CircuitBreakerGroup
+    from conftest import FakeLLM
+
+    monkeypatch.setattr(base_evaluator, "llm_breakers", CircuitBreakerGroup("llm"))
+    evaluators = build_evaluators()
+    evaluator = evaluators["Investor Behavior"]
+    evaluator.llm = FakeLLM([RuntimeError("rate limited")])
+    evidence = {"company_data": COMPANY, "trimmed_data": {"name": "Acme"}, "web_results": "", "search_stats": {}}
+
+    result = tag_input_hash(evaluator.score_evidence(evidence), evaluator, COMPANY)
+    assert "error" in result and "input_hash" not in result
+    assert find_reusable_results(COMPANY, {"Investor Behavior": result}, evaluators=evaluators) == {}
+
+
+def test_batched_dimensions_use_the_run_settings(monkeypatch):
+    from agents.evaluators import InvestorBehaviorEvaluator
+    from runners.evaluate_company import run_batched_dimensions
+
+    seen = []
+
+    def evaluate_batch(self, data_list):
+        seen.append((self.cascade_model, self.llm_timeout))
+        return [{"score": 3, "rationale": "fine", "batched": True} for _ in data_list]
+
+    monkeypatch.setattr(InvestorBehaviorEvaluator, "evaluate_batch", evaluate_batch)
+    settings = {"cascade_model": "gpt-4.1-mini", "llm_timeout": 5.0}
+
+    batched = run_batched_dimensions([COMPANY], 4, evaluator_settings=settings)
+    result = batched[0]["Investor Behavior"]
+    assert seen == [("gpt-4.1-mini", 5.0)]
+    assert result["input_hash"] == build_evaluators(**settings)["Investor Behavior"].input_hash(COMPANY)
+    assert result["input_hash"] != build_evaluators()["Investor Behavior"].input_hash(COMPANY)
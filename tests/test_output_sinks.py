@@ -0,0 +1,79 @@
+import sqlite3
+
+from tools.output_sinks import GoogleSheetsSink, InMemoryWorksheet, SQLiteSink
+
+FIELDS = ["name", "score"]
+
+
+class FlakyWorksheet(InMemoryWorksheet):
+    """Fails the first `failures` append_rows calls"""
+
+    def __init__(self, failures=1):
+        super().__init__()
+        self.failures = failures
+
+    def append_rows(self, values, value_input_option="RAW"):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("quota exceeded")
+        super().append_rows(values, value_input_option)
+
+
+def test_rows_are_appended_in_batches_under_one_header():
+    worksheet = InMemoryWorksheet()
+    sink = GoogleSheetsSink(worksheet, FIELDS, batch_size=2, flush_interval=60)
+    for i in range(5):
+        sink.write({"name": f"Company {i}", "score": i})
+    sink.close()
+
+    assert worksheet.rows[0] == FIELDS
+    assert worksheet.rows[1:] == [[f"Company {i}", i] for i in range(5)]
+    assert worksheet.append_calls == 3
+    assert sink.rows_written == 5
+
+
+def test_existing_header_is_not_repeated():
+    worksheet = InMemoryWorksheet()
+    worksheet.rows.append(list(FIELDS))
+    sink = GoogleSheetsSink(worksheet, FIELDS, flush_interval=60)
+    sink.write({"name": "Acme", "score": None})
+    sink.close()
+    assert worksheet.rows == [FIELDS, ["Acme", ""]]
+
+
+def test_failed_batch_is_retried_with_its_header():
+    worksheet = FlakyWorksheet(failures=1)
+    sink = GoogleSheetsSink(worksheet, FIELDS, flush_interval=60)
+    sink.write({"name": "Acme", "score": 4})
+    sink.flush()
+    assert worksheet.rows == []
+    assert sink.rows_written == 0
+
+    sink.close()
+    assert worksheet.rows == [FIELDS, ["Acme", 4]]
+    assert sink.rows_written == 1
+
+
+def test_buffer_is_bounded_while_the_sink_keeps_failing():
+    worksheet = FlakyWorksheet(failures=1000)
+    sink = GoogleSheetsSink(worksheet, FIELDS, batch_size=2, flush_interval=60, max_buffered_rows=3)
+    for i in range(6):
+        sink.write({"name": f"Company {i}", "score": i})
+        sink.flush()
+    sink.close()
+    assert sink.rows_dropped == 3
+    assert sink.rows_written == 0
+
+
+def test_sqlite_rows_are_keyed_by_company_identity(tmp_path):
+    path = tmp_path / "results.sqlite"
+    fields = ["name", "website", "score"]
+    sink = SQLiteSink(path, fields, flush_interval=60)
+    sink.write({"name": "Acme", "website": "https://acme.com", "score": 2})
+    sink.write({"name": "Acme", "website": "https://acme.io", "score": 5})
+    sink.write({"name": "Acme", "website": "https://www.acme.com/", "score": 4})
+    sink.close()
+
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute('SELECT name, website, score FROM "evaluations" ORDER BY website').fetchall()
+    assert rows == [("Acme", "https://acme.io", "5"), ("Acme", "https://www.acme.com/", "4")]
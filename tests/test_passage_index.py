@@ -0,0 +1,61 @@
+import time
+
+from tools.passage_index import PassageIndex, company_identity, company_index_path
+import runners.evaluate_company as evaluate_company
+
+import pytest
+
+
+class CountingSearch:
+    def __init__(self):
+        self.calls = []
+
+    def run(self, query):
+        self.calls.append(query)
+        return str([f"{query}: snippet from call {len(self.calls)}"])
+
+
+def test_index_is_keyed_by_identity_not_name(tmp_path):
+    acme_com = company_index_path({"name": "Acme", "website": "https://www.acme.com/about"}, tmp_path)
+    acme_io = company_index_path({"name": "Acme", "website": "acme.io"}, tmp_path)
+    assert acme_com != acme_io
+    assert acme_com == company_index_path({"name": "Acme Inc", "website": "acme.com"}, tmp_path)
+    assert company_identity({"name": "Acme", "linkedin_url": "https://linkedin.com/company/acme-hq"}) == "linkedin acme-hq"
+    assert company_identity({"name": "Acme"}) == "name Acme"
+
+
+def test_meta_expires_after_max_age(tmp_path):
+    index = PassageIndex(tmp_path / "acme.sqlite")
+    try:
+        index.set_meta("search:Founder Edge", {"queries_planned": 4})
+        assert index.get_meta("search:Founder Edge", max_age=60) == {"queries_planned": 4}
+        time.sleep(0.05)
+        assert index.get_meta("search:Founder Edge", max_age=0.01) is None
+        assert index.get_meta("search:Founder Edge") == {"queries_planned": 4}
+    finally:
+        index.close()
+
+
+def test_expired_searches_are_run_again_and_replace_old_passages(monkeypatch, tmp_path):
+    search = CountingSearch()
+    monkeypatch.setattr(evaluate_company, "search_tool", search)
+    evaluator = evaluate_company.EVALUATOR_CLASSES["Novel Wedge"]()
+    company = {"name": "Acme", "display_name": "Acme", "summary": "Widgets", "website": "acme.com"}
+    path = tmp_path / "acme.sqlite"
+
+    index, _ = evaluate_company.build_passage_index(company, {"Novel Wedge": evaluator}, index_path=path)
+    first_calls = len(search.calls)
+    index.close()
+    assert first_calls > 0
+
+    index, stats = evaluate_company.build_passage_index(company, {"Novel Wedge": evaluator}, index_path=path)
+    index.close()
+    assert len(search.calls) == first_calls and stats["Novel Wedge"]["reused_index"]
+
+    index, stats = evaluate_company.build_passage_index(company, {"Novel Wedge": evaluator}, index_path=path, max_age=0)
+    try:
+        assert len(search.calls) > first_calls
+        assert not stats["Novel Wedge"].get("reused_index")
+        assert index.count("search") == len(set(search.calls))
+    finally:
+        index.close()
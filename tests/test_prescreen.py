@@ -0,0 +1,24 @@
+from datetime import date
+
+from runners.prescreen import prescreen_score
+
+
+def test_founded_date_strings_use_their_year():
+    result = prescreen_score({"founded": "2015-03-01"}, reference_date=date(2020, 1, 1))
+    assert result["signals"]["company_age"] == 15
+
+
+def test_malformed_fields_score_nothing_instead_of_raising():
+    result = prescreen_score(
+        {"founded": "unknown", "total_funding_raised": "n/a", "number_funding_rounds": "two"},
+        reference_date=date(2020, 1, 1)
+    )
+    assert result["signals"]["company_age"] == 0
+    assert result["signals"]["total_funding"] == 0
+    assert result["signals"]["funding_rounds"] == 0
+
+
+def test_numeric_strings_are_scored():
+    result = prescreen_score({"total_funding_raised": "6000000", "number_funding_rounds": "2"})
+    assert result["signals"]["total_funding"] == 12
+    assert result["signals"]["funding_rounds"] == 15
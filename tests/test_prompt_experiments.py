@@ -0,0 +1,58 @@
+from agents.base_evaluator import BaseEvaluator
+import agents.base_evaluator as base_evaluator
+import runners.prompt_experiments as prompt_experiments
+from runners.prompt_experiments import build_shift_report, comparable, run_prompt_experiment, score_variant
+from tools.circuit_breaker import CircuitBreakerGroup
+
+from conftest import FakeLLM
+
+EVIDENCE = {
+    "company_data": {"name": "Acme"},
+    "trimmed_data": {"name": "Acme"},
+    "web_results": "",
+    "search_stats": {}
+}
+
+
+def test_failed_llm_call_is_left_unscored(monkeypatch):
+    monkeypatch.setattr(base_evaluator, "llm_breakers", CircuitBreakerGroup("llm"))
+    evaluator = BaseEvaluator("Founder Edge", "rubric")
+    evaluator.llm = FakeLLM([RuntimeError("rate limited")])
+
+    result = score_variant(evaluator, EVIDENCE)
+    assert result["score"] is None
+    assert "rate limited" in result["error"]
+    assert not comparable(result)
+
+
+def test_same_named_companies_are_kept_apart(monkeypatch):
+    monkeypatch.setattr(
+        prompt_experiments, "gather_company_evidence", lambda company_data, evaluators: {d: None for d in evaluators}
+    )
+    companies = [
+        {"name": "Acme", "display_name": "Acme", "summary": "Widgets"},
+        {"name": "Acme", "display_name": "Acme", "summary": "Gadgets"}
+    ]
+    results = run_prompt_experiment(companies, [{"name": "baseline"}], dimensions=["Founder Edge"])
+    assert len(results) == 2
+
+
+def test_errors_are_not_counted_as_shifts():
+    results = {
+        "Acme [#0]": {
+            "baseline": {
+                "Founder Edge": {"score": 4},
+                "Novel Wedge": {"score": 3},
+                "Overall": {"score": 3.5, "successful_evaluations": 2, "total_dimensions": 2}
+            },
+            "terse": {
+                "Founder Edge": {"score": None, "error": "LLM unavailable"},
+                "Novel Wedge": {"score": 2},
+                "Overall": {"score": 2, "successful_evaluations": 1, "total_dimensions": 2}
+            }
+        }
+    }
+    shifts = build_shift_report(results)["shifts"]["terse"]
+    assert "Founder Edge" not in shifts
+    assert "Overall" not in shifts
+    assert shifts["Novel Wedge"]["mean_shift"] == -1
@@ -0,0 +1,61 @@
+from agents.base_evaluator import BaseEvaluator
+import runners.evaluate_company as evaluate_company
+import runners.scheduler as scheduler
+from tools.passage_index import PassageIndex
+
+from conftest import FakeLLM
+
+
+class CountingSearch:
+    def __init__(self):
+        self.calls = []
+
+    def run(self, query):
+        self.calls.append(query)
+        return str([f"{query}: a snippet", f"{query}: another snippet"])
+
+
+class SharedQueryEvaluator(BaseEvaluator):
+    min_search_queries = 3
+
+    def __init__(self, name):
+        super().__init__(name, "rubric")
+        self.llm = FakeLLM()
+
+    def get_search_queries(self, company_data):
+        return [f"{company_data['name']} shared query", f"{company_data['name']} {self.dimension_name} query"]
+
+    def has_sufficient_structured_data(self, company_data):
+        return False
+
+
+def test_dimension_jobs_share_one_search_stage_per_company(monkeypatch, tmp_path):
+    search = CountingSearch()
+    opened = []
+
+    class TrackedIndex(PassageIndex):
+        def __init__(self, path=":memory:"):
+            opened.append(str(path))
+            super().__init__(path)
+
+    evaluators = {name: SharedQueryEvaluator(name) for name in ("Founder Edge", "Novel Wedge", "Sales Motion")}
+    monkeypatch.setattr(evaluate_company, "search_tool", search)
+    monkeypatch.setattr(evaluate_company, "PassageIndex", TrackedIndex)
+    monkeypatch.setattr(evaluate_company, "company_index_path", lambda company_data: tmp_path / f"{company_data['name']}.sqlite")
+    monkeypatch.setattr(scheduler, "company_index_path", lambda company_data: tmp_path / f"{company_data['name']}.sqlite")
+    monkeypatch.setattr(scheduler, "build_evaluators", lambda **settings: evaluators)
+    monkeypatch.setattr(scheduler, "save_evaluation_log", lambda results, name: None)
+
+    companies = [
+        {"name": name, "display_name": name, "summary": f"{name} sells widgets"} for name in ("Acme", "Beta")
+    ]
+    results, stats = scheduler.run_scheduled_evaluations(
+        companies, workers=4, trace_store=scheduler.TraceStore(tmp_path / "traces.jsonl")
+    )
+
+    assert sorted(opened) == sorted(str(tmp_path / f"{name}.sqlite") for name in ("Acme", "Beta"))
+    assert len(search.calls) == len(set(search.calls)) == 8
+    for company_results in results:
+        for dimension in evaluators:
+            assert company_results[dimension]["score"] == 3
+        assert company_results["Overall"]["score"] == 3
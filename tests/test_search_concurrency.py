@@ -0,0 +1,77 @@
+import time
+
+from agents.base_evaluator import BaseEvaluator
+import agents.base_evaluator as base_evaluator
+from tools.circuit_breaker import CircuitBreaker
+
+
+def test_whole_wave_of_queries_runs_at_once():
+    evaluator = BaseEvaluator("Search Dimension", "rubric")
+    running = []
+
+    def run_query(query):
+        running.append(query)
+        time.sleep(0.2)
+        return f"{query} result"
+
+    start = time.time()
+    results = evaluator.run_queries_concurrently([f"q{i}" for i in range(4)], run_query)
+    assert time.time() - start < 0.6
+    assert results == [f"q{i} result" for i in range(4)]
+    assert evaluator.search_concurrency >= 4
+
+
+def test_timed_out_query_is_not_counted_against_the_circuit_twice(monkeypatch):
+    breaker = CircuitBreaker("search", failure_threshold=1)
+    monkeypatch.setattr(base_evaluator, "search_breaker", breaker)
+    evaluator = BaseEvaluator("Search Dimension", "rubric")
+    evaluator.search_timeout = 0.05
+    stats = {}
+
+    results = evaluator.run_queries_concurrently(["slow"], lambda query: time.sleep(0.3), stats)
+    assert results == [None]
+    assert stats["queries_timed_out"] == 1
+    assert breaker.state == "closed"
+
+
+class FourQueryEvaluator(BaseEvaluator):
+    def get_search_queries(self, company_data):
+        return [f"q{i}" for i in range(4)]
+
+
+def test_pause_policy_waits_out_the_circuit_before_searching(monkeypatch):
+    breaker = CircuitBreaker("search", failure_threshold=1, reset_timeout=0.3, policy="pause")
+    breaker.record_failure()
+    monkeypatch.setattr(base_evaluator, "search_breaker", breaker)
+    evaluator = FourQueryEvaluator("Search Dimension", "rubric")
+    evaluator.search_timeout = 0.1
+    evaluator.min_new_snippets_per_query = 0
+    stats = {}
+
+    results = evaluator.collect_search_results(
+        {"name": "Acme"},
+        lambda query: breaker.call(lambda: f"{query} result"),
+        stats
+    )
+    assert results == [(f"q{i}", f"q{i} result") for i in range(4)]
+    assert stats.get("queries_timed_out", 0) == 0
+    assert stats["stop_reason"] is None
+    assert breaker.state == "closed"
+    assert breaker.stats["paused_seconds"] > 0
+
+
+def test_first_wave_can_stop_search_early():
+    evaluator = FourQueryEvaluator("Search Dimension", "rubric")
+    evaluator.evidence_target_snippets = 5
+    sent = []
+
+    def run_query(query):
+        sent.append(query)
+        return [f"{query} fact {i}" for i in range(10)]
+
+    stats = {}
+    results = evaluator.collect_search_results({"name": "Acme"}, run_query, stats)
+    assert sent == ["q0"]
+    assert [query for query, _ in results] == ["q0"]
+    assert stats["queries_spent"] < stats["queries_planned"]
+    assert stats["stop_reason"] == "evidence_target_reached"
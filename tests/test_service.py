@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+import runners.service as service_module
+from runners.service import EvaluationService
+
+COMPANY = {"name": "Acme", "summary": "Widgets"}
+
+
+@pytest.fixture
+def slow_evaluation(monkeypatch):
+    """run_evaluation stand-in that blocks until released and counts its calls"""
+    release = threading.Event()
+    calls = []
+
+    def run_evaluation(company_data, evaluators=None):
+        calls.append(company_data["name"])
+        release.wait(2.0)
+        if company_data.get("fail"):
+            raise RuntimeError("search backend down")
+        return {"Overall": {"score": 4}}
+
+    monkeypatch.setattr(service_module, "run_evaluation", run_evaluation)
+    return release, calls
+
+
+def evaluate_concurrently(service, company_data, count):
+    outcomes = [None] * count
+
+    def request(i):
+        try:
+            outcomes[i] = service.evaluate(company_data)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def wait_for_coalesced(service, count):
+    deadline = time.time() + 2.0
+    while service.status()["coalesced"] < count and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_concurrent_requests_share_one_evaluation(slow_evaluation):
+    release, calls = slow_evaluation
+    service = EvaluationService()
+    threads, outcomes = evaluate_concurrently(service, COMPANY, 4)
+    wait_for_coalesced(service, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["Acme"]
+    assert sorted(source for _, source in outcomes) == ["coalesced", "coalesced", "coalesced", "evaluated"]
+    assert all(results is outcomes[0][0] for results, _ in outcomes)
+    assert service.evaluate(dict(COMPANY)) == (outcomes[0][0], "cached")
+    assert service.status()["in_flight"] == 0
+
+
+def test_coalesced_requests_see_the_failure(slow_evaluation):
+    release, calls = slow_evaluation
+    service = EvaluationService()
+    threads, outcomes = evaluate_concurrently(service, {**COMPANY, "fail": True}, 3)
+    wait_for_coalesced(service, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["Acme"]
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    status = service.status()
+    assert (status["errors"], status["in_flight"], status["cached"]) == (1, 0, 0)
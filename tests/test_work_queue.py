@@ -0,0 +1,59 @@
+import sqlite3
+import time
+
+from runners.work_queue import WorkQueue, _Heartbeat, collect_results
+
+import pytest
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", lease_seconds=0.15)
+    yield queue
+    queue.close()
+
+
+def test_heartbeat_survives_a_failed_beat(queue):
+    queue.enqueue("acme", {"name": "Acme"})
+    task = queue.claim("worker-1")
+    beats = []
+    heartbeat = queue.heartbeat
+
+    def flaky(task_id, worker_id):
+        beats.append(task_id)
+        if len(beats) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return heartbeat(task_id, worker_id)
+
+    queue.heartbeat = flaky
+    with _Heartbeat(queue, task["id"], "worker-1") as beat:
+        time.sleep(0.35)
+    assert len(beats) >= 2
+    assert not beat.lost
+    assert queue.complete(task["id"], "worker-1", {"score": 3})
+
+
+def test_collect_results_leaves_out_companies_with_unfinished_tasks(queue):
+    queue.enqueue("acme", {"name": "Acme"}, "Founder Edge")
+    queue.enqueue("acme", {"name": "Acme"}, "Novel Wedge")
+    queue.enqueue("beta", {"name": "Beta"}, "Founder Edge")
+    for _ in range(2):
+        task = queue.claim("worker-1")
+        queue.complete(task["id"], "worker-1", {"score": 4, "rationale": "good"})
+
+    companies = collect_results(queue)
+    assert list(companies) == ["acme"]
+    assert companies["acme"]["results"]["Overall"]["score"] == 4
+
+
+def test_task_whose_lease_keeps_expiring_is_dead_lettered(queue):
+    queue.enqueue("poison", {"name": "Poison"})
+    for attempt in range(1, queue.max_attempts + 1):
+        task = queue.claim(f"worker-{attempt}")
+        assert task["attempt"] == attempt
+        time.sleep(0.2)
+
+    assert queue.claim("worker-next") is None
+    assert queue.counts()["failed"] == 1
+    [task] = queue.iter_tasks()
+    assert task["error"] == f"lease expired after {queue.max_attempts} attempts"
@@ -0,0 +1,211 @@
+from typing import Dict, Any, Callable, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# While a circuit is open, calls either fail fast so evaluation continues
+# without that backend ("degrade"), or wait for it to recover ("pause")
+CIRCUIT_POLICIES = ("degrade", "pause")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose circuit is open"""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around an external client (search, LLM).
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are rejected immediately. Once reset_timeout seconds have passed, a single
+    half-open probe is let through: success closes the circuit, failure opens
+    it again for another reset_timeout. Under the "pause" policy rejected
+    calls wait for the circuit to close instead (up to max_pause seconds).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        policy: str = "degrade",
+        max_pause: float = 1800.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.policy = policy
+        self.max_pause = max_pause
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.stats = {"opened": 0, "fast_failures": 0, "probes": 0, "paused_seconds": 0.0}
+
+    def configure(self, failure_threshold: int, reset_timeout: float, policy: str, max_pause: float) -> None:
+        if policy not in CIRCUIT_POLICIES:
+            raise ValueError(f"Unknown circuit policy: {policy}")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.policy = policy
+        self.max_pause = max_pause
+
+    def is_open(self) -> bool:
+        """Whether a call made now would be rejected"""
+        with self._lock:
+            if self.state == OPEN:
+                return time.time() - self._opened_at < self.reset_timeout
+            return self.state == HALF_OPEN and self._probe_in_flight
+
+    def is_closed(self) -> bool:
+        """Whether the circuit is fully closed (not open, nor half-open awaiting a probe)"""
+        with self._lock:
+            return self.state == CLOSED
+
+    def wait_until_closed(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a call would be let through again (the reset timeout has
+        passed, or a probe in flight has resolved), for at most max_pause or
+        timeout seconds. Returns whether a call would now be let through.
+        """
+        limit = self.max_pause if timeout is None else min(timeout, self.max_pause)
+        start = time.time()
+        while self.is_open():
+            elapsed = time.time() - start
+            if elapsed >= limit:
+                return False
+            with self._lock:
+                wait_seconds = self._opened_at + self.reset_timeout - time.time() if self.state == OPEN else 0.0
+                wait_seconds = min(max(0.05, wait_seconds), 5.0, limit - elapsed)
+                self.stats["paused_seconds"] += wait_seconds
+            time.sleep(wait_seconds)
+        return True
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.time() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self.stats["probes"] += 1
+                logger.info(f"Circuit '{self.name}' half-open, sending a probe request")
+                return
+            self.stats["fast_failures"] += 1
+        raise CircuitOpenError(f"Circuit '{self.name}' is open after {self.failure_threshold} consecutive failures")
+
+    def _acquire(self) -> None:
+        pause_start = time.time()
+        while True:
+            try:
+                self._before_call()
+                return
+            except CircuitOpenError:
+                if self.policy != "pause" or time.time() - pause_start >= self.max_pause:
+                    raise
+            with self._lock:
+                wait_seconds = max(0.5, self._opened_at + self.reset_timeout - time.time())
+                self.stats["paused_seconds"] += min(wait_seconds, 5.0)
+            time.sleep(min(wait_seconds, 5.0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit '{self.name}' closed again")
+            self.state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self.state = OPEN
+                self._opened_at = time.time()
+                self._probe_in_flight = False
+                self.stats["opened"] += 1
+                logger.warning(
+                    f"Circuit '{self.name}' opened after {self._failures} consecutive failures, "
+                    f"{'pausing' if self.policy == 'pause' else 'failing fast'} for {self.reset_timeout:.0f}s"
+                )
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call fn through the breaker, recording its success or failure"""
+        self._acquire()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "policy": self.policy, **self.stats}
+
+
+class CircuitBreakerGroup:
+    """
+    One circuit breaker per key (e.g. per model), sharing the same settings,
+    so an outage of one model does not fail fast calls to another.
+    """
+
+    def __init__(self, name: str, **settings: Any):
+        self.name = name
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_key(self, key: str) -> CircuitBreaker:
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(f"{self.name} {key}", **self.settings)
+            return self._breakers[key]
+
+    def configure(self, failure_threshold: int, reset_timeout: float, policy: str, max_pause: float) -> None:
+        with self._lock:
+            self.settings = {
+                "failure_threshold": failure_threshold,
+                "reset_timeout": reset_timeout,
+                "policy": policy,
+                "max_pause": max_pause
+            }
+            breakers = list(self._breakers.values())
+        for breaker in breakers:
+            breaker.configure(failure_threshold, reset_timeout, policy, max_pause)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.report() for breaker in breakers}
+
+
+search_breaker = CircuitBreaker("search")
+# Keyed by model name, so the cascade model and llm_model trip independently
+llm_breakers = CircuitBreakerGroup("llm")
+
+
+def configure_circuit_breakers(
+    failure_threshold: int = 5,
+    reset_timeout: float = 60.0,
+    policy: str = "degrade",
+    max_pause: float = 1800.0
+) -> None:
+    """Apply the same breaker settings to the search circuit and every LLM model's circuit"""
+    for breaker in (search_breaker, llm_breakers):
+        breaker.configure(failure_threshold, reset_timeout, policy, max_pause)
+
+
+def circuit_report() -> Dict[str, Dict[str, Any]]:
+    return {"search": search_breaker.report(), **llm_breakers.report()}
@@ -0,0 +1,211 @@
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+from pathlib import Path
+import json
+import logging
+import mmap
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+JSONL_EXTENSIONS = {".jsonl", ".ndjson"}
+INDEX_SUFFIX = ".offsets.json"
+
+# Structural tokens of a JSON document. Escape pairs are matched first so an
+# escaped quote never toggles string state.
+_JSON_TOKEN = re.compile(rb'\\.|["{}\[\]]', re.DOTALL)
+
+
+def index_path_for(dump_path: str) -> Path:
+    """Where the offset index of a dump is stored"""
+    return Path(f"{dump_path}{INDEX_SUFFIX}")
+
+
+def _scan_jsonl(buffer: Any) -> List[Tuple[int, int]]:
+    offsets = []
+    start = 0
+    size = len(buffer)
+    while start < size:
+        end = buffer.find(b"\n", start)
+        if end == -1:
+            end = size
+        if buffer[start:end].strip():
+            offsets.append((start, end - start))
+        start = end + 1
+    return offsets
+
+
+def _scan_json(buffer: Any) -> List[Tuple[int, int]]:
+    """
+    Find the byte range of every company record in a JSON dump.
+
+    Records are the objects inside a top-level array, or inside the "data"
+    array of a PeopleDataLabs response object.
+    """
+    offsets = []
+    stack: List[bytes] = []
+    in_string = False
+    string_start = 0
+    last_top_key = None
+    records_depth = None
+    record_start = None
+
+    for match in _JSON_TOKEN.finditer(buffer):
+        token = match.group()
+        position = match.start()
+        if token.startswith(b"\\"):
+            continue
+        if token == b'"':
+            if in_string:
+                in_string = False
+                if stack == [b"{"]:
+                    last_top_key = buffer[string_start:position + 1]
+            else:
+                in_string = True
+                string_start = position
+            continue
+        if in_string:
+            continue
+
+        if token in (b"{", b"["):
+            if not stack and token == b"[":
+                records_depth = 1
+            elif token == b"[" and stack == [b"{"] and last_top_key == b'"data"':
+                records_depth = 2
+            if token == b"{" and records_depth is not None and len(stack) == records_depth:
+                record_start = position
+            stack.append(token)
+        else:
+            stack.pop()
+            if token == b"}" and record_start is not None and len(stack) == records_depth:
+                offsets.append((record_start, position + 1 - record_start))
+                record_start = None
+            elif token == b"]" and records_depth is not None and len(stack) == records_depth - 1:
+                records_depth = None
+
+    return offsets
+
+
+def build_offset_index(dump_path: str) -> List[Tuple[int, int]]:
+    """
+    Record the byte offset and length of every company in a JSON or JSONL dump.
+
+    The file is memory-mapped and scanned for structure only, records are not parsed.
+    """
+    with open(dump_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if Path(dump_path).suffix.lower() in JSONL_EXTENSIONS:
+                return _scan_jsonl(buffer)
+            return _scan_json(buffer)
+
+
+def load_offset_index(dump_path: str, rebuild: bool = False) -> List[Tuple[int, int]]:
+    """
+    Load the offset index of a dump, building and saving it when missing or stale.
+
+    The index is stored next to the dump and is invalidated when the dump's
+    size or modification time changes.
+    """
+    stat = os.stat(dump_path)
+    index_path = index_path_for(dump_path)
+    if not rebuild and index_path.exists():
+        try:
+            with open(index_path, "r") as f:
+                stored = json.load(f)
+            if stored.get("size") == stat.st_size and stored.get("mtime") == stat.st_mtime:
+                return [tuple(entry) for entry in stored["records"]]
+            logger.info(f"Offset index for {dump_path} is stale, rebuilding")
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.warning(f"Could not read offset index {index_path}: {str(e)}")
+
+    offsets = build_offset_index(dump_path)
+    try:
+        with open(index_path, "w") as f:
+            json.dump({"size": stat.st_size, "mtime": stat.st_mtime, "records": offsets}, f)
+        logger.info(f"Indexed {len(offsets)} records of {dump_path} into {index_path}")
+    except OSError as e:
+        logger.warning(f"Could not save offset index {index_path}: {str(e)}")
+    return offsets
+
+
+class CompanyDumpReader:
+    """
+    Random access to the records of a large company dump.
+
+    The dump is memory-mapped and each record is parsed only when it is read,
+    so a machine working on one slice never loads the rest of the file.
+    """
+
+    def __init__(self, dump_path: str, rebuild_index: bool = False):
+        self.dump_path = dump_path
+        self.offsets = load_offset_index(dump_path, rebuild=rebuild_index)
+        self._file = open(dump_path, "rb")
+        self._buffer = None
+        if self.offsets:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def read(self, position: int) -> Dict[str, Any]:
+        """Parse and return the record at the given position"""
+        offset, length = self.offsets[position]
+        return json.loads(self._buffer[offset:offset + length])
+
+    def iter_records(self, positions: Optional[List[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the records at the given positions (default: all), in order"""
+        for position in (range(len(self)) if positions is None else positions):
+            yield self.read(position)
+
+    def close(self) -> None:
+        if self._buffer is not None:
+            self._buffer.close()
+        self._file.close()
+
+    def __enter__(self) -> "CompanyDumpReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def parse_slice(value: str) -> slice:
+    """Parse an "a:b" command-line slice (either side may be empty)"""
+    parts = value.split(":")
+    if len(parts) != 2:
+        raise ValueError(f"Expected a slice like 2:12, got '{value}'")
+    start, stop = (int(part) if part.strip() else None for part in parts)
+    return slice(start, stop)
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse an "i/N" command-line shard spec, with 0 <= i < N"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Expected a shard like 0/4, got '{value}'")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must satisfy 0 <= i < N, got '{value}'")
+    return index, count
+
+
+def select_positions(
+    total: int,
+    record_slice: Optional[slice] = None,
+    shard: Optional[Tuple[int, int]] = None
+) -> List[int]:
+    """
+    Deterministically pick record positions: the slice is applied first, then
+    the selection is cut into N contiguous shards and shard i is returned.
+    """
+    positions = list(range(total))
+    if record_slice is not None:
+        positions = positions[record_slice]
+    if shard is not None:
+        index, count = shard
+        start = len(positions) * index // count
+        stop = len(positions) * (index + 1) // count
+        positions = positions[start:stop]
+    return positions
@@ -0,0 +1,58 @@
+from typing import Dict, Any, Iterable, Iterator, Tuple
+from collections.abc import Mapping
+from functools import lru_cache
+
+
+class CompanyRecord(Mapping):
+    """
+    Compact, read-only view of a company holding only the projected fields.
+
+    Concrete subclasses are generated per field set by record_type and store
+    each field in a slot, so no per-record __dict__ is allocated. Fields that
+    were missing from the source record stay missing (get() returns the default).
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _slot_names: Dict[str, str] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self._slot_names.get(key)
+        if slot is None:
+            raise KeyError(key)
+        try:
+            return getattr(self, slot)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self._fields:
+            if hasattr(self, self._slot_names[field]):
+                yield field
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+@lru_cache(maxsize=None)
+def record_type(fields: Tuple[str, ...]) -> type:
+    """Build (once per field set) a slotted CompanyRecord subclass for the given fields"""
+    fields = tuple(sorted(set(fields)))
+    # Prefix slot names so field names can never shadow Mapping methods
+    slot_names = {field: f"_f_{index}" for index, field in enumerate(fields)}
+    return type("ProjectedCompanyRecord", (CompanyRecord,), {
+        "__slots__": tuple(slot_names.values()),
+        "_fields": fields,
+        "_slot_names": slot_names
+    })
+
+
+def project_record(company_data: Dict[str, Any], fields: Iterable[str]) -> CompanyRecord:
+    """Copy only the given fields of a company into a compact record"""
+    record = record_type(tuple(sorted(set(fields))))()
+    for field, slot in record._slot_names.items():
+        if field in company_data:
+            object.__setattr__(record, slot, company_data[field])
+    return record
@@ -0,0 +1,103 @@
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Iterable, Optional
+import threading
+import time
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when work is abandoned because its deadline passed. future is the
+    abandoned call when it is still running in the background.
+    """
+
+    def __init__(self, message: str, future: Optional[Future] = None):
+        super().__init__(message)
+        self.future = future
+
+
+class Deadline:
+    """
+    A wall-clock point in time after which outstanding work is abandoned.
+
+    A deadline of None seconds never expires, so callers can pass one around
+    unconditionally.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, label: str = "deadline", start: Optional[float] = None):
+        self.seconds = seconds
+        self.label = label
+        self.expires_at = (start or time.time()) + seconds if seconds is not None else None
+
+    @classmethod
+    def earliest(cls, *deadlines: Optional["Deadline"]) -> "Deadline":
+        """Whichever of the deadlines expires first (a never-expiring one if none is set)"""
+        bounded = [d for d in deadlines if d is not None and d.expires_at is not None]
+        return min(bounded, key=lambda d: d.expires_at) if bounded else cls()
+
+    @property
+    def bounded(self) -> bool:
+        return self.expires_at is not None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None for a deadline that never expires"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+    def cap(self, timeout: Optional[float]) -> Optional[float]:
+        """The smaller of timeout and the time remaining"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+def call_with_deadline(deadline: Optional[Deadline], fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+    """
+    Run fn in its own thread and stop waiting for it once the deadline passes.
+
+    Threads cannot be killed, so a call still running at the deadline is
+    abandoned: its result is discarded when it eventually returns (request
+    timeouts bound how long that takes). Resources the call uses must stay
+    open until it does; see when_done.
+
+    Raises:
+        DeadlineExceeded: If the deadline passed before fn returned, carrying
+            the abandoned call's future
+    """
+    if deadline is None or not deadline.bounded:
+        return fn(*args, **kwargs)
+    if deadline.expired():
+        raise DeadlineExceeded(f"{deadline.label} of {deadline.seconds:g}s expired")
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(fn, *args, **kwargs)
+    try:
+        return future.result(timeout=deadline.remaining())
+    except FutureTimeoutError:
+        raise DeadlineExceeded(f"{deadline.label} of {deadline.seconds:g}s expired", future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def when_done(futures: Iterable[Future], callback: Callable[[], None]) -> None:
+    """Run callback once every future has finished: straight away, or from the thread finishing the last one"""
+    pending = [future for future in futures if not future.done()]
+    if not pending:
+        callback()
+        return
+    lock = threading.Lock()
+    remaining = [len(pending)]
+
+    def finished(_: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            callback()
+
+    for future in pending:
+        future.add_done_callback(finished)
@@ -0,0 +1,181 @@
+from typing import Dict, Any, List, Tuple, Iterable
+import ast
+import logging
+import re
+
+from tools.tokenizer import count_tokens, truncate_to_tokens, DEFAULT_MODEL
+
+logger = logging.getLogger(__name__)
+
+# Words that carry no signal when matching snippets against a dimension
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in",
+    "is", "it", "its", "of", "on", "or", "that", "the", "to", "was", "with"
+}
+
+EMPTY_RESULT_MARKERS = {"no good search result found"}
+
+# A snippet that does not fit is cut to the remaining budget when at least
+# this many tokens are left; smaller remainders go to later, shorter snippets
+MIN_TRUNCATED_SNIPPET_TOKENS = 30
+# Room for the bullet, newline and ellipsis around a truncated snippet
+TRUNCATION_OVERHEAD_TOKENS = 4
+
+
+def tokenize_terms(text: str) -> List[str]:
+    """Lowercase word tokens used for relevance matching"""
+    return [term for term in re.findall(r"[a-z0-9]+", text.lower()) if term not in STOP_WORDS]
+
+
+def normalize_snippet(snippet: str) -> str:
+    """Normalize a snippet so trivially different copies compare equal"""
+    return " ".join(re.findall(r"[a-z0-9]+", snippet.lower()))
+
+
+def split_snippets(raw_results: Any) -> List[str]:
+    """
+    Split a raw search response into individual snippets.
+
+    SerpAPIWrapper.run returns either a plain answer string or the str() of a
+    list of snippets, so both shapes are handled here.
+    """
+    if raw_results is None:
+        return []
+    if isinstance(raw_results, (list, tuple)):
+        items = list(raw_results)
+    else:
+        text = str(raw_results).strip()
+        items = [text]
+        if text.startswith("[") and text.endswith("]"):
+            try:
+                parsed = ast.literal_eval(text)
+                if isinstance(parsed, list):
+                    items = parsed
+            except (ValueError, SyntaxError):
+                pass
+
+    snippets = []
+    for item in items:
+        snippet = item if isinstance(item, str) else str(item)
+        snippet = snippet.strip()
+        if snippet and snippet.lower() not in EMPTY_RESULT_MARKERS:
+            snippets.append(snippet)
+    return snippets
+
+
+def score_snippet(snippet: str, relevance_terms: Iterable[str]) -> float:
+    """Fraction of the dimension's relevance terms that appear in the snippet"""
+    terms = set(relevance_terms)
+    if not terms:
+        return 0.0
+    snippet_terms = set(tokenize_terms(snippet))
+    return len(terms & snippet_terms) / len(terms)
+
+
+def pack_evidence(
+    results: List[Tuple[str, Any]],
+    relevance_terms: Iterable[str],
+    token_budget: int,
+    model: str = DEFAULT_MODEL,
+    label: str = ""
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Dedupe, rank and pack search snippets into a token budget.
+
+    Snippets are taken best first. The first one that does not fit whole is
+    truncated to fill the rest of the budget, unless fewer than
+    MIN_TRUNCATED_SNIPPET_TOKENS remain, in which case shorter snippets
+    further down the ranking may still fit.
+
+    Args:
+        results: (query, raw search response) pairs in the order they were issued
+        relevance_terms: Terms describing the dimension being evaluated
+        token_budget: Maximum number of tokens the packed evidence may use
+        model: Model whose tokenizer is used for counting
+        label: Prefix for log messages (usually the dimension name)
+
+    Returns:
+        Tuple of the packed evidence text and a stats dictionary
+    """
+    relevance_terms = list(relevance_terms)
+    seen = set()
+    candidates = []
+    duplicates = 0
+
+    for query_index, (query, raw_results) in enumerate(results):
+        for position, snippet in enumerate(split_snippets(raw_results)):
+            key = normalize_snippet(snippet)
+            if not key or key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            candidates.append({
+                "query": query,
+                "query_index": query_index,
+                "position": position,
+                "text": snippet,
+                "score": score_snippet(snippet, relevance_terms),
+                # Each snippet is rendered as a bullet line
+                "tokens": count_tokens(f"- {snippet}\n", model)
+            })
+
+    # Highest relevance first; earlier queries and higher SERP positions break ties
+    ranked = sorted(candidates, key=lambda c: (-c["score"], c["query_index"], c["position"]))
+
+    kept = []
+    dropped = []
+    truncated = 0
+    used_tokens = 0
+    for candidate in ranked:
+        remaining = token_budget - used_tokens
+        if candidate["tokens"] <= remaining:
+            kept.append(candidate)
+            used_tokens += candidate["tokens"]
+        elif remaining >= MIN_TRUNCATED_SNIPPET_TOKENS:
+            text = truncate_to_tokens(candidate["text"], remaining - TRUNCATION_OVERHEAD_TOKENS, model).rstrip() + "..."
+            tokens = count_tokens(f"- {text}\n", model)
+            if tokens > remaining:
+                dropped.append(candidate)
+                continue
+            kept.append({**candidate, "text": text, "tokens": tokens})
+            used_tokens += tokens
+            truncated += 1
+        else:
+            dropped.append(candidate)
+
+    prefix = f"[{label}] " if label else ""
+    if duplicates:
+        logger.info(f"{prefix}Dropped {duplicates} duplicate snippets across {len(results)} queries")
+    if dropped:
+        dropped_tokens = sum(c["tokens"] for c in dropped)
+        logger.info(
+            f"{prefix}Dropped {len(dropped)} snippets ({dropped_tokens} tokens) "
+            f"to fit evidence budget of {token_budget} tokens"
+        )
+        for candidate in dropped:
+            logger.debug(
+                f"{prefix}Dropped snippet from '{candidate['query']}' "
+                f"(score {candidate['score']:.2f}, {candidate['tokens']} tokens): {candidate['text'][:100]}"
+            )
+
+    # Present kept snippets grouped under the query that produced them
+    sections = []
+    for query_index, (query, _) in enumerate(results):
+        group = sorted(
+            (c for c in kept if c["query_index"] == query_index),
+            key=lambda c: (-c["score"], c["position"])
+        )
+        if group:
+            lines = "\n".join(f"- {c['text']}" for c in group)
+            sections.append(f"Search results for '{query}':\n{lines}")
+
+    stats = {
+        "snippets_total": len(candidates) + duplicates,
+        "snippets_kept": len(kept),
+        "snippets_dropped": len(dropped),
+        "snippets_truncated": truncated,
+        "duplicates_dropped": duplicates,
+        "evidence_tokens": used_tokens,
+        "token_budget": token_budget
+    }
+    return "\n\n".join(sections), stats
@@ -0,0 +1,207 @@
+from typing import Dict, Any, List, Optional, Tuple
+from pathlib import Path
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+from tools.evidence_packer import split_snippets
+from tools.metrics import cache_lookup
+
+logger = logging.getLogger(__name__)
+
+FOUNDER_CACHE_PATH = Path("cache") / "founders.sqlite"
+# Founder backgrounds change slowly; re-search a person after this many seconds
+DEFAULT_PROFILE_TTL = 30 * 24 * 3600
+
+_LINKEDIN_PROFILE = re.compile(r"linkedin\.com/in/([A-Za-z0-9\-_%]+)", re.IGNORECASE)
+_NAME = r"([A-Z][a-z]+(?:[ \-][A-Z][a-z]+){1,2})"
+_ROLE = r"(?:co-?founder|founder|ceo|cto|chief executive officer|chief technology officer)"
+# "founded by Jane Doe and John Roe", "Co-founder & CEO Jane Doe", "Jane Doe, co-founder", "Jane Doe - CEO"
+_FOUNDER_PATTERNS = [
+    re.compile(r"(?i:founded by)\s+" + _NAME + r"(?:\s*(?:,|and|&)\s*" + _NAME + r")?"),
+    re.compile(r"(?i:" + _ROLE + r")(?:\s*(?:&|and)\s*(?i:" + _ROLE + r"))?[\s,:]+" + _NAME),
+    re.compile(_NAME + r"\s*[,\-|]?\s+(?:(?i:the|is|a|is the|is a)\s+)?(?i:" + _ROLE + r")")
+]
+# Capitalised words the patterns pick up that are not person names
+_NOT_NAMES = {"the", "our", "its", "their", "and", "company", "team", "startup", "linkedin", "ceo", "cto", "founder"}
+
+
+def normalize_person_name(name: Any) -> str:
+    """Lowercase name with punctuation and extra whitespace removed"""
+    if not name or not isinstance(name, str):
+        return ""
+    return " ".join(re.sub(r"[^\w\s]", " ", name.lower()).split())
+
+
+def normalize_linkedin_profile(url: Any) -> str:
+    """linkedin.com/in/<slug> form of a LinkedIn profile URL, or "" if it is not one"""
+    if not url or not isinstance(url, str):
+        return ""
+    match = _LINKEDIN_PROFILE.search(url)
+    return f"linkedin.com/in/{match.group(1).lower().rstrip('/')}" if match else ""
+
+
+def person_keys(name: Any, linkedin_url: Any = None) -> List[str]:
+    """Cache keys of a person, most specific first"""
+    keys = []
+    if normalize_linkedin_profile(linkedin_url):
+        keys.append(f"linkedin:{normalize_linkedin_profile(linkedin_url)}")
+    if normalize_person_name(name):
+        keys.append(f"name:{normalize_person_name(name)}")
+    return keys
+
+
+def extract_founders(search_results: List[Any], company_name: str = "", limit: int = 3) -> List[Dict[str, str]]:
+    """
+    Find the founders/executives named in a company's search results.
+
+    Names next to founder or CEO/CTO wording are counted across all snippets
+    and returned most-mentioned first. A LinkedIn profile URL whose slug
+    matches a name is attached to it.
+
+    Returns:
+        Up to limit people as {"name": ..., "linkedin_url": ...}
+    """
+    company_words = set(normalize_person_name(company_name).split())
+    counts: Dict[str, int] = {}
+    names: Dict[str, str] = {}
+    profiles: List[str] = []
+    for result in search_results:
+        for snippet in split_snippets(result):
+            profiles += [normalize_linkedin_profile(match.group(0)) for match in _LINKEDIN_PROFILE.finditer(snippet)]
+            for pattern in _FOUNDER_PATTERNS:
+                for match in pattern.finditer(snippet):
+                    for name in filter(None, match.groups()):
+                        key = normalize_person_name(name)
+                        words = set(key.split())
+                        if not key or words & _NOT_NAMES or words <= company_words:
+                            continue
+                        counts[key] = counts.get(key, 0) + 1
+                        names.setdefault(key, name)
+
+    founders = []
+    for key in sorted(counts, key=lambda k: -counts[k])[:limit]:
+        slug_words = [set(re.split(r"[-_]", profile.rsplit("/", 1)[-1])) for profile in profiles]
+        linkedin_url = next((p for p, words in zip(profiles, slug_words) if set(key.split()) <= words), "")
+        founders.append({"name": names[key], "linkedin_url": linkedin_url})
+    return founders
+
+
+class FounderCache:
+    """
+    Person-level cache of founder background evidence, shared across companies.
+
+    A profile holds the search snippets gathered about one person and is
+    stored under both their LinkedIn profile URL and their normalized name, so
+    a lookup by either finds it. The LinkedIn profile is the stronger identity:
+    a name that belongs to a person with a different LinkedIn profile is
+    someone else, and is never used to find or merge a profile. Profiles older
+    than the TTL are treated as missing. Backed by SQLite, so it persists
+    across runs and processes.
+    """
+
+    def __init__(self, path: Any = FOUNDER_CACHE_PATH):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened on first use so importing the module creates no files
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS profiles (person_key TEXT PRIMARY KEY, profile TEXT, fetched_at REAL)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS person_keys (lookup_key TEXT PRIMARY KEY, person_key TEXT)")
+            self._conn.commit()
+        return self._conn
+
+    def _lookup(self, conn: sqlite3.Connection, key: str, linkedin: str) -> Optional[Tuple[str, Dict[str, Any], float]]:
+        """(person key, profile, fetched_at) stored under a lookup key, unless it is a different LinkedIn profile"""
+        row = conn.execute(
+            "SELECT k.person_key, p.profile, p.fetched_at FROM person_keys k JOIN profiles p ON p.person_key = k.person_key "
+            "WHERE k.lookup_key = ?",
+            (key,)
+        ).fetchone()
+        if not row:
+            return None
+        profile = json.loads(row[1])
+        # Same name, different LinkedIn profile: another person
+        if linkedin and profile.get("linkedin_url") and profile["linkedin_url"] != linkedin:
+            return None
+        return row[0], profile, row[2]
+
+    def get(self, name: Any, linkedin_url: Any = None, ttl: float = DEFAULT_PROFILE_TTL) -> Optional[Dict[str, Any]]:
+        """The cached profile of a person, or None if unknown or older than ttl seconds"""
+        profile = None
+        linkedin = normalize_linkedin_profile(linkedin_url)
+        with self._lock:
+            conn = self._connection()
+            for key in person_keys(name, linkedin_url):
+                found = self._lookup(conn, key, linkedin)
+                if found and time.time() - found[2] <= ttl:
+                    profile = found[1]
+                    break
+        cache_lookup("founder_profile", profile is not None)
+        return profile
+
+    def put(self, name: str, linkedin_url: Any, snippets: List[str], company: str = "") -> Dict[str, Any]:
+        """Store a freshly searched profile under every key of the person"""
+        keys = person_keys(name, linkedin_url)
+        if not keys:
+            raise ValueError("A founder profile needs a name or LinkedIn URL")
+        linkedin = normalize_linkedin_profile(linkedin_url)
+        with self._lock:
+            conn = self._connection()
+            # Keep the identity of a person already known under one of the keys
+            found = None
+            for key in keys:
+                found = self._lookup(conn, key, linkedin)
+                if found:
+                    break
+            person_key = found[0] if found else keys[0]
+            previous = conn.execute("SELECT profile FROM profiles WHERE person_key = ?", (person_key,)).fetchone()
+            companies = json.loads(previous[0]).get("companies", []) if previous else []
+            profile = {
+                "name": name,
+                "linkedin_url": normalize_linkedin_profile(linkedin_url),
+                "snippets": list(dict.fromkeys(snippets)),
+                "companies": list(dict.fromkeys(companies + ([company] if company else []))),
+                "fetched_at": time.time()
+            }
+            conn.execute(
+                "INSERT OR REPLACE INTO profiles (person_key, profile, fetched_at) VALUES (?, ?, ?)",
+                (person_key, json.dumps(profile), profile["fetched_at"])
+            )
+            # A name already taken by a person with another LinkedIn profile stays theirs
+            owners = {
+                key: conn.execute("SELECT person_key FROM person_keys WHERE lookup_key = ?", (key,)).fetchone()
+                for key in keys
+            }
+            conn.executemany(
+                "INSERT OR REPLACE INTO person_keys (lookup_key, person_key) VALUES (?, ?)",
+                [
+                    (key, person_key) for key in keys
+                    if key.startswith("linkedin:") or owners[key] is None or owners[key][0] == person_key
+                ]
+            )
+            conn.commit()
+        return profile
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+founder_cache = FounderCache()
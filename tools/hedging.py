@@ -0,0 +1,194 @@
+from typing import Dict, Any, Callable, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, CancelledError, wait, FIRST_COMPLETED
+import logging
+import threading
+import time
+
+from tools.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _unless_settled(settled: threading.Event, fn: Callable[..., Any], *args: Any) -> Any:
+    """Run fn(*args) unless the call it duplicates has already succeeded"""
+    if settled.is_set():
+        raise CancelledError()
+    return fn(*args)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class Hedger:
+    """
+    Hedged requests for slow external calls (LLM, search).
+
+    When a call has been running longer than the configured percentile of
+    recent latencies for the same key (e.g. model or backend), a duplicate is
+    sent and whichever finishes first wins. The loser is abandoned: its result
+    is discarded and it is cancelled if it has not started yet. Duplicates are
+    capped at max_extra_ratio of all calls. Disabled until configured.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 0.95,
+        max_extra_ratio: float = 0.1,
+        min_samples: int = 20,
+        window: int = 200,
+        max_workers: int = 64
+    ):
+        self.name = name
+        self.enabled = False
+        self.percentile = percentile
+        self.max_extra_ratio = max_extra_ratio
+        self.min_samples = min_samples
+        self.window = window
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._latencies: Dict[str, deque] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def configure(self, enabled: bool = True, percentile: Optional[float] = None, max_extra_ratio: Optional[float] = None) -> None:
+        self.enabled = enabled
+        if percentile is not None:
+            self.percentile = percentile
+        if max_extra_ratio is not None:
+            self.max_extra_ratio = max_extra_ratio
+
+    def _key_stats(self, key: str) -> Dict[str, Any]:
+        return self._stats.setdefault(key, {
+            "calls": 0, "hedged": 0, "hedge_wins": 0, "latencies": [], "primary_latencies": []
+        })
+
+    def _record(self, key: str, latency: float, primary_latency: Optional[float] = None) -> None:
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=self.window)).append(latency)
+            stats = self._key_stats(key)
+            stats["latencies"].append(latency)
+            if primary_latency is not None:
+                stats["primary_latencies"].append(primary_latency)
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Seconds to wait before hedging a call, or None if it should not be hedged"""
+        with self._lock:
+            recent = list(self._latencies.get(key, ()))
+            stats = self._key_stats(key)
+            if len(recent) < self.min_samples:
+                return None
+            if stats["hedged"] >= self.max_extra_ratio * stats["calls"]:
+                return None
+        return _percentile(recent, self.percentile)
+
+    def call(self, fn: Callable[..., Any], *args: Any, key: str = "default") -> Any:
+        """Run fn(*args), hedging it when it runs past the latency percentile"""
+        start_time = time.time()
+        with self._lock:
+            self._key_stats(key)["calls"] += 1
+        delay = self.hedge_delay(key) if self.enabled else None
+        if delay is None:
+            result = fn(*args)
+            self._record(key, time.time() - start_time, time.time() - start_time)
+            return result
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"hedge-{self.name}")
+            executor = self._executor
+
+        primary = executor.submit(fn, *args)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            latency = time.time() - start_time
+            self._record(key, latency, latency)
+            return primary.result()
+
+        with self._lock:
+            # Re-check the cap now that the call has actually stalled
+            stats = self._key_stats(key)
+            allowed = stats["hedged"] < self.max_extra_ratio * stats["calls"]
+            if allowed:
+                stats["hedged"] += 1
+        if not allowed:
+            result = primary.result()
+            latency = time.time() - start_time
+            self._record(key, latency, latency)
+            return result
+
+        logger.info(f"Hedging slow {self.name} call ({key}) after {delay:.2f}s")
+        metrics.inc("echo_retries_total", kind=f"hedge_{self.name}")
+        # A worker can dequeue the hedge before the loser is cancelled below, so
+        # the hedge also checks, when it starts, whether the primary has succeeded
+        settled = threading.Event()
+        primary.add_done_callback(lambda f: f.cancelled() or f.exception() is not None or settled.set())
+        hedge = executor.submit(_unless_settled, settled, fn, *args)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                latency = time.time() - start_time
+                if future is hedge:
+                    with self._lock:
+                        self._key_stats(key)["hedge_wins"] += 1
+                # How long the call would have taken without the hedge, once the primary finishes
+                primary.add_done_callback(
+                    lambda f: f.cancelled() or self._record_primary(key, time.time() - start_time)
+                )
+                self._record(key, latency)
+                return future.result()
+        raise error
+
+    def _record_primary(self, key: str, primary_latency: float) -> None:
+        with self._lock:
+            self._key_stats(key)["primary_latencies"].append(primary_latency)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per key: hedge rate, wins, and tail latency with hedging vs the primary requests alone"""
+        report = {}
+        with self._lock:
+            for key, stats in self._stats.items():
+                if not stats["calls"]:
+                    continue
+                latencies = stats["latencies"] or [0.0]
+                primary_latencies = stats["primary_latencies"] or [0.0]
+                p95 = _percentile(latencies, 0.95)
+                primary_p95 = _percentile(primary_latencies, 0.95)
+                report[key] = {
+                    "calls": stats["calls"],
+                    "hedged": stats["hedged"],
+                    "hedge_rate": round(stats["hedged"] / stats["calls"], 3),
+                    "hedge_wins": stats["hedge_wins"],
+                    "p50_seconds": round(_percentile(latencies, 0.5), 3),
+                    "p95_seconds": round(p95, 3),
+                    "p99_seconds": round(_percentile(latencies, 0.99), 3),
+                    "unhedged_p95_seconds": round(primary_p95, 3),
+                    "p95_improvement_seconds": round(primary_p95 - p95, 3)
+                }
+        return report
+
+
+llm_hedger = Hedger("llm")
+search_hedger = Hedger("search")
+
+
+def configure_hedging(percentile: float, max_extra_ratio: float = 0.1, llm: bool = True, search: bool = True) -> None:
+    """Enable hedging of LLM and/or search calls for the rest of the run"""
+    llm_hedger.configure(enabled=llm, percentile=percentile, max_extra_ratio=max_extra_ratio)
+    search_hedger.configure(enabled=search, percentile=percentile, max_extra_ratio=max_extra_ratio)
+    logger.info(f"Hedging {'LLM ' if llm else ''}{'search ' if search else ''}calls past p{percentile * 100:g}")
+
+
+def hedging_report() -> Dict[str, Dict[str, Any]]:
+    return {"llm": llm_hedger.report(), "search": search_hedger.report()}
@@ -0,0 +1,250 @@
+from typing import Dict, Any, Iterator, List, Optional, TextIO, Tuple
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the dimension latency histogram buckets
+LATENCY_BUCKETS = (1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+# name: (type, help) of every metric the pipeline reports
+METRICS = {
+    "echo_companies_total": ("gauge", "Companies selected for full evaluation in this run"),
+    "echo_companies_completed_total": ("counter", "Companies whose evaluation finished"),
+    "echo_companies_failed_total": ("counter", "Companies whose evaluation failed"),
+    "echo_companies_per_minute": ("gauge", "Companies completed per minute since the run started"),
+    "echo_eta_seconds": ("gauge", "Estimated seconds until every selected company is evaluated"),
+    "echo_llm_in_flight": ("gauge", "LLM requests currently running"),
+    "echo_llm_calls_total": ("counter", "LLM requests sent"),
+    "echo_llm_errors_total": ("counter", "LLM requests that raised"),
+    "echo_llm_tokens_total": ("counter", "Tokens sent to (prompt) and received from (completion) the LLM"),
+    "echo_search_in_flight": ("gauge", "Search requests currently running"),
+    "echo_search_calls_total": ("counter", "Search requests sent"),
+    "echo_search_errors_total": ("counter", "Search requests that raised"),
+    "echo_dimension_latency_seconds": ("histogram", "Wall time of one dimension evaluation"),
+    "echo_dimension_errors_total": ("counter", "Dimension evaluations that failed"),
+    "echo_dimension_timeouts_total": ("counter", "Dimension evaluations abandoned at their deadline"),
+    "echo_cache_requests_total": ("counter", "Cache lookups by cache and result (hit or miss)"),
+    "echo_retries_total": ("counter", "Repeated work: hedged requests, requeued tasks, retried sink batches"),
+    "echo_sink_rows_dropped_total": ("counter", "Result rows an output sink dropped because its buffer was full")
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = [(name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for name, value in pairs]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters, gauges and histograms for one process, rendered in
+    the Prometheus text exposition format. Every metric must be declared in
+    METRICS; each distinct label set is its own series.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Dict[str, Any]]] = {}
+        self.started_at = time.time()
+
+    def _check(self, name: str, *kinds: str) -> None:
+        if name not in METRICS or METRICS[name][0] not in kinds:
+            raise ValueError(f"Unknown {'/'.join(kinds)} metric: {name}")
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Add to a counter (or a gauge, when value is negative too)"""
+        self._check(name, "counter", "gauge")
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            key = _labels(labels)
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        self._check(name, "gauge")
+        with self._lock:
+            self._values.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        self._check(name, "histogram")
+        with self._lock:
+            histogram = self._histograms.setdefault(name, {}).setdefault(
+                _labels(labels), {"buckets": [0] * len(LATENCY_BUCKETS), "count": 0, "sum": 0.0}
+            )
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["count"] += 1
+            histogram["sum"] += value
+
+    @contextmanager
+    def in_flight(self, name: str, **labels: Any) -> Iterator[None]:
+        """Count a call in a gauge for as long as it runs"""
+        self.inc(name, 1, **labels)
+        try:
+            yield
+        finally:
+            self.inc(name, -1, **labels)
+
+    def total(self, name: str, **labels: Any) -> float:
+        """Sum of every series of a counter or gauge whose labels include the given ones"""
+        wanted = set(_labels(labels))
+        with self._lock:
+            return sum(
+                value for key, value in self._values.get(name, {}).items() if wanted <= set(key)
+            )
+
+    def start_run(self, companies: int) -> None:
+        """Reset the throughput clock for a batch of this many companies"""
+        self.started_at = time.time()
+        self.set("echo_companies_total", companies)
+
+    def update_progress(self) -> Dict[str, float]:
+        """Refresh the throughput and ETA gauges from the completed/total counts"""
+        total = self.total("echo_companies_total")
+        done = self.total("echo_companies_completed_total") + self.total("echo_companies_failed_total")
+        minutes = max((time.time() - self.started_at) / 60.0, 1e-9)
+        rate = done / minutes
+        eta = (total - done) / rate * 60.0 if rate > 0 and total > done else 0.0
+        self.set("echo_companies_per_minute", round(rate, 3))
+        self.set("echo_eta_seconds", round(eta, 1))
+        return {"total": total, "done": done, "rate": rate, "eta": eta}
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        self.update_progress()
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, help_text) in METRICS.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                if kind == "histogram":
+                    for labels, histogram in sorted(self._histograms.get(name, {}).items()):
+                        for bound, count in zip(LATENCY_BUCKETS, histogram["buckets"]):
+                            lines.append(f"{name}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {count}")
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram['count']}")
+                        lines.append(f"{name}_sum{_format_labels(labels)} {histogram['sum']:.6f}")
+                        lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+                    continue
+                for labels, value in sorted(self._values.get(name, {}).items()):
+                    lines.append(f"{name}{_format_labels(labels)} {int(value) if float(value).is_integer() else value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    """Record a hit or miss of one of the pipeline's caches"""
+    metrics.inc("echo_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve GET /metrics from a background thread for the rest of the process"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(f"{self.address_string()} - {format % args}")
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
+
+
+def _short(value: float) -> str:
+    for threshold, suffix in ((1e6, "M"), (1e3, "k")):
+        if value >= threshold:
+            return f"{value / threshold:.1f}{suffix}"
+    return f"{value:.0f}"
+
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def progress_line(registry: Optional[MetricsRegistry] = None) -> str:
+    """One-line summary of the run: progress, throughput, ETA, in-flight calls, tokens, cache, retries, errors"""
+    registry = registry or metrics
+    progress = registry.update_progress()
+    hits = registry.total("echo_cache_requests_total", result="hit")
+    lookups = registry.total("echo_cache_requests_total")
+    errors = (
+        registry.total("echo_dimension_errors_total")
+        + registry.total("echo_llm_errors_total")
+        + registry.total("echo_search_errors_total")
+    )
+    parts = [
+        f"[{progress['done']:.0f}/{progress['total']:.0f}] {progress['rate']:.1f}/min",
+        f"ETA {_duration(progress['eta']) if progress['rate'] else '?'}",
+        f"in flight: LLM {registry.total('echo_llm_in_flight'):.0f}, search {registry.total('echo_search_in_flight'):.0f}",
+        f"tokens {_short(registry.total('echo_llm_tokens_total'))}",
+        f"cache {hits / lookups:.0%}" if lookups else "cache -",
+        f"retries {registry.total('echo_retries_total'):.0f}",
+        f"errors {errors:.0f}"
+    ]
+    return " | ".join(parts)
+
+
+class ProgressView:
+    """
+    Rewrites a single progress line (see progress_line) on the terminal every
+    interval seconds while a batch runs; prints one line per interval when
+    the stream is not a terminal.
+    """
+
+    def __init__(self, interval: float = 2.0, stream: Optional[TextIO] = None, registry: Optional[MetricsRegistry] = None):
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.registry = registry or metrics
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _draw(self) -> None:
+        line = progress_line(self.registry)
+        if self.stream.isatty():
+            self.stream.write("\r\033[K" + line)
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._draw()
+
+    def start(self) -> "ProgressView":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._draw()
+        if self.stream.isatty():
+            self.stream.write("\n")
+            self.stream.flush()
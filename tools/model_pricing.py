@@ -0,0 +1,23 @@
+from typing import Dict, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens: (prompt, completion)
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int = 0) -> float:
+    """Estimated USD cost of one call; 0.0 for models without a known price"""
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        logger.warning(f"No price known for model '{model}', counting its calls as free")
+        return 0.0
+    prompt_price, completion_price = prices
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
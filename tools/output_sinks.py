@@ -0,0 +1,253 @@
+from typing import Dict, Any, List, Optional
+from abc import ABC, abstractmethod
+from pathlib import Path
+import csv
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from tools.metrics import metrics
+from tools.passage_index import company_identity
+
+logger = logging.getLogger(__name__)
+
+# Rows a sink holds while its destination keeps failing; the oldest beyond this are dropped
+DEFAULT_MAX_BUFFERED_ROWS = 10_000
+
+
+class OutputSink(ABC):
+    """
+    Destination for result rows.
+
+    write() only appends to an in-memory buffer, so evaluation workers never
+    wait on I/O. A background thread flushes the buffer in batches, whenever
+    batch_size rows are waiting or flush_interval seconds have passed. A batch
+    that fails to write stays buffered and is retried on the next flush; while
+    the destination keeps failing, at most max_buffered_rows are kept and the
+    oldest rows beyond that are dropped (counted in rows_dropped).
+    """
+    name = "base"
+
+    def __init__(self, batch_size: int = 50, flush_interval: float = 5.0, max_buffered_rows: int = DEFAULT_MAX_BUFFERED_ROWS):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_buffered_rows = max(self.batch_size, max_buffered_rows)
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._buffer.append(dict(row))
+            self._trim_buffer()
+            if len(self._buffer) >= self.batch_size:
+                self._wake.set()
+
+    def _trim_buffer(self) -> None:
+        """Drop the oldest rows beyond max_buffered_rows; call with _lock held"""
+        excess = len(self._buffer) - self.max_buffered_rows
+        if excess > 0:
+            del self._buffer[:excess]
+            self.rows_dropped += excess
+            metrics.inc("echo_sink_rows_dropped_total", excess, sink=self.name)
+            logger.error(f"Output sink '{self.name}' buffer is full, dropped the {excess} oldest rows")
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write everything buffered so far"""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            written = 0
+            try:
+                while written < len(rows):
+                    batch = rows[written:written + self.batch_size]
+                    self._write_batch(batch)
+                    written += len(batch)
+            except Exception as e:
+                logger.error(f"Output sink '{self.name}' failed to write a batch, will retry: {str(e)}")
+                metrics.inc("echo_retries_total", kind="sink_batch")
+                with self._lock:
+                    self._buffer = rows[written:] + self._buffer
+                    self._trim_buffer()
+            self.rows_written += written
+
+    def close(self) -> None:
+        """Stop the flusher and write any remaining rows"""
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        with self._lock:
+            if self._buffer:
+                logger.error(f"Output sink '{self.name}' closed with {len(self._buffer)} unwritten rows")
+        self._close()
+
+    @abstractmethod
+    def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        ...
+
+    def _close(self) -> None:
+        pass
+
+
+class CSVSink(OutputSink):
+    """Rows appended to a CSV file; the header is written when the file is created"""
+    name = "csv"
+
+    def __init__(self, path: str, fieldnames: List[str], append: bool = False, **kwargs: Any):
+        self.path = Path(path)
+        self.fieldnames = fieldnames
+        if not append or not self.path.exists():
+            with open(self.path, "w", newline="", encoding="utf-8") as f:
+                csv.DictWriter(f, fieldnames=fieldnames).writeheader()
+        super().__init__(**kwargs)
+
+    def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction="ignore").writerows(rows)
+
+
+class JSONLSink(OutputSink):
+    """Rows appended to a JSON Lines file"""
+    name = "jsonl"
+
+    def __init__(self, path: str, **kwargs: Any):
+        self.path = Path(path)
+        super().__init__(**kwargs)
+
+    def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, default=str) + "\n")
+
+
+class SQLiteSink(OutputSink):
+    """
+    Rows upserted into a SQLite table, one TEXT column per field, so re-running
+    a company replaces its row. Rows are keyed by the company's identity (see
+    company_identity) and name, so distinct companies sharing a name, and
+    duplicate records of one company, each keep their own row.
+    """
+    name = "sqlite"
+    key_field = "record_key"
+
+    def __init__(self, path: str, fieldnames: List[str], table: str = "evaluations", **kwargs: Any):
+        self.path = str(path)
+        self.fieldnames = fieldnames
+        self.table = table
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        columns = ", ".join([f'"{self.key_field}" TEXT PRIMARY KEY'] + [f'"{field}" TEXT' for field in fieldnames])
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+        self._conn.commit()
+        super().__init__(**kwargs)
+
+    def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        fields = [self.key_field] + list(self.fieldnames)
+        columns = ", ".join(f'"{field}"' for field in fields)
+        placeholders = ", ".join("?" for _ in fields)
+        values = [
+            (f"{company_identity(row)} / {row.get('name')}",)
+            + tuple(None if row.get(field) is None else str(row.get(field)) for field in self.fieldnames)
+            for row in rows
+        ]
+        self._conn.executemany(f'INSERT OR REPLACE INTO "{self.table}" ({columns}) VALUES ({placeholders})', values)
+        self._conn.commit()
+
+    def _close(self) -> None:
+        self._conn.close()
+
+
+class InMemoryWorksheet:
+    """
+    Local stand-in for a gspread Worksheet, implementing the calls
+    GoogleSheetsSink makes, for tests and dry runs without Google credentials.
+    """
+
+    def __init__(self):
+        self.rows: List[List[Any]] = []
+        self.append_calls = 0
+
+    def row_values(self, row: int) -> List[Any]:
+        return list(self.rows[row - 1]) if len(self.rows) >= row else []
+
+    def append_rows(self, values: List[List[Any]], value_input_option: str = "RAW") -> None:
+        self.append_calls += 1
+        self.rows.extend([list(row) for row in values])
+
+
+class GoogleSheetsSink(OutputSink):
+    """
+    Rows appended to a Google Sheets worksheet, one append_rows request per
+    batch to stay within the API's write quotas. Any object with gspread's
+    row_values/append_rows methods can be passed as the worksheet (e.g.
+    InMemoryWorksheet).
+    """
+    name = "sheets"
+
+    def __init__(self, worksheet: Any, fieldnames: List[str], batch_size: int = 100, flush_interval: float = 10.0, **kwargs: Any):
+        self.worksheet = worksheet
+        self.fieldnames = fieldnames
+        self._header_checked = False
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval, **kwargs)
+
+    def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        values = [["" if row.get(field) is None else row.get(field) for field in self.fieldnames] for row in rows]
+        if not self._header_checked and not self.worksheet.row_values(1):
+            values.insert(0, list(self.fieldnames))
+        self.worksheet.append_rows(values, value_input_option="RAW")
+        # Only once the append went through, so a failed first batch retries with the header
+        self._header_checked = True
+
+
+def open_worksheet(spreadsheet_key: str, worksheet_name: Optional[str] = None) -> Any:
+    """Open a worksheet with the service account in GOOGLE_APPLICATION_CREDENTIALS"""
+    import gspread
+
+    client = gspread.service_account(filename=os.getenv("GOOGLE_APPLICATION_CREDENTIALS"))
+    spreadsheet = client.open_by_key(spreadsheet_key)
+    return spreadsheet.worksheet(worksheet_name) if worksheet_name else spreadsheet.sheet1
+
+
+def create_sink(spec: str, fieldnames: List[str], batch_size: Optional[int] = None, flush_interval: Optional[float] = None) -> OutputSink:
+    """
+    Build a sink from a spec: csv:PATH, jsonl:PATH, sqlite:PATH,
+    sheets:SPREADSHEET_KEY[/WORKSHEET] or sheets:fake (an InMemoryWorksheet).
+    """
+    kind, _, argument = spec.partition(":")
+    if not argument:
+        raise ValueError(f"Output sink '{spec}' needs a target, e.g. {kind}:results.{kind}")
+    options: Dict[str, Any] = {}
+    if batch_size is not None:
+        options["batch_size"] = batch_size
+    if flush_interval is not None:
+        options["flush_interval"] = flush_interval
+
+    if kind == "csv":
+        return CSVSink(argument, fieldnames, **options)
+    if kind == "jsonl":
+        return JSONLSink(argument, **options)
+    if kind == "sqlite":
+        return SQLiteSink(argument, fieldnames, **options)
+    if kind == "sheets":
+        if argument == "fake":
+            worksheet = InMemoryWorksheet()
+        else:
+            spreadsheet_key, _, worksheet_name = argument.partition("/")
+            worksheet = open_worksheet(spreadsheet_key, worksheet_name or None)
+        return GoogleSheetsSink(worksheet, fieldnames, **options)
+    raise ValueError(f"Unknown output sink: {kind}")
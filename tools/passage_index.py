@@ -0,0 +1,154 @@
+from typing import Dict, Any, List, Optional, Iterable
+from pathlib import Path
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PASSAGE_INDEX_DIR = Path("cache") / "passages"
+# Seconds a company's stored searches are reused before they are run again
+PASSAGE_INDEX_TTL = 7 * 24 * 3600
+
+SEARCH_SOURCE = "search"
+PROFILE_SOURCE = "profile"
+
+
+_LINKEDIN_COMPANY = re.compile(r"linkedin\.com/company/([^/?#]+)", re.IGNORECASE)
+
+
+def company_identity(company_data: Dict[str, Any]) -> str:
+    """
+    Stable identity of a company: its website domain, else its LinkedIn id or
+    company handle, and only failing those its name (distinct companies
+    share names)
+    """
+    website = re.sub(r"^[a-z]+://", "", str(company_data.get("website") or "").strip().lower())
+    domain = re.split(r"[/?#:]", website, 1)[0]
+    domain = domain[4:] if domain.startswith("www.") else domain
+    if domain and domain != "linkedin.com":
+        return f"domain {domain}"
+    if company_data.get("linkedin_id"):
+        return f"linkedin {company_data['linkedin_id']}"
+    match = _LINKEDIN_COMPANY.search(str(company_data.get("linkedin_url") or ""))
+    if match:
+        return f"linkedin {match.group(1).lower()}"
+    return f"name {company_data.get('name') or 'unknown'}"
+
+
+def company_index_path(company_data: Dict[str, Any], index_dir: Path = PASSAGE_INDEX_DIR) -> Path:
+    """Location of the persisted passage index for a company, keyed by its identity (see company_identity)"""
+    stem = re.sub(r"[^a-z0-9]+", "_", company_identity(company_data).lower()).strip("_")
+    return Path(index_dir) / f"{stem or 'unknown'}.sqlite"
+
+
+class PassageIndex:
+    """
+    BM25 passage index backed by SQLite FTS5.
+
+    Holds every passage gathered for one company (search snippets plus profile
+    text) so each dimension can retrieve its own top-k passages locally.
+    """
+
+    def __init__(self, path: Any = ":memory:"):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS passages "
+            "USING fts5(text, source UNINDEXED, label UNINDEXED)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT, updated REAL)")
+        # Indexes written before values were timestamped
+        if "updated" not in {row[1] for row in self._conn.execute("PRAGMA table_info(meta)")}:
+            self._conn.execute("ALTER TABLE meta ADD COLUMN updated REAL")
+        self._conn.commit()
+
+    def add_passages(self, source: str, label: str, passages: Iterable[str]) -> int:
+        """Add passages from one source, skipping ones already indexed. Returns the number added."""
+        added = 0
+        with self._lock:
+            existing = {row[0] for row in self._conn.execute("SELECT text FROM passages")}
+            for passage in passages:
+                passage = (passage or "").strip()
+                if not passage or passage in existing:
+                    continue
+                self._conn.execute(
+                    "INSERT INTO passages (text, source, label) VALUES (?, ?, ?)",
+                    (passage, source, label)
+                )
+                existing.add(passage)
+                added += 1
+            self._conn.commit()
+        return added
+
+    def remove_label(self, label: str) -> int:
+        """Delete every passage stored under a label. Returns the number removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM passages WHERE label = ?", (label,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def count(self, source: Optional[str] = None) -> int:
+        """Number of indexed passages, optionally restricted to one source"""
+        with self._lock:
+            if source is None:
+                return self._conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM passages WHERE source = ?", (source,)
+            ).fetchone()[0]
+
+    def labels(self, source: Optional[str] = None) -> List[str]:
+        """Distinct labels (e.g. search queries) that have passages in the index"""
+        with self._lock:
+            if source is None:
+                rows = self._conn.execute("SELECT DISTINCT label FROM passages")
+            else:
+                rows = self._conn.execute("SELECT DISTINCT label FROM passages WHERE source = ?", (source,))
+            return [row[0] for row in rows]
+
+    def get_meta(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """Read a JSON value stored alongside the passages, or None if it was stored more than max_age seconds ago"""
+        with self._lock:
+            row = self._conn.execute("SELECT value, updated FROM meta WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        if max_age is not None and (row[1] is None or time.time() - row[1] > max_age):
+            return None
+        return json.loads(row[0])
+
+    def set_meta(self, key: str, value: Any) -> None:
+        """Store a JSON value alongside the passages, timestamped now"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value, updated) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+            self._conn.commit()
+
+    def search(self, terms: Iterable[str], k: int = 10) -> List[Dict[str, Any]]:
+        """Return the top-k passages for the given terms, best BM25 match first"""
+        terms = [re.sub(r'"', "", term) for term in terms if term]
+        terms = [term for term in terms if term]
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT text, source, label, bm25(passages) AS rank FROM passages "
+                "WHERE passages MATCH ? ORDER BY rank LIMIT ?",
+                (match, k)
+            ).fetchall()
+        return [
+            {"text": text, "source": source, "label": label, "rank": rank}
+            for text, source, label, rank in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
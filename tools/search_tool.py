@@ -1,6 +1,206 @@
 from langchain_community.utilities import SerpAPIWrapper
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, List, Optional
+import hashlib
+import logging
 import os
+import re
 
-search_tool = SerpAPIWrapper(
-    serpapi_api_key=os.getenv("SERPAPI_API_KEY")
-)
+from tools.evidence_packer import split_snippets, normalize_snippet, tokenize_terms
+from tools.passage_index import PassageIndex
+from tools.hedging import search_hedger
+from tools.circuit_breaker import search_breaker
+from tools.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CORPUS_INDEX_DIR = Path("cache") / "corpus"
+CORPUS_EXTENSIONS = {".txt", ".md", ".html", ".htm", ".json"}
+NO_RESULTS = "No good search result found"
+# Seconds a single SerpAPI HTTP request may take before it fails
+SERPAPI_REQUEST_TIMEOUT = 30.0
+
+
+class SearchBackend(ABC):
+    """Interface every search backend implements: run(query) returns the results as text"""
+    name = "base"
+
+    @abstractmethod
+    def run(self, query: str) -> str:
+        ...
+
+
+class SerpAPIBackend(SearchBackend):
+    """Live Google results through SerpAPI"""
+    name = "serpapi"
+
+    def __init__(self, api_key: Optional[str] = None, timeout: float = SERPAPI_REQUEST_TIMEOUT):
+        self.api_key = api_key
+        self.timeout = timeout
+        self._wrapper = None
+
+    def _search_engine(self, params: dict) -> Any:
+        # The wrapper builds a GoogleSearch per query, whose requests default to a 60000s timeout
+        from serpapi import GoogleSearch
+        search = GoogleSearch(params)
+        search.timeout = self.timeout
+        return search
+
+    def run(self, query: str) -> str:
+        # Created on first use so runs that never hit SerpAPI don't need a key
+        if self._wrapper is None:
+            self._wrapper = SerpAPIWrapper(
+                serpapi_api_key=self.api_key or os.getenv("SERPAPI_API_KEY")
+            )
+            self._wrapper.search_engine = self._search_engine
+        return self._wrapper.run(query)
+
+
+class LocalCorpusBackend(SearchBackend):
+    """
+    Full-text search over a directory of documents we already hold (news,
+    press releases, crawled pages), backed by a SQLite FTS5 index.
+
+    Documents are split into paragraph passages. The index is persisted under
+    cache/corpus/ and only files added or changed since the last run are
+    re-indexed.
+    """
+    name = "local"
+
+    def __init__(self, corpus_dir: str, top_k: int = 10, max_passage_chars: int = 1000):
+        self.corpus_dir = Path(corpus_dir)
+        self.top_k = top_k
+        self.max_passage_chars = max_passage_chars
+        digest = hashlib.sha1(str(self.corpus_dir.resolve()).encode()).hexdigest()[:12]
+        self.index = PassageIndex(CORPUS_INDEX_DIR / f"{self.corpus_dir.name}_{digest}.sqlite")
+        self.refresh()
+
+    def _split_passages(self, text: str) -> List[str]:
+        text = re.sub(r"<[^>]+>", " ", text)
+        passages = []
+        for paragraph in re.split(r"\n\s*\n", text):
+            paragraph = " ".join(paragraph.split())
+            while paragraph:
+                passages.append(paragraph[:self.max_passage_chars])
+                paragraph = paragraph[self.max_passage_chars:]
+        return passages
+
+    def refresh(self) -> None:
+        """Index files that are new or changed since they were last indexed"""
+        if not self.corpus_dir.is_dir():
+            raise FileNotFoundError(f"Corpus directory not found: {self.corpus_dir}")
+
+        indexed = 0
+        for path in sorted(self.corpus_dir.rglob("*")):
+            if not path.is_file() or path.suffix.lower() not in CORPUS_EXTENSIONS:
+                continue
+            label = str(path.relative_to(self.corpus_dir))
+            mtime = path.stat().st_mtime
+            if self.index.get_meta(f"file:{label}") == mtime:
+                continue
+            self.index.remove_label(label)
+            text = path.read_text(encoding="utf-8", errors="ignore")
+            self.index.add_passages(self.name, label, self._split_passages(text))
+            self.index.set_meta(f"file:{label}", mtime)
+            indexed += 1
+
+        logger.info(f"Local corpus {self.corpus_dir}: indexed {indexed} changed files, {self.index.count()} passages total")
+
+    def run(self, query: str) -> str:
+        passages = self.index.search(tokenize_terms(query), k=self.top_k)
+        if not passages:
+            return NO_RESULTS
+        # Same shape as SerpAPIWrapper output: the str() of a list of snippets
+        return str([f"{passage['label']}: {passage['text']}" for passage in passages])
+
+
+class MergedSearchBackend(SearchBackend):
+    """Query several backends concurrently and merge their snippets, dropping duplicates"""
+    name = "merged"
+
+    def __init__(self, backends: List[SearchBackend]):
+        self.backends = backends
+
+    def run(self, query: str) -> str:
+        def run_backend(backend: SearchBackend) -> Optional[List[str]]:
+            try:
+                return split_snippets(backend.run(query))
+            except Exception as e:
+                logger.error(f"Search backend '{backend.name}' failed for '{query}': {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=len(self.backends)) as executor:
+            backend_results = list(executor.map(run_backend, self.backends))
+
+        if all(results is None for results in backend_results):
+            raise RuntimeError(f"All search backends failed for '{query}'")
+
+        merged = []
+        seen = set()
+        for results in backend_results:
+            for snippet in results or []:
+                key = normalize_snippet(snippet)
+                if key and key not in seen:
+                    seen.add(key)
+                    merged.append(snippet)
+        return str(merged) if merged else NO_RESULTS
+
+
+class SearchBackendRouter(SearchBackend):
+    """
+    The search tool evaluators import. It forwards to whichever backend is
+    selected for the run, so backends can be swapped without re-importing.
+    """
+    name = "router"
+
+    def __init__(self, backend: SearchBackend):
+        self.backend = backend
+
+    def run(self, query: str) -> str:
+        # Fails fast while the search circuit is open; hedged against stalled
+        # requests when hedging is enabled for the run
+        return search_breaker.call(search_hedger.call, self._run_backend, query, key=self.backend.name)
+
+    def _run_backend(self, query: str) -> str:
+        backend = self.backend.name
+        with metrics.in_flight("echo_search_in_flight", backend=backend):
+            metrics.inc("echo_search_calls_total", backend=backend)
+            try:
+                return self.backend.run(query)
+            except Exception:
+                metrics.inc("echo_search_errors_total", backend=backend)
+                raise
+
+
+def create_search_backend(spec: str) -> SearchBackend:
+    """
+    Build a backend from a spec such as "serpapi", "local:./corpus" or
+    "serpapi,local:./corpus" (comma-separated backends are merged).
+    """
+    backends = []
+    for part in [part.strip() for part in spec.split(",") if part.strip()]:
+        kind, _, argument = part.partition(":")
+        if kind == "serpapi":
+            backends.append(SerpAPIBackend())
+        elif kind == "local":
+            if not argument:
+                raise ValueError("The local search backend needs a directory, e.g. local:./corpus")
+            backends.append(LocalCorpusBackend(argument))
+        else:
+            raise ValueError(f"Unknown search backend: {kind}")
+    if not backends:
+        raise ValueError(f"No search backend in spec '{spec}'")
+    return backends[0] if len(backends) == 1 else MergedSearchBackend(backends)
+
+
+def set_search_backend(backend: Any) -> None:
+    """Select the backend used by search_tool for the rest of the run"""
+    if isinstance(backend, str):
+        backend = create_search_backend(backend)
+    search_tool.backend = backend
+    logger.info(f"Using search backend: {getattr(backend, 'name', type(backend).__name__)}")
+
+
+search_tool = SearchBackendRouter(SerpAPIBackend())
@@ -0,0 +1,35 @@
+from functools import lru_cache
+import logging
+
+import tiktoken
+
+DEFAULT_MODEL = "gpt-4.1"
+FALLBACK_ENCODING = "o200k_base"
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str = DEFAULT_MODEL) -> tiktoken.Encoding:
+    """Return the tiktoken encoding used by the given chat model"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        logger.warning(f"No tokenizer registered for model '{model}', using {FALLBACK_ENCODING}")
+        return tiktoken.get_encoding(FALLBACK_ENCODING)
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """Count the number of tokens the model will see for the given text"""
+    if not text:
+        return 0
+    return len(get_encoding(model).encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    """Cut text down to at most max_tokens tokens"""
+    encoding = get_encoding(model)
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])